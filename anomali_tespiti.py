@@ -20,8 +20,11 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.data_fetcher import DataFetcher
 from src.data_processor import DataProcessor
+from src.data_quality import drop_unclosed
+from src.feature_cache import FeatureCache
 from src.anomaly_detector import AnomalyDetector
-from src.config import DATA_DIR, RESULTS_DIR
+from src.model_store import ModelStore
+from src.config import DATA_DIR, RESULTS_DIR, DataConfig
 from datetime import datetime
 import json
 
@@ -30,6 +33,9 @@ BORSA = "binance"      # Hangi borsadan veri cekilecek
 PARITE = "BTC/USDT"    # Hangi parite analiz edilecek (BTC/USDT, ETH/USDT vs.)
 TIMEFRAME = "15m"      # Kac dakikalik mumlar (15m = 15 dakika)
 GUN_SAYISI = 60        # Kac gunluk veri cekilecek
+REFERANS_PARITE = None # Capraz ozellikler icin referans (ornek "BTC/USDT"), None: kapali
+KAYITLI_MODEL = False  # True: Isolation Forest bir kez egitilip data/models'a kaydedilir, sonraki calistirmalar sadece puanlar
+WALK_FORWARD = False   # True: her mum sadece gecmisine gore puanlanir (AnomalyConfig.WALK_FORWARD_WINDOW / _STEP), backtest icin
 
 # Ana program buradan basliyor
 
@@ -43,7 +49,10 @@ def main():
     print(f"   Parite: {PARITE}")
     print(f"   Timeframe: {TIMEFRAME}")
     print(f"   Veri Araligi: Son {GUN_SAYISI} gun")
-    print(f"   Analiz: Mum kapanis fiyatlari")
+    if REFERANS_PARITE:
+        print(f"   Analiz: {REFERANS_PARITE}'ye gore artik getiri")
+    else:
+        print(f"   Analiz: Mum kapanis fiyatlari")
     print("="*70)
     
     # Dosya isimleri icin zaman damgasi olusturuyorum
@@ -70,19 +79,87 @@ def main():
         ham_veri_dosyasi = DATA_DIR / f"ham_veri_{zaman_damgasi}.csv"
         df.to_csv(ham_veri_dosyasi, index=False)
         
+        # Referans parite verildiyse onu da ayni aralikta cekiyorum
+        referans_df = None
+        if REFERANS_PARITE and REFERANS_PARITE != PARITE:
+            print(f"\nReferans parite cekiliyor: {REFERANS_PARITE}")
+            referans_df = fetcher.fetch_ohlcv(REFERANS_PARITE, TIMEFRAME, days_back=GUN_SAYISI)
+        
         # ADIM 2: Veriyi temizleme ve hazirlama
         print(f"\n{'='*70}")
         print("ADIM 2: VERI ISLENIYOR")
         print("="*70)
         
-        # Veri isleme objesi olusturuyorum
-        processor = DataProcessor(df)
-        
-        # Veriyi temizliyorum (eksik degerler, hatali fiyatlar vs.)
-        processor.clean_data()
-        
-        # Ek ozellikler ekliyorum (fiyat degisimi, volatilite vs.)
-        processor.add_features(['price_change', 'price_pct_change', 'volume_change', 'volatility'])
+        # Henuz kapanmamis son mumu analize katmiyorum (hacmi yarim)
+        df = drop_unclosed(df, TIMEFRAME)
+        if referans_df is not None:
+            referans_df = drop_unclosed(referans_df, TIMEFRAME)
+        
+        # Ayni mumlar ve ayarlarla veri daha once hazirlandiysa onbellekten
+        # aliyorum (sadece dedektor ayarlari degistiyse hazirlik tekrarlanmiyor)
+        ozellikler = ['price_change', 'price_pct_change', 'volume_change', 'volatility']
+        hedef = "close"
+        if referans_df is not None:
+            # Referansla aciklanamayan getiriyi puanliyorum (piyasa geneli hareketler elenir)
+            ozellikler = ozellikler + DataConfig.CROSS_FEATURES
+            hedef = DataConfig.CROSS_TARGET
+        onbellek = FeatureCache() if DataConfig.USE_FEATURE_CACHE else None
+        onbellek_anahtari = None
+        hazir = None
+        if onbellek is not None:
+            onbellek_anahtari = onbellek.key(df, ozellikler, {
+                'timeframe': TIMEFRAME,
+                'dtype': DataConfig.FLOAT_DTYPE,
+                'gap_policy': DataConfig.GAP_POLICY,
+                'target': hedef,
+                'reference': FeatureCache.key(referans_df, []) if referans_df is not None else None,
+                'higher_timeframes': DataConfig.HIGHER_TIMEFRAMES,
+            })
+            hazir = onbellek.get(onbellek_anahtari)
+        
+        if hazir is not None:
+            processor = DataProcessor(hazir.frame, copy=False)
+            X = hazir.arrays['X']
+            kalite_ozeti = hazir.meta['veri_kalitesi']
+        else:
+            # Veri isleme objesi olusturuyorum
+            # Ham veriyi zaten kaydettim, kopya almadan ayni DataFrame uzerinde calisiyor
+            processor = DataProcessor(
+                df,
+                copy=False,
+                dtype=DataConfig.FLOAT_DTYPE,
+                track_memory=DataConfig.REPORT_MEMORY
+            )
+            
+            # Veriyi temizliyorum (eksik degerler, hatali fiyatlar vs.)
+            processor.clean_data()
+            
+            # Mum izgarasini kontrol ediyorum (bosluklar momentum ve volatiliteyi bozar)
+            kalite = processor.check_quality(TIMEFRAME)
+            kalite_ozeti = kalite.to_dict()
+            if DataConfig.GAP_POLICY != "none" and not kalite.is_clean:
+                processor.fill_gaps(TIMEFRAME, policy=DataConfig.GAP_POLICY, fetcher=fetcher, symbol=PARITE)
+            
+            # Referansin kapanisini ayni mumlara hizaliyorum (capraz ozellikler icin)
+            if referans_df is not None:
+                processor.add_reference(referans_df)
+            
+            # Ek ozellikler ekliyorum (fiyat degisimi, volatilite vs.)
+            processor.add_features(ozellikler)
+            
+            # Kalin timeframe ozellikleri (1h, 4h...) sadece kapanmis mumlardan
+            for ust_timeframe, ust_ozellikler in DataConfig.HIGHER_TIMEFRAMES.items():
+                processor.add_timeframe_features(ust_timeframe, ust_ozellikler, base_timeframe=TIMEFRAME)
+            
+            if DataConfig.REPORT_MEMORY:
+                processor.memory_report()
+            
+            # Anomali tespiti icin mum kapanis fiyatlarini (referans varsa
+            # artik getiriyi) hazirliyorum
+            X = processor.prepare_for_anomaly_detection(hedef)
+            
+            if onbellek is not None:
+                onbellek.put(onbellek_anahtari, processor.df, {'X': X}, meta={'veri_kalitesi': kalite_ozeti})
         
         # Veri hakkinda ozet bilgileri ekrana yazdiriyorum
         stats = processor.get_statistics()
@@ -93,9 +170,6 @@ def main():
         print(f"   Fiyat: ${stats['price_stats']['min']:,.2f} - ${stats['price_stats']['max']:,.2f}")
         print(f"   Ortalama: ${stats['price_stats']['mean']:,.2f}")
         
-        # Anomali tespiti icin mum kapanis fiyatlarini hazirliyorum
-        X = processor.prepare_for_anomaly_detection("close")
-        
         # ADIM 3: Makine ogrenmesi ile anomali tespiti
         print(f"\n{'='*70}")
         print("ADIM 3: ANOMALI TESPITI YAPILIYOR")
@@ -104,11 +178,25 @@ def main():
         # Anomali tespit modeli olusturuyorum (contamination = beklenen anomali orani)
         detector = AnomalyDetector(contamination=0.05)
         
+        # Kayitli model istendiyse Isolation Forest her calistirmada yeniden
+        # egitilmiyor; model yoksa veya ozellik semasi degistiyse egitilip kaydediliyor
+        if_model = None
+        if KAYITLI_MODEL and not WALK_FORWARD:
+            model_deposu = ModelStore()
+            if_model = model_deposu.load(fetcher.exchange_name, PARITE, TIMEFRAME, columns=[hedef])
+            if if_model is None:
+                if_model = detector.train_isolation_forest(X, columns=[hedef])
+                model_deposu.save(fetcher.exchange_name, PARITE, TIMEFRAME, if_model)
+        
         # 3 farkli yontemle anomali tespiti yapiyorum
         # - Isolation Forest: Makine ogrenmesi tabanli
         # - Z-Score: Istatistiksel yontem
         # - IQR: Ceyrekler arasi aralik yontemi
-        sonuclar = detector.detect_all_methods(X, methods=["isolation_forest", "z_score", "iqr"])
+        if WALK_FORWARD:
+            # Ileriye bakma yok: son pencereyle egit, sonraki blogu puanla, kaydir
+            sonuclar = detector.detect_walk_forward(X, methods=["isolation_forest", "z_score", "iqr"], columns=[hedef])
+        else:
+            sonuclar = detector.detect_all_methods(X, methods=["isolation_forest", "z_score", "iqr"], if_model=if_model)
         
         # En az 2 yontemin anomali dedigi verileri seciyorum (daha guvenilir)
         ensemble_tahmin, oylar = detector.ensemble_voting(sonuclar, min_votes=2)
@@ -119,7 +207,8 @@ def main():
         print("="*70)
         
         # Orijinal veriye anomali sonuclarini ekliyorum
-        sonuc_df = processor.df.copy()
+        # (processor.df'i bundan sonra kullanmiyorum, kopyalamaya gerek yok)
+        sonuc_df = processor.df
         
         # Her yontemin sonucunu ayri sutunlarda sakliyorum
         for yontem, (tahminler, skorlar) in sonuclar.items():
@@ -132,7 +221,7 @@ def main():
         
         # Sadece anomali olarak isaretlenen verileri filtreliyorum
         # Bunlar zaman damgali olarak kaydedilecek
-        anomaliler_df = sonuc_df[sonuc_df['ensemble_anomali'] == -1].copy()
+        anomaliler_df = sonuc_df[sonuc_df['ensemble_anomali'] == -1]
         
         # Sonuc dosyalarinin isimlerini hazirliyorum
         tum_sonuclar = RESULTS_DIR / f"tum_veri_{zaman_damgasi}.csv"
@@ -155,15 +244,18 @@ def main():
             'tarih': zaman_damgasi,
             'borsa': BORSA,
             'parite': PARITE,
+            'referans_parite': REFERANS_PARITE,
             'timeframe': TIMEFRAME,
             'gun_sayisi': GUN_SAYISI,
+            'walk_forward': WALK_FORWARD,
             'toplam_mum': len(sonuc_df),
             'anomali_sayilari': {
                 yontem: int((tahmin == -1).sum())
                 for yontem, (tahmin, _) in sonuclar.items()
             },
             'toplam_anomali': int((ensemble_tahmin == -1).sum()),
-            'fiyat_istatistikleri': stats['price_stats']
+            'fiyat_istatistikleri': stats['price_stats'],
+            'veri_kalitesi': kalite_ozeti
         }
         
         # JSON raporunu kaydediyorum
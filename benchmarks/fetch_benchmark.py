@@ -0,0 +1,181 @@
+"""
+VERI CEKME BENCHMARK'I
+
+Canli borsaya baglanmadan (ReplayExchange ile) butun cekim modlarinin
+hizini olcuyorum. CI'da cekim hizindaki gerilemeleri yakalamak icin yazdim.
+
+Olculen modlar:
+- serial:        DataFetcher, depo kapali (eski davranis)
+- store_cold:    DataFetcher, bos depo (ilk calistirma)
+- store_warm:    DataFetcher, dolu depo (sadece kuyruk istegi)
+- async_many:    AsyncDataFetcher.fetch_many (bircok parite ayni anda)
+- backfill:      AsyncDataFetcher.backfill (tek parite, paralel parcalar)
+
+Her mod icin mum/saniye ve uctan uca sure raporlaniyor.
+
+Calistirmak icin:
+    py benchmarks/fetch_benchmark.py
+    py benchmarks/fetch_benchmark.py --days 30 --timeframe 1m --latency 0.05 --json sonuc.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from async_fetcher import AsyncDataFetcher
+from candle_store import CandleStore
+from data_fetcher import DataFetcher
+from market_cache import MarketCache
+from rate_limiter import RetryPolicy, TokenBucket
+from replay_exchange import AsyncReplayExchange, ReplayExchange
+
+
+def _limiter(args) -> TokenBucket:
+    # Her mod kendi kovasiyla basliyor, birbirinin butcesini yemesin
+    return TokenBucket(capacity=args.burst, refill_rate=args.requests_per_second)
+
+
+def _exchange_kwargs(args) -> dict:
+    return {
+        'latency': args.latency,
+        'rate_limit_error_rate': args.error_rate,
+        'history_days': args.days + 1,
+    }
+
+
+def _result(mode: str, candles: int, seconds: float, exchange) -> dict:
+    return {
+        'mode': mode,
+        'candles': candles,
+        'seconds': round(seconds, 4),
+        'candles_per_sec': round(candles / seconds, 1) if seconds > 0 else None,
+        'requests': exchange.request_count,
+        'rate_limited': exchange.rate_limited_count,
+    }
+
+
+def bench_sync(args, mode: str, store_dir=None, warmup: bool = False) -> dict:
+    symbol = args.symbols[0]
+    exchange = ReplayExchange(symbols=args.symbols, **_exchange_kwargs(args))
+    store = CandleStore(store_dir) if store_dir is not None else None
+
+    fetcher = DataFetcher(
+        exchange=exchange,
+        use_store=store is not None,
+        candle_store=store,
+        market_cache=MarketCache(args.cache_dir),
+        rate_limiter=_limiter(args),
+        retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.1),
+    )
+
+    if warmup:
+        fetcher.fetch_ohlcv(symbol, args.timeframe, days_back=args.days)
+        exchange.request_count = 0
+        exchange.rate_limited_count = 0
+
+    start = time.perf_counter()
+    df = fetcher.fetch_ohlcv(symbol, args.timeframe, days_back=args.days)
+    elapsed = time.perf_counter() - start
+
+    return _result(mode, len(df), elapsed, exchange)
+
+
+def bench_async_many(args) -> dict:
+    exchange = AsyncReplayExchange(symbols=args.symbols, **_exchange_kwargs(args))
+
+    async def _run():
+        fetcher = AsyncDataFetcher(
+            exchange=exchange,
+            use_store=False,
+            max_concurrency=args.concurrency,
+            market_cache=MarketCache(args.cache_dir),
+            rate_limiter=_limiter(args),
+            retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.1),
+        )
+        async with fetcher:
+            return await fetcher.fetch_many(args.symbols, args.timeframe, days_back=args.days)
+
+    start = time.perf_counter()
+    results = asyncio.run(_run())
+    elapsed = time.perf_counter() - start
+
+    return _result('async_many', sum(len(df) for df in results.values()), elapsed, exchange)
+
+
+def bench_backfill(args) -> dict:
+    exchange = AsyncReplayExchange(symbols=args.symbols, **_exchange_kwargs(args))
+
+    async def _run():
+        fetcher = AsyncDataFetcher(
+            exchange=exchange,
+            use_store=False,
+            max_concurrency=args.concurrency,
+            market_cache=MarketCache(args.cache_dir),
+            rate_limiter=_limiter(args),
+            retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.1),
+        )
+        async with fetcher:
+            return await fetcher.backfill(args.symbols[0], args.timeframe, days_back=args.days)
+
+    start = time.perf_counter()
+    df = asyncio.run(_run())
+    elapsed = time.perf_counter() - start
+
+    return _result('backfill', len(df), elapsed, exchange)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Veri cekme benchmark'i (ReplayExchange ile)")
+    parser.add_argument('--days', type=int, default=30, help="Kac gunluk veri")
+    parser.add_argument('--timeframe', default='1m', help="Mum araligi")
+    parser.add_argument('--symbols', nargs='+', default=[f"SYM{i}/USDT" for i in range(20)],
+                        help="Pariteler (ilki tek parite modlarinda kullanilir)")
+    parser.add_argument('--latency', type=float, default=0.02, help="Istek basina gecikme (sn)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="429 orani (0-1)")
+    parser.add_argument('--requests-per-second', type=float, default=200.0, help="Rate limit butcesi")
+    parser.add_argument('--burst', type=float, default=50.0, help="Kova kapasitesi")
+    parser.add_argument('--concurrency', type=int, default=20, help="Ayni anda istek sayisi")
+    parser.add_argument('--json', default=None, help="Sonuclari bu dosyaya yaz")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(" " * 20 + "VERI CEKME BENCHMARK'I")
+    print("=" * 70)
+    print(f"   {args.days} gun, {args.timeframe}, {len(args.symbols)} parite, "
+          f"gecikme {args.latency*1000:.0f} ms, 429 orani %{args.error_rate*100:.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args.cache_dir = Path(tmp) / "markets"
+        store_dir = Path(tmp) / "candles"
+
+        results = [
+            bench_sync(args, 'serial'),
+            bench_sync(args, 'store_cold', store_dir=store_dir / "cold"),
+            bench_sync(args, 'store_warm', store_dir=store_dir / "warm", warmup=True),
+            bench_async_many(args),
+            bench_backfill(args),
+        ]
+
+    print(f"\n{'Mod':<14}{'Mum':>12}{'Sure (sn)':>12}{'Mum/sn':>14}{'Istek':>8}{'429':>6}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r['mode']:<14}{r['candles']:>12,}{r['seconds']:>12.3f}"
+              f"{(r['candles_per_sec'] or 0):>14,.0f}{r['requests']:>8}{r['rate_limited']:>6}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': {k: v for k, v in vars(args).items() if k != 'cache_dir'},
+                       'results': results}, f, indent=2, default=str)
+        print(f"\nSonuclar kaydedildi: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
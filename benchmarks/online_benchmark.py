@@ -0,0 +1,131 @@
+"""
+ONLINE DEDEKTOR BENCHMARK'I
+
+Akan veri dedektorlerinin (online_detectors.py) nokta/saniye hizini
+olcuyorum. Karsilastirma icin toplu yontemlerin "her yeni mumda butun
+gecmisi bastan puanla" maliyetini de olcuyorum: canli izlemede
+detect_z_score / detect_iqr / detect_isolation_forest bu sekilde
+kullanilsaydi nokta basina maliyet gecmisle birlikte buyurdu.
+
+Olculen modlar:
+- update:       Her nokta tek tek update() ile (canli izleme senaryosu)
+- update_many:  Ayni noktalar toplu (gecmisi hizlica isitmak icin)
+- batch:        Her yeni noktada toplu yontem butun gecmis uzerinde
+
+Veri sentetik: normal dagilimli getiriler + seyrek sicramalar.
+
+Calistirmak icin:
+    py benchmarks/online_benchmark.py
+    py benchmarks/online_benchmark.py --points 200000 --features 4 --json sonuc.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from anomaly_detector import AnomalyDetector
+from online_detectors import ONLINE_DETECTORS, make_online_detector
+
+
+def _data(args) -> np.ndarray:
+    rng = np.random.default_rng(args.seed)
+    X = rng.standard_normal((args.points, args.features))
+    spikes = rng.random(args.points) < 0.002
+    X[spikes] *= 10
+    return X
+
+
+def _result(method: str, mode: str, points: int, seconds: float, labels=None) -> dict:
+    return {
+        'method': method,
+        'mode': mode,
+        'points': points,
+        'seconds': round(seconds, 4),
+        'points_per_sec': round(points / seconds, 1) if seconds > 0 else None,
+        'anomalies': int(np.sum(labels == -1)) if labels is not None else None,
+    }
+
+
+def bench_online(X: np.ndarray, method: str, mode: str) -> dict:
+    detector = make_online_detector(method)
+    start = time.perf_counter()
+    if mode == 'update':
+        labels = np.array([detector.update(x)[0] for x in X])
+    else:
+        labels, _ = detector.update_many(X)
+    return _result(method, mode, len(X), time.perf_counter() - start, labels)
+
+
+def bench_batch(X: np.ndarray, method: str, history: int, repeats: int) -> dict:
+    """Son `repeats` noktanin her biri icin `history` mumluk gecmisi bastan puanlar"""
+    detector = AnomalyDetector(n_estimators=100)
+    run = {
+        'z_score': detector.detect_z_score,
+        'iqr': detector.detect_iqr,
+        'isolation_forest': detector.detect_isolation_forest,
+    }[method]
+
+    start = time.perf_counter()
+    # Toplu yontemler her cagrida ilerleme yaziyor, olcumu bogmasin
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(repeats):
+            end = history + i
+            run(X[end - history:end + 1])
+    return _result(method, f'batch@{history}', repeats, time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Online dedektor benchmark'i (sentetik veri)")
+    parser.add_argument('--points', type=int, default=50000, help="Nokta sayisi")
+    parser.add_argument('--features', type=int, default=2, help="Ozellik sayisi")
+    parser.add_argument('--methods', nargs='+', default=list(ONLINE_DETECTORS),
+                        help="Olculecek online dedektorler")
+    parser.add_argument('--history', type=int, default=20000,
+                        help="Toplu karsilastirmada her noktada bastan islenen gecmis")
+    parser.add_argument('--batch-repeats', type=int, default=20,
+                        help="Toplu karsilastirmada kac nokta olculsun (0: olcme)")
+    parser.add_argument('--seed', type=int, default=42, help="Rastgelelik")
+    parser.add_argument('--json', default=None, help="Sonuclari bu dosyaya yaz")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(" " * 20 + "ONLINE DEDEKTOR BENCHMARK'I")
+    print("=" * 70)
+    print(f"   {args.points:,} nokta, {args.features} ozellik")
+
+    X = _data(args)
+    results = []
+    for method in args.methods:
+        for mode in ('update', 'update_many'):
+            results.append(bench_online(X, method, mode))
+
+    if args.batch_repeats > 0:
+        history = min(args.history, len(X) - args.batch_repeats - 1)
+        for method in ('z_score', 'iqr', 'isolation_forest'):
+            results.append(bench_batch(X, method, history, args.batch_repeats))
+
+    print(f"\n{'Yontem':<20}{'Mod':<16}{'Nokta':>10}{'Sure (sn)':>12}{'Nokta/sn':>14}{'Anomali':>10}")
+    print("-" * 82)
+    for r in results:
+        anomalies = '-' if r['anomalies'] is None else f"{r['anomalies']:,}"
+        print(f"{r['method']:<20}{r['mode']:<16}{r['points']:>10,}{r['seconds']:>12.3f}"
+              f"{(r['points_per_sec'] or 0):>14,.0f}{anomalies:>10}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2, default=str)
+        print(f"\nSonuclar kaydedildi: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
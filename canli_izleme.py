@@ -0,0 +1,139 @@
+"""
+CANLI ANOMALI IZLEME
+
+anomali_tespiti.py toplu calisiyor: veriyi ceker, hepsini puanlar ve cikar.
+Bu programi alarm icin yazdim. Gecmis veriyle referansi kurduktan sonra
+kapanan her mumu aninda puanliyor ve anomali bulunca ekrana yaziyor.
+
+SIMULASYON = True ise borsaya baglanmadan yerel simulatorle calisiyor.
+
+Calistirmak icin: py canli_izleme.py
+Durdurmak icin: Ctrl+C
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import asyncio
+import csv
+import time
+from datetime import datetime
+
+from src.data_fetcher import DataFetcher
+from src.anomaly_detector import AnomalyDetector
+from src.streaming import StreamingPipeline, SimulatedCandleStream, ExchangeCandleStream
+from src.replay_exchange import ReplayExchange
+from src.model_store import ModelStore
+from src.config import RESULTS_DIR
+
+# Buradan ayarlari degistirebilirsin
+BORSA = "binance"      # Hangi borsadan veri cekilecek
+PARITE = "BTC/USDT"    # Hangi parite izlenecek
+TIMEFRAME = "1m"       # Kac dakikalik mumlar
+GUN_SAYISI = 7         # Referans icin kac gunluk gecmis kullanilacak
+SUTUNLAR = ["price_pct_change", "volume_change"]  # Puanlanacak sutunlar
+MIN_OY = 2             # Kac yontem anomali derse alarm verilsin
+SIMULASYON = False     # True: borsaya baglanmadan simulatorle calis
+KAYITLI_MODEL = False  # True: Isolation Forest data/models'tan yuklenir (yoksa egitilip kaydedilir)
+
+
+def main():
+    print("\n" + "="*70)
+    print(" "*18 + "CANLI ANOMALI IZLEME")
+    print("="*70)
+    print(f"\nAyarlar:")
+    print(f"   Borsa: {'SIMULASYON' if SIMULASYON else BORSA.upper()}")
+    print(f"   Parite: {PARITE}")
+    print(f"   Timeframe: {TIMEFRAME}")
+    print(f"   Referans: Son {GUN_SAYISI} gun")
+    print("="*70)
+
+    zaman_damgasi = datetime.now().strftime("%Y%m%d_%H%M%S")
+    alarm_dosyasi = RESULTS_DIR / f"canli_anomaliler_{zaman_damgasi}.csv"
+
+    def alarm(sonuc):
+        # Her anomaliyi ekrana ve CSV'ye yaziyorum
+        print(f"   ANOMALI: {sonuc['timestamp']}  close={sonuc['close']:.4f}  "
+              f"oy={sonuc['votes']}  ({sonuc['latency_ms']:.1f} ms)")
+        yeni_dosya = not alarm_dosyasi.exists()
+        with open(alarm_dosyasi, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if yeni_dosya:
+                writer.writerow(['timestamp', 'close', 'ensemble_oy'])
+            writer.writerow([sonuc['timestamp'], sonuc['close'], sonuc['votes']])
+
+    # ADIM 1: Referans icin gecmis veri
+    print(f"\n{'='*70}")
+    print("ADIM 1: GECMIS VERI CEKILIYOR")
+    print("="*70)
+
+    if SIMULASYON:
+        fetcher = DataFetcher(exchange=ReplayExchange(symbols=[PARITE], history_days=GUN_SAYISI + 1))
+    else:
+        fetcher = DataFetcher(BORSA)
+    df = fetcher.fetch_ohlcv(PARITE, TIMEFRAME, days_back=GUN_SAYISI)
+
+    # ADIM 2: Referans kuruluyor
+    print(f"\n{'='*70}")
+    print("ADIM 2: REFERANS KURULUYOR")
+    print("="*70)
+
+    # Kayitli model varsa Isolation Forest yeniden egitilmiyor, sadece puanliyor
+    model_deposu = ModelStore() if KAYITLI_MODEL else None
+    kayitli_model = None
+    if model_deposu is not None:
+        kayitli_model = model_deposu.load(fetcher.exchange_name, PARITE, TIMEFRAME, columns=SUTUNLAR)
+
+    pipeline = StreamingPipeline(
+        detector=AnomalyDetector(contamination=0.05),
+        columns=SUTUNLAR,
+        refit_every=1000,
+        min_votes=MIN_OY,
+        on_anomaly=alarm,
+        if_model=kayitli_model
+    )
+    pipeline.warm_up(df, TIMEFRAME)
+
+    if model_deposu is not None and kayitli_model is None:
+        model_deposu.save(fetcher.exchange_name, PARITE, TIMEFRAME, pipeline.detector.reference['model'])
+
+    # ADIM 3: Canli izleme
+    print(f"\n{'='*70}")
+    print("ADIM 3: CANLI IZLEME (durdurmak icin Ctrl+C)")
+    print("="*70)
+
+    if SIMULASYON:
+        timeframe_ms = fetcher.exchange.parse_timeframe(TIMEFRAME) * 1000
+        kaynak = SimulatedCandleStream(
+            timeframe_ms,
+            start=int(df['timestamp_ms'].iloc[-1]) + timeframe_ms,
+            count=2000,
+            interval=0.01,
+            start_price=float(df['close'].iloc[-1]),
+            spike_probability=0.005
+        )
+    else:
+        kaynak = ExchangeCandleStream(BORSA, PARITE, TIMEFRAME)
+
+    baslangic = time.time()
+    try:
+        ozet = asyncio.run(pipeline.run(kaynak))
+    except KeyboardInterrupt:
+        print("\nIzleme durduruldu")
+        return
+
+    print(f"\n{'='*70}")
+    print("IZLEME BITTI")
+    print("="*70)
+    print(f"   Islenen mum: {ozet['processed']}")
+    print(f"   Anomali: {ozet['anomaly_count']}")
+    if ozet['processed']:
+        print(f"   Ortalama gecikme: {ozet['latency_ms_mean']:.2f} ms (p99: {ozet['latency_ms_p99']:.2f} ms)")
+    print(f"   Sure: {time.time() - baslangic:.1f} sn")
+    if ozet['anomalies']:
+        print(f"   Alarmlar: {alarm_dosyasi}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+UZUN GECMIS ANOMALI ANALIZI
+
+anomali_tespiti.py butun veriyi bellege aliyor; birkac aylik veri icin
+sorun yok ama yillarca 1m mum milyonlarca satir demek. Bu programi uzun
+gecmisi yerel mum deposundan (data/candles) parca parca islemek icin
+yazdim. Bellek kullanimi gecmisin uzunluguna degil parca boyuna bagli.
+
+Nasil calisir:
+1. Depoda eksik aralik varsa borsadan cekip depoya ekler
+2. Depoyu memory-map ile acar (veri bellege okunmaz)
+3. Birinci geciste referansi kurar, ikinci geciste her parcayi puanlar
+4. Anomalileri parca parca CSV'ye yazar, ozeti JSON olarak kaydeder
+
+Calistirmak icin: py gecmis_analiz.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import json
+from datetime import datetime
+
+from src.data_fetcher import DataFetcher
+from src.chunked import ChunkedProcessor, detect_chunked
+from src.anomaly_detector import AnomalyDetector
+from src.config import RESULTS_DIR, AnomalyConfig, DataConfig
+
+# Buradan ayarlari degistirebilirsin
+BORSA = "binance"      # Hangi borsadan veri cekilecek
+PARITE = "BTC/USDT"    # Hangi parite analiz edilecek
+TIMEFRAME = "1m"       # Kac dakikalik mumlar
+GUN_SAYISI = 3 * 365   # Kac gunluk gecmis analiz edilecek
+SUTUNLAR = ["price_pct_change", "volume_change"]  # Puanlanacak sutunlar
+MIN_OY = 2             # Kac yontem anomali derse anomali sayilsin
+DEPOYU_GUNCELLE = True # False: sadece depoda olan veriyi analiz et
+TUM_SATIRLAR = False   # True: butun satirlar da ayri CSV'ye yazilir (buyuk dosya)
+
+
+def main():
+    print("\n" + "="*70)
+    print(" "*15 + "UZUN GECMIS ANOMALI ANALIZI")
+    print("="*70)
+    print(f"\nAyarlar:")
+    print(f"   Borsa: {BORSA.upper()}")
+    print(f"   Parite: {PARITE}")
+    print(f"   Timeframe: {TIMEFRAME}")
+    print(f"   Veri Araligi: Son {GUN_SAYISI} gun")
+    print(f"   Parca boyu: {DataConfig.CHUNK_ROWS:,} mum")
+    print("="*70)
+
+    zaman_damgasi = datetime.now().strftime("%Y%m%d_%H%M%S")
+    anomaliler_dosya = RESULTS_DIR / f"gecmis_anomaliler_{zaman_damgasi}.csv"
+    tum_veri_dosya = RESULTS_DIR / f"gecmis_tum_veri_{zaman_damgasi}.csv"
+    ozet_rapor = RESULTS_DIR / f"gecmis_ozet_{zaman_damgasi}.json"
+
+    try:
+        fetcher = DataFetcher(BORSA, use_store=True)
+        since = fetcher._calculate_since_timestamp(GUN_SAYISI)
+
+        # ADIM 1: Depoyu guncelleme (sadece eksik araliklar cekiliyor)
+        if DEPOYU_GUNCELLE:
+            print(f"\n{'='*70}")
+            print("ADIM 1: MUM DEPOSU GUNCELLENIYOR")
+            print("="*70)
+            fetcher.fetch_ohlcv(PARITE, TIMEFRAME, days_back=GUN_SAYISI)
+
+        # ADIM 2: Parca parca analiz
+        print(f"\n{'='*70}")
+        print("ADIM 2: PARCA PARCA ANOMALI TESPITI")
+        print("="*70)
+
+        processor = ChunkedProcessor.from_store(
+            fetcher.exchange_name, PARITE, TIMEFRAME, since=since, store=fetcher.candle_store
+        )
+        if len(processor) == 0:
+            print("\nDepoda veri yok! DEPOYU_GUNCELLE = True ile tekrar dene.")
+            return 1
+
+        detector = AnomalyDetector(
+            contamination=AnomalyConfig.CONTAMINATION,
+            n_estimators=AnomalyConfig.N_ESTIMATORS,
+            random_state=AnomalyConfig.RANDOM_STATE
+        )
+        ozet = detect_chunked(
+            processor, detector, anomaliler_dosya,
+            columns=SUTUNLAR,
+            methods=AnomalyConfig.METHODS,
+            min_votes=MIN_OY,
+            all_rows_path=tum_veri_dosya if TUM_SATIRLAR else None
+        )
+
+        # ADIM 3: Ozet rapor
+        rapor = {
+            'tarih': zaman_damgasi,
+            'borsa': BORSA,
+            'parite': PARITE,
+            'timeframe': TIMEFRAME,
+            'gun_sayisi': GUN_SAYISI,
+            'sutunlar': SUTUNLAR,
+            **ozet
+        }
+        with open(ozet_rapor, 'w', encoding='utf-8') as f:
+            json.dump(rapor, f, indent=2, ensure_ascii=False)
+
+        print(f"\n{'='*70}")
+        print("ANALIZ TAMAMLANDI")
+        print("="*70)
+        print(f"\nToplam mum: {ozet['toplam_mum']:,}")
+        print(f"Toplam anomali: {ozet['toplam_anomali']:,}")
+        if ozet['toplam_anomali'] > 0:
+            print(f"Anomaliler: {anomaliler_dosya.name}")
+        print(f"Ozet: {ozet_rapor.name}")
+        return 0
+
+    except KeyboardInterrupt:
+        print("\n\nIslem kullanici tarafindan iptal edildi.")
+        return 1
+
+    except Exception as e:
+        print(f"\n\nHATA OLUSTU: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
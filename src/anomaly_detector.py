@@ -17,6 +17,10 @@ from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 import warnings
 
+from config import AnomalyConfig
+from feature_stats import FeatureStats
+from model_store import IsolationForestModel
+
 warnings.filterwarnings('ignore')
 
 
@@ -26,132 +30,239 @@ class AnomalyDetector:
     
     contamination parametresi: Veride ne kadar anomali beklendigini belirliyor
     Ornegin 0.05 = %5 anomali bekliyorum demek
+    
+    n_jobs: Isolation Forest'in kullanacagi cekirdek sayisi (-1: hepsi).
+    Paralel calistirmada (parallel.py) isci basina paylastiriliyor.
+    
+    verbose: False ise ilerleme mesajlari yazilmiyor (paralel gorevlerde
+    ayni stdout'u paylasan thread'ler icin)
     """
     
     def __init__(
         self,
         contamination: float = 0.05,
         n_estimators: int = 100,
-        random_state: int = 42
+        random_state: int = 42,
+        n_jobs: int = -1,
+        verbose: bool = True
     ):
         # Parametreleri ayarliyorum
         self.contamination = contamination
         self.n_estimators = n_estimators
         self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        
+        # Eskisiyle uyumlu: son detect_isolation_forest'in olcekleyicisi.
+        # Artik ayrica fit edilmiyor, FeatureStats'in ortalama/olceginden dolduruluyor
         self.scaler = StandardScaler()
         
-    def detect_isolation_forest(self, X: np.ndarray) -> np.ndarray:
+        # Son detect_all_methods cagrisinin istatistik baglami (ortalama,
+        # std, ceyrekler, standartlastirilmis matris); disaridan incelenebilir
+        self.stats: Optional[FeatureStats] = None
+        
+        # Canli izleme icin referans istatistikleri (fit_reference ile dolar)
+        self.reference: Optional[Dict] = None
+        
+    def _log(self, message: str = ""):
+        """Ilerleme mesaji (verbose kapaliysa yazilmaz)"""
+        if self.verbose:
+            print(message)
+    
+    def detect_isolation_forest(self, X: np.ndarray, stats: Optional[FeatureStats] = None) -> np.ndarray:
         """
         Isolation Forest yöntemi ile anomali tespiti
         
         Args:
             X: Veri matrisi (n_samples, n_features)
+            stats: X'in istatistik bağlamı (verilmezse hesaplanır)
             
         Returns:
             numpy array: Anomali etiketleri (1: normal, -1: anomali)
         """
-        print(f"Isolation Forest ile tespit ediliyor...")
+        self._log(f"Isolation Forest ile tespit ediliyor...")
         
-        # Veriyi normalize et
-        X_scaled = self.scaler.fit_transform(X)
+        # Veriyi normalize et (standartlaştırılmış matris z-score ile ortak)
+        if stats is None:
+            stats = FeatureStats(X)
+        X_scaled = stats.standardized()
+        self._sync_scaler(stats)
         
         # Model oluştur ve eğit
         model = IsolationForest(
             contamination=self.contamination,
             n_estimators=self.n_estimators,
             random_state=self.random_state,
-            n_jobs=-1  # Tüm CPU çekirdeklerini kullan
+            n_jobs=self.n_jobs  # Varsayılan -1: tüm CPU çekirdekleri
         )
         
-        predictions = model.fit_predict(X_scaled)
+        model.fit(X_scaled)
         
-        # Anomali skorlarını al
+        # Skorları tek geçişte alıp etiketleri offset'ten çıkarıyorum
+        # (fit_predict + score_samples ağaçları iki kez dolaşıyordu)
         anomaly_scores = model.score_samples(X_scaled)
+        predictions = np.where(anomaly_scores - model.offset_ < 0, -1, 1)
         
         anomaly_count = np.sum(predictions == -1)
-        print(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
+        self._log(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
+        
+        return predictions, anomaly_scores
+    
+    def _sync_scaler(self, stats: FeatureStats):
+        """self.scaler'i fit edilmis bir StandardScaler gibi doldurur (transform calisir)"""
+        self.scaler.mean_ = stats.mean
+        self.scaler.var_ = stats.std ** 2
+        self.scaler.scale_ = stats.scale
+        self.scaler.n_samples_seen_ = stats.n_samples
+        self.scaler.n_features_in_ = len(stats.mean)
+    
+    def train_isolation_forest(self, X: np.ndarray, columns: List[str]) -> IsolationForestModel:
+        """
+        Isolation Forest'i bir kez eğitir (puanlamadan ayrı)
+        
+        Dönen model ModelStore ile kaydedilip sonraki çalıştırmalarda
+        score_isolation_forest() ile sadece puanlama maliyeti ödeniyor.
+        
+        Args:
+            X: Eğitim verisi (n_samples, n_features)
+            columns: X'in sütun isimleri (modelin özellik şeması)
+        
+        Returns:
+            IsolationForestModel: Scaler + ağaçlar
+        """
+        self._log(f"Isolation Forest egitiliyor ({len(X):,} ornek, {self.n_estimators} agac)...")
+        return IsolationForestModel.train(
+            X, columns,
+            contamination=self.contamination,
+            n_estimators=self.n_estimators,
+            random_state=self.random_state,
+            n_jobs=self.n_jobs
+        )
+    
+    def score_isolation_forest(
+        self,
+        X: np.ndarray,
+        model: IsolationForestModel
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eğitilmiş modelle tek geçişte puanlama
+        
+        Args:
+            X: Veri matrisi (sütunlar modelin şemasıyla aynı sırada)
+            model: train_isolation_forest() veya ModelStore.load() çıktısı
+        
+        Returns:
+            tuple: (etiketler, skorlar); skorlar score_samples ile aynı
+        """
+        self._log(f"Isolation Forest kayitli modelle puanlaniyor...")
+        predictions, anomaly_scores = model.predict(X)
+        
+        anomaly_count = np.sum(predictions == -1)
+        self._log(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
         
         return predictions, anomaly_scores
     
     def detect_z_score(
         self, 
         X: np.ndarray, 
-        threshold: float = 3.0
+        threshold: float = 3.0,
+        stats: Optional[FeatureStats] = None
     ) -> np.ndarray:
         """
         Z-Score yöntemi ile anomali tespiti
         
+        Sabit (std = 0) özelliklerde z tanımsız; o özellik oy vermiyor.
+        
         Args:
             X: Veri matrisi
             threshold: Z-score eşik değeri (genellikle 2-3 arası)
+            stats: X'in istatistik bağlamı (verilmezse hesaplanır)
             
         Returns:
             numpy array: Anomali etiketleri (1: normal, -1: anomali)
         """
-        print(f"Z-Score yontemi ile tespit ediliyor (threshold={threshold})...")
+        self._log(f"Z-Score yontemi ile tespit ediliyor (threshold={threshold})...")
+        
+        if stats is None:
+            stats = FeatureStats(X)
+        Z = stats.standardized()
         
-        # Her özellik için z-score hesapla
-        z_scores = np.abs((X - np.mean(X, axis=0)) / np.std(X, axis=0))
+        # En büyük |z| = max(satır maksimumu, -satır minimumu); |Z| için
+        # X boyutunda ikinci bir matris ayırmıyorum
+        z_max = Z.max(axis=1)
+        z_min = Z.min(axis=1)
+        np.negative(z_min, out=z_min)
+        np.maximum(z_max, z_min, out=z_max)
         
         # Herhangi bir özellikte threshold'u aşanları anomali olarak işaretle
-        predictions = np.ones(len(X), dtype=int)
-        anomalies = np.any(z_scores > threshold, axis=1)
-        predictions[anomalies] = -1
+        predictions = np.where(z_max > threshold, -1, 1)
         
         anomaly_count = np.sum(predictions == -1)
-        print(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
+        self._log(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
         
-        return predictions, z_scores.max(axis=1)
+        return predictions, z_max
     
     def detect_iqr(
         self, 
         X: np.ndarray, 
-        multiplier: float = 1.5
+        multiplier: float = 1.5,
+        stats: Optional[FeatureStats] = None
     ) -> np.ndarray:
         """
         IQR (Interquartile Range) yöntemi ile anomali tespiti
         
+        IQR = 0 olan özellikte sınır dışındaki her nokta sonsuz uzak.
+        
         Args:
             X: Veri matrisi
             multiplier: IQR çarpanı (1.5: outlier, 3.0: extreme outlier)
+            stats: X'in istatistik bağlamı (verilmezse hesaplanır)
             
         Returns:
             numpy array: Anomali etiketleri (1: normal, -1: anomali)
         """
-        print(f"IQR yontemi ile tespit ediliyor (multiplier={multiplier})...")
+        self._log(f"IQR yontemi ile tespit ediliyor (multiplier={multiplier})...")
+        
+        if stats is None:
+            stats = FeatureStats(X)
+        Q1, Q3 = stats.quantile(0.25), stats.quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - multiplier * IQR
+        upper_bound = Q3 + multiplier * IQR
         
-        predictions = np.ones(len(X), dtype=int)
         scores = np.zeros(len(X))
+        outliers = np.zeros(len(X), dtype=bool)
+        
+        # Özellik başına iki tampon ve bir maske, hepsi tekrar kullanılıyor
+        below = np.empty(len(X))
+        above = np.empty(len(X))
+        mask = np.empty(len(X), dtype=bool)
         
-        # Her özellik için IQR hesapla
         for feature_idx in range(X.shape[1]):
             feature_data = X[:, feature_idx]
             
-            Q1 = np.percentile(feature_data, 25)
-            Q3 = np.percentile(feature_data, 75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - multiplier * IQR
-            upper_bound = Q3 + multiplier * IQR
+            # Sınırdan uzaklık: alt sınırın altı + üst sınırın üstü (biri 0)
+            np.subtract(lower_bound[feature_idx], feature_data, out=below)
+            np.maximum(below, 0, out=below)
+            np.subtract(feature_data, upper_bound[feature_idx], out=above)
+            np.maximum(above, 0, out=above)
+            below += above
             
             # Alt veya üst sınırın dışındakiler anomali
-            outliers = (feature_data < lower_bound) | (feature_data > upper_bound)
-            predictions[outliers] = -1
+            np.greater(below, 0, out=mask)
+            outliers |= mask
             
-            # Score hesapla (sınırlardan ne kadar uzak)
-            distances = np.where(
-                feature_data < lower_bound,
-                lower_bound - feature_data,
-                np.where(
-                    feature_data > upper_bound,
-                    feature_data - upper_bound,
-                    0
-                )
-            )
-            scores = np.maximum(scores, distances / IQR)
+            # Score hesapla (sınırlardan ne kadar uzak / IQR)
+            if IQR[feature_idx] > 0:
+                below /= IQR[feature_idx]
+            else:
+                below[mask] = np.inf
+            np.maximum(scores, below, out=scores)
+        
+        predictions = np.where(outliers, -1, 1)
         
         anomaly_count = np.sum(predictions == -1)
-        print(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
+        self._log(f"   {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(X)*100):.2f})")
         
         return predictions, scores
     
@@ -172,7 +283,7 @@ class AnomalyDetector:
         Returns:
             numpy array: Anomali etiketleri
         """
-        print(f"Moving Average yontemi ile tespit ediliyor (window={window})...")
+        self._log(f"Moving Average yontemi ile tespit ediliyor (window={window})...")
         
         if data.ndim > 1:
             data = data.flatten()
@@ -189,7 +300,7 @@ class AnomalyDetector:
         predictions[deviations > threshold] = -1
         
         anomaly_count = np.sum(predictions == -1)
-        print(f"   ✓ {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(data)*100):.2f})")
+        self._log(f"   ✓ {anomaly_count} anomali tespit edildi (%{(anomaly_count/len(data)*100):.2f})")
         
         return predictions, deviations
     
@@ -198,16 +309,24 @@ class AnomalyDetector:
         X: np.ndarray,
         methods: Optional[List[str]] = None,
         z_score_threshold: float = 3.0,
-        iqr_multiplier: float = 1.5
+        iqr_multiplier: float = 1.5,
+        if_model: Optional[IsolationForestModel] = None,
+        stats: Optional[FeatureStats] = None
     ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
         """
         Tüm yöntemlerle anomali tespiti yapar
         
+        Ortalama, std, çeyrekler ve standartlaştırılmış matris bir kez
+        hesaplanıp (FeatureStats) bütün yöntemlere veriliyor. Bağlam
+        sonra self.stats'tan incelenebilir.
+        
         Args:
             X: Veri matrisi
             methods: Kullanılacak yöntemler listesi
             z_score_threshold: Z-score eşiği
             iqr_multiplier: IQR çarpanı
+            if_model: Kayıtlı Isolation Forest modeli (verilirse yeniden eğitilmez)
+            stats: X'in hazır istatistik bağlamı (verilmezse burada hesaplanır)
             
         Returns:
             dict: Her yöntem için (predictions, scores) tuple'ı
@@ -215,31 +334,258 @@ class AnomalyDetector:
         if methods is None:
             methods = ["isolation_forest", "z_score", "iqr"]
         
+        own_stats = stats is None
+        if own_stats:
+            stats = FeatureStats(X)
+        self.stats = stats
+        
         results = {}
         
-        print(f"\n{'='*60}")
-        print(f"ANOMALI TESPITI BASLIYOR - {len(methods)} yontem")
-        print(f"{'='*60}\n")
+        self._log(f"\n{'='*60}")
+        self._log(f"ANOMALI TESPITI BASLIYOR - {len(methods)} yontem")
+        self._log(f"{'='*60}\n")
         
         if "isolation_forest" in methods:
-            pred, scores = self.detect_isolation_forest(X)
+            if if_model is not None:
+                pred, scores = self.score_isolation_forest(X, if_model)
+            else:
+                pred, scores = self.detect_isolation_forest(X, stats=stats)
             results["isolation_forest"] = (pred, scores)
         
         if "z_score" in methods:
-            pred, scores = self.detect_z_score(X, threshold=z_score_threshold)
+            pred, scores = self.detect_z_score(X, threshold=z_score_threshold, stats=stats)
             results["z_score"] = (pred, scores)
         
         if "iqr" in methods:
-            pred, scores = self.detect_iqr(X, multiplier=iqr_multiplier)
+            pred, scores = self.detect_iqr(X, multiplier=iqr_multiplier, stats=stats)
             results["iqr"] = (pred, scores)
         
         if "moving_average" in methods:
             pred, scores = self.detect_moving_average(X)
             results["moving_average"] = (pred, scores)
         
-        print(f"\n{'='*60}")
-        print("TUM YONTEMLER TAMAMLANDI")
-        print(f"{'='*60}\n")
+        # Kendi olusturdugum baglamda X boyutundaki matrisleri birakiyorum,
+        # ozet istatistikler self.stats'ta kaliyor
+        if own_stats:
+            stats.release()
+        
+        self._log(f"\n{'='*60}")
+        self._log("TUM YONTEMLER TAMAMLANDI")
+        self._log(f"{'='*60}\n")
+        
+        return results
+    
+    def detect_walk_forward(
+        self,
+        X: np.ndarray,
+        window: Optional[int] = None,
+        step: Optional[int] = None,
+        methods: Optional[List[str]] = None,
+        z_score_threshold: float = 3.0,
+        iqr_multiplier: float = 1.5,
+        refresh_trees: Optional[int] = None,
+        backend: Optional[str] = None,
+        n_workers: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Walk-forward tespit: her blok sadece geçmişine göre puanlanır
+        
+        Son `window` satırla referans kurulur, sonraki `step` satır
+        puanlanır, pencere kaydırılır (ileriye bakma yok, backtest aynı
+        kararları tekrar üretir). İstatistikler kaydıkça güncellenir,
+        Isolation Forest her adımda ağaçlarının sadece bir kısmını
+        yeniler; ayrıntılar walk_forward.py'de.
+        
+        İlk `window` satırın geçmişi yok: etiket 1, skor NaN. Son pencerenin
+        referansı self.reference'a yazılır, bir sonraki mum score_latest
+        ile puanlanabilir.
+        
+        Args:
+            X: Veri matrisi (zaman sırasında)
+            window: Referans penceresi (varsayılan AnomalyConfig.WALK_FORWARD_WINDOW)
+            step: Adım boyu (varsayılan AnomalyConfig.WALK_FORWARD_STEP)
+            methods: Kullanılacak yöntemler
+            z_score_threshold: Z-score eşiği
+            iqr_multiplier: IQR çarpanı
+            refresh_trees: Adım başına yeniden eğitilen ağaç (None: ağaç
+                sayısı * step / window; n_estimators: her adımda tam eğitim)
+            backend: Ağaç eğitimleri için "thread" veya "process"
+            n_workers: İşçi sayısı
+            columns: X'in sütun isimleri
+            
+        Returns:
+            dict: Her yöntem için (predictions, scores) tuple'ı
+        """
+        # parallel.py bu modülü import ediyor, döngü olmasın diye burada
+        from walk_forward import walk_forward_detect
+        
+        if methods is None:
+            methods = ["isolation_forest", "z_score", "iqr"]
+        window = window or AnomalyConfig.WALK_FORWARD_WINDOW
+        step = step or AnomalyConfig.WALK_FORWARD_STEP
+        
+        self._log(f"\n{'='*60}")
+        self._log(f"WALK-FORWARD ANOMALI TESPITI - {len(methods)} yontem")
+        self._log(f"{'='*60}\n")
+        
+        results, self.reference = walk_forward_detect(
+            self, X, window, step,
+            methods=methods,
+            z_score_threshold=z_score_threshold,
+            iqr_multiplier=iqr_multiplier,
+            refresh_trees=refresh_trees,
+            backend=backend,
+            n_workers=n_workers,
+            columns=columns
+        )
+        
+        # Hareketli ortalama zaten sadece geçmiş pencereye bakıyor
+        if "moving_average" in methods:
+            results["moving_average"] = self.detect_moving_average(X)
+        
+        results = {method: results[method] for method in methods}
+        
+        self._log(f"\n{'='*60}")
+        self._log("WALK-FORWARD TAMAMLANDI")
+        self._log(f"{'='*60}\n")
+        
+        return results
+    
+    def fit_reference(
+        self,
+        X: np.ndarray,
+        methods: Optional[List[str]] = None,
+        iqr_multiplier: float = 1.5,
+        if_model: Optional[IsolationForestModel] = None,
+        columns: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Canlı izleme için referans istatistiklerini ve modelleri hazırlar
+        
+        Toplu yöntemler her çağrıda bütün veriyi baştan işliyor. Canlı
+        modda bunları bir kez geçmiş veri üzerinde hesaplıyorum, yeni gelen
+        mum score_latest() ile sadece bu referansa göre puanlanıyor.
+        
+        Args:
+            X: Geçmiş veri matrisi (n_samples, n_features)
+            methods: Kullanılacak yöntemler ("isolation_forest", "z_score", "iqr")
+            iqr_multiplier: IQR çarpanı
+            if_model: Kayıtlı Isolation Forest modeli (verilirse eğitilmez)
+            columns: X'in sütun isimleri (modelin özellik şeması)
+        
+        Returns:
+            dict: Referans istatistikleri
+        """
+        if methods is None:
+            methods = ["isolation_forest", "z_score", "iqr"]
+        
+        reference = {'methods': list(methods), 'n_samples': len(X)}
+        
+        stats = FeatureStats(X)
+        
+        if "z_score" in methods:
+            reference['mean'] = stats.mean
+            reference['std'] = stats.std
+        
+        if "iqr" in methods:
+            q1, q3 = stats.quantile(0.25), stats.quantile(0.75)
+            iqr = q3 - q1
+            reference['iqr'] = iqr
+            reference['lower_bound'] = q1 - iqr_multiplier * iqr
+            reference['upper_bound'] = q3 + iqr_multiplier * iqr
+        
+        if "isolation_forest" in methods:
+            if if_model is not None:
+                if columns is not None:
+                    if_model.check_columns(columns)
+            else:
+                if_model = IsolationForestModel.train(
+                    X, columns or [f"x{i}" for i in range(X.shape[1])],
+                    contamination=self.contamination,
+                    n_estimators=self.n_estimators,
+                    random_state=self.random_state,
+                    n_jobs=self.n_jobs
+                )
+            reference['model'] = if_model
+        
+        self.reference = reference
+        return reference
+    
+    def score_latest(
+        self,
+        x: np.ndarray,
+        z_score_threshold: float = 3.0
+    ) -> Dict[str, Tuple[int, float]]:
+        """
+        Tek bir yeni gözlemi referansa göre puanlar
+        
+        Skorlar toplu yöntemlerle aynı anlamda: z_score en büyük |z|,
+        iqr sınırdan uzaklık / IQR, isolation_forest score_samples.
+        
+        Args:
+            x: Yeni gözlem (n_features,)
+            z_score_threshold: Z-score eşiği
+        
+        Returns:
+            dict: Yöntem -> (etiket, skor). Etiket 1: normal, -1: anomali
+        """
+        if self.reference is None:
+            raise ValueError("Önce fit_reference() çağrılmalı")
+        
+        # Tek satırlık blok: score_block ile aynı hesap
+        x = np.asarray(x, dtype=np.float64).reshape(1, -1)
+        return {
+            method: (int(labels[0]), float(scores[0]))
+            for method, (labels, scores) in self.score_block(x, z_score_threshold).items()
+        }
+    
+    def score_block(
+        self,
+        X: np.ndarray,
+        z_score_threshold: float = 3.0
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Bir blok gözlemi referansa göre puanlar (score_latest'in vektörel hali)
+        
+        Büyük veride referans bir kez kurulup veri blok blok puanlanıyor.
+        Çıktı detect_all_methods() ile aynı biçimde, ensemble_voting'e
+        doğrudan verilebilir.
+        
+        Args:
+            X: Gözlemler (n_samples, n_features)
+            z_score_threshold: Z-score eşiği
+        
+        Returns:
+            dict: Yöntem -> (etiketler, skorlar)
+        """
+        if self.reference is None:
+            raise ValueError("Önce fit_reference() çağrılmalı")
+        
+        ref = self.reference
+        X = np.asarray(X, dtype=np.float64)
+        results = {}
+        
+        if "isolation_forest" in ref['methods']:
+            results["isolation_forest"] = ref['model'].predict(X)
+        
+        if "z_score" in ref['methods']:
+            # Sabit (std = 0) özellikte bölen 1 (FeatureStats.scale gibi);
+            # ham std ile 0/0 = NaN olup bütün satırın oyu kayboluyordu
+            scale = np.where(ref['std'] > 0, ref['std'], 1.0)
+            z = np.abs((X - ref['mean']) / scale).max(axis=1)
+            results["z_score"] = (np.where(z > z_score_threshold, -1, 1), z)
+        
+        if "iqr" in ref['methods']:
+            below = np.maximum(ref['lower_bound'] - X, 0)
+            above = np.maximum(X - ref['upper_bound'], 0)
+            distance = below + above
+            outlier = (distance > 0).any(axis=1)
+            # IQR = 0: sınır içi 0/0 -> 0, sınır dışı -> inf (RollingIQR gibi)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = distance / ref['iqr']
+            ratio[np.isnan(ratio)] = 0.0
+            results["iqr"] = (np.where(outlier, -1, 1), ratio.max(axis=1))
         
         return results
     
@@ -258,7 +604,7 @@ class AnomalyDetector:
         Returns:
             numpy array: Birleştirilmiş anomali etiketleri
         """
-        print(f"Ensemble Voting yapiliyor (min_votes={min_votes})...")
+        self._log(f"Ensemble Voting yapiliyor (min_votes={min_votes})...")
         
         # Her satır için oylama
         n_samples = len(next(iter(results.values()))[0])
@@ -272,11 +618,11 @@ class AnomalyDetector:
         ensemble_predictions = np.where(votes >= min_votes, -1, 1)
         
         anomaly_count = np.sum(ensemble_predictions == -1)
-        print(f"   Ensemble: {anomaly_count} anomali tespit edildi")
-        print(f"   Yontem basina anomali sayilari:")
+        self._log(f"   Ensemble: {anomaly_count} anomali tespit edildi")
+        self._log(f"   Yontem basina anomali sayilari:")
         for method_name, (predictions, _) in results.items():
             count = np.sum(predictions == -1)
-            print(f"      - {method_name}: {count}")
+            self._log(f"      - {method_name}: {count}")
         
         return ensemble_predictions, votes
 
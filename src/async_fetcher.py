@@ -0,0 +1,439 @@
+"""
+Async Veri Cekme Modulu
+
+DataFetcher tek tek, sirayla calisiyor. Yuzlerce USDT paritesini taramak
+saatler suruyordu. Bu modulde ccxt.async_support ile bircok pariteyi ayni
+anda cekiyorum.
+
+- Ayni borsaya giden butun istekler tek bir rate limiter'i paylasiyor
+- Ayni anda kac istek gidebilecegi ayarlanabiliyor (MAX_CONCURRENT_REQUESTS)
+- Yerel mum deposu (CandleStore) burada da kullaniliyor
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import ccxt.async_support as ccxt_async
+import numpy as np
+import pandas as pd
+
+from candle_buffer import OHLCVBuffer, estimate_candle_count
+from candle_store import CandleStore
+from config import ExchangeConfig
+from market_cache import MarketCache, shared_market_cache
+from rate_limiter import RetryPolicy, TokenBucket, get_rate_limiter
+
+
+class AsyncDataFetcher:
+    """
+    Bircok pariteyi ayni anda ceken async fetcher
+
+    Nasil kullanilir:
+        async with AsyncDataFetcher("binance", max_concurrency=20) as fetcher:
+            sonuclar = await fetcher.fetch_many(["BTC/USDT", "ETH/USDT"], "15m", days_back=7)
+
+    Async kod yazmadan kullanmak icin: fetch_many_ohlcv(...)
+    """
+
+    def __init__(
+        self,
+        exchange_name: str = "binance",
+        api_key: str = "",
+        api_secret: str = "",
+        max_concurrency: Optional[int] = None,
+        candle_store: Optional[CandleStore] = None,
+        use_store: Optional[bool] = None,
+        market_cache: Optional[MarketCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        exchange=None
+    ):
+        # exchange verilirse (ornegin AsyncReplayExchange) onu kullaniyorum
+        if exchange is not None:
+            self.exchange_name = exchange.id.lower()
+            self.exchange = exchange
+        else:
+            self.exchange_name = exchange_name.lower()
+            self.exchange = self._initialize_exchange(api_key, api_secret)
+        self.max_concurrency = max_concurrency or ExchangeConfig.MAX_CONCURRENT_REQUESTS
+
+        # Bu borsaya giden butun isteklerin paylastigi butce
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.exchange_name, self.exchange.rateLimit)
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=ExchangeConfig.MAX_RETRIES)
+
+        # Disaridan verilen borsanin (ReplayExchange) sentetik mumlari gercek
+        # depoya yazilmasin: depo ancak acikca verilirse kullaniliyor
+        if use_store is None:
+            use_store = candle_store is not None if exchange is not None else ExchangeConfig.USE_CANDLE_STORE
+        self.candle_store = (candle_store or CandleStore()) if use_store else None
+        # Market bilgisi onbellegi (butun fetcher'lar paylasiyor). Disaridan
+        # verilen borsanin (ReplayExchange) marketleri sadece bu fetcher'da kaliyor
+        if market_cache is None:
+            market_cache = MarketCache(persist=False) if exchange is not None else shared_market_cache()
+        self.market_cache = market_cache
+
+        # Semaphore'u event loop icinde olusturuyorum (py3.9 uyumlulugu icin)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _initialize_exchange(self, api_key: str, api_secret: str):
+        try:
+            exchange_class = getattr(ccxt_async, self.exchange_name)
+        except AttributeError:
+            raise ValueError(f"'{self.exchange_name}' borsası desteklenmiyor")
+
+        config = {
+            # Bekletmeyi kendi paylasilan limiter'imiz yapiyor
+            'enableRateLimit': False,
+            'timeout': 30000,
+        }
+        if api_key and api_secret:
+            config['apiKey'] = api_key
+            config['secret'] = api_secret
+
+        return exchange_class(config)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Borsa baglantisini (aiohttp oturumunu) kapatir"""
+        await self.exchange.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _request_page(self, symbol: str, timeframe: str, since: int) -> list:
+        """Tek bir sayfa ister (concurrency + rate limit + retry altinda)"""
+        return await self.retry_policy.call_async(
+            self.exchange, self.rate_limiter, 'fetch_ohlcv',
+            semaphore=self._get_semaphore(),
+            symbol=symbol,
+            timeframe=timeframe,
+            since=since,
+            limit=1000
+        )
+
+    async def _fetch_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: Optional[int] = None
+    ) -> OHLCVBuffer:
+        """[since, until] araligini sayfa sayfa tipli tampona ceker (until yoksa simdiye kadar)"""
+        end = until if until is not None else int(time.time() * 1000)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        buffer = OHLCVBuffer(capacity=estimate_candle_count(since, end, timeframe_ms))
+        current_since = since
+
+        while True:
+            ohlcv = await self._request_page(symbol, timeframe, current_since)
+            if not ohlcv:
+                break
+
+            buffer.append_page(ohlcv)
+            last_timestamp = ohlcv[-1][0]
+
+            end = until if until is not None else int(time.time() * 1000)
+            if last_timestamp >= end:
+                break
+
+            current_since = last_timestamp + 1
+
+        return buffer
+
+    async def _fetch_with_store(self, symbol: str, timeframe: str, since: int) -> OHLCVBuffer:
+        """DataFetcher._fetch_with_store'un async karsiligi"""
+        store = self.candle_store
+        now = int(time.time() * 1000)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed_before = now - timeframe_ms + 1
+
+        missing = store.missing_ranges(self.exchange_name, symbol, timeframe, since, closed_before)
+        if not missing:
+            missing = [(closed_before, now)]
+
+        live = None
+        for range_start, range_end in missing:
+            fetched = (await self._fetch_range(symbol, timeframe, range_start, until=range_end)).columns()
+
+            closed = fetched['timestamp_ms'] < closed_before
+            if not closed.all():
+                live = {col: arr[~closed][-1:] for col, arr in fetched.items()}
+
+            store.merge(
+                self.exchange_name, symbol, timeframe,
+                {col: arr[closed] for col, arr in fetched.items()},
+                covered_from=range_start,
+                covered_to=min(range_end, closed_before)
+            )
+
+        stored = store.load(self.exchange_name, symbol, timeframe, since=since,
+                            until=closed_before, mmap=True)
+        buffer = OHLCVBuffer.from_columns(stored, extra_capacity=1)
+        if live is not None:
+            buffer.append_columns(live)
+
+        return buffer
+
+    async def _validate_symbol(self, symbol: str):
+        """Sembolu yerel market onbelleginde arar (yoksa bir kez yeniler)"""
+        symbols = await self.market_cache.load_async(
+            self.exchange, limiter=self.rate_limiter, retry_policy=self.retry_policy
+        )
+        if symbol not in symbols:
+            symbols = await self.market_cache.load_async(
+                self.exchange, force=True, limiter=self.rate_limiter, retry_policy=self.retry_policy
+            )
+        if symbol not in symbols:
+            raise ValueError(f"'{symbol}' sembolü {self.exchange_name}'de bulunamadı")
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "15m",
+        days_back: int = 60,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Tek parite icin OHLCV verisi ceker (DataFetcher.fetch_ohlcv ile ayni cikti)
+
+        Args:
+            symbol: Trading çifti (örn: BTC/USDT)
+            timeframe: Zaman dilimi (1m, 5m, 15m, 1h, 4h, 1d)
+            days_back: Kaç gün öncesinden başlasın
+            limit: Maksimum kayıt sayısı
+
+        Returns:
+            DataFrame: OHLCV verileri
+        """
+        await self._validate_symbol(symbol)
+
+        since = int((datetime.now() - timedelta(days=days_back)).timestamp() * 1000)
+
+        if self.candle_store is not None:
+            buffer = await self._fetch_with_store(symbol, timeframe, since)
+        else:
+            buffer = await self._fetch_range(symbol, timeframe, since)
+
+        if limit:
+            buffer.truncate(limit)
+
+        return buffer.to_dataframe()
+
+    async def fetch_many(
+        self,
+        symbols: List[str],
+        timeframe: str = "15m",
+        days_back: int = 60,
+        limit: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bircok pariteyi ayni anda ceker
+
+        Hata veren pariteler atlaniyor, digerleri etkilenmiyor.
+
+        Returns:
+            dict: Parite -> OHLCV DataFrame (basarili olanlar)
+        """
+        # Marketleri bir kez yukluyorum (onbellekten), butun gorevler bunu kullaniyor
+        await self.market_cache.load_async(
+            self.exchange, limiter=self.rate_limiter, retry_policy=self.retry_policy
+        )
+
+        print(f"{len(symbols)} parite ayni anda cekiliyor "
+              f"({self.exchange_name}, max {self.max_concurrency} istek)")
+        start = time.perf_counter()
+
+        tasks = [
+            self.fetch_ohlcv(symbol, timeframe, days_back=days_back, limit=limit)
+            for symbol in symbols
+        ]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = {}
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"   {symbol} atlandi: {outcome}")
+                continue
+            results[symbol] = outcome
+
+        elapsed = time.perf_counter() - start
+        print(f"   {len(results)}/{len(symbols)} parite cekildi ({elapsed:.1f} sn)")
+
+        return results
+
+    def _make_shards(self, start: int, end: int, timeframe_ms: int) -> List[Tuple[int, int]]:
+        """
+        [start, end) araligini sayfa boyunda, timeframe'e hizali parcalara boler
+
+        Her parca tam bir sayfa (1000 mum) genisliginde. Parca sinirlari
+        mum acilis zamanlarina denk geliyor, boylece iki parca ayni mumu
+        istemiyor.
+        """
+        shard_span = 1000 * timeframe_ms
+        aligned_start = start - (start % timeframe_ms)
+
+        shards = []
+        shard_start = aligned_start
+        while shard_start < end:
+            shard_end = min(shard_start + shard_span, end)
+            shards.append((max(shard_start, start), shard_end))
+            shard_start += shard_span
+        return shards
+
+    async def _fetch_shard(self, symbol: str, timeframe: str, shard: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        """Tek bir parcayi ceker ve parca disina tasan mumlari atar"""
+        shard_start, shard_end = shard
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        # Parcadaki son mumun acilis zamanina ulasinca duruyorum (fazladan sayfa istemiyorum)
+        last_open = max(shard_start, shard_end - timeframe_ms)
+        columns = (await self._fetch_range(symbol, timeframe, shard_start, until=last_open)).columns()
+        ts = columns['timestamp_ms']
+        inside = (ts >= shard_start) & (ts < shard_end)
+        return {col: arr[inside] for col, arr in columns.items()}
+
+    async def backfill(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        days_back: int = 365,
+        since: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Tek parite icin uzun gecmisi paralel parcalar halinde ceker
+
+        Normal cekimde her sayfa bir oncekinin son zaman damgasini bekliyor.
+        Burada [since, simdi) araligini timeframe'e hizali parcalara bolup
+        parcalari ayni anda (rate limit butcesi icinde) cekiyorum. Sonra
+        parcalari sirayla birlestirip sinirlardaki tekrarlari atiyorum.
+
+        Args:
+            symbol: Trading çifti (örn: BTC/USDT)
+            timeframe: Zaman dilimi
+            days_back: Kaç gün öncesinden başlasın (since verilmezse)
+            since: Baslangic zamani (ms)
+
+        Returns:
+            DataFrame: OHLCV verileri
+        """
+        await self._validate_symbol(symbol)
+
+        if since is None:
+            since = int((datetime.now() - timedelta(days=days_back)).timestamp() * 1000)
+        now = int(time.time() * 1000)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed_before = now - timeframe_ms + 1
+
+        # Depo varsa sadece eksik araliklari parcaliyorum
+        if self.candle_store is not None:
+            ranges = self.candle_store.missing_ranges(
+                self.exchange_name, symbol, timeframe, since, closed_before
+            )
+            if not ranges:
+                ranges = [(closed_before, now)]
+        else:
+            ranges = [(since, now)]
+
+        shards = [
+            shard
+            for range_start, range_end in ranges
+            for shard in self._make_shards(range_start, range_end, timeframe_ms)
+        ]
+        # Canli mum son parcaya dusmeyebilir, son parcayi simdiye kadar uzatiyorum
+        if shards:
+            shards[-1] = (shards[-1][0], max(shards[-1][1], now + 1))
+
+        print(f"Paralel backfill: {symbol} ({timeframe}) - {len(shards)} parca, "
+              f"max {self.max_concurrency} istek")
+        start = time.perf_counter()
+
+        shard_columns = await asyncio.gather(*[
+            self._fetch_shard(symbol, timeframe, shard) for shard in shards
+        ])
+
+        # Parcalar zaten sirali, tek tampona art arda yaziyorum
+        buffer = OHLCVBuffer(capacity=sum(len(c['timestamp_ms']) for c in shard_columns) + 1)
+        for columns in shard_columns:
+            buffer.append_columns(columns)
+        columns = buffer.columns()
+
+        # Sinirlarda tekrar olduysa (sira bozulduysa) tekrarlari atiyorum
+        if not buffer.is_monotonic:
+            _, first_idx = np.unique(columns['timestamp_ms'], return_index=True)
+            columns = {col: arr[first_idx] for col, arr in columns.items()}
+
+        if self.candle_store is not None:
+            closed_mask = columns['timestamp_ms'] < closed_before
+            for range_start, range_end in ranges:
+                in_range = closed_mask & (columns['timestamp_ms'] >= range_start) & \
+                    (columns['timestamp_ms'] < range_end)
+                self.candle_store.merge(
+                    self.exchange_name, symbol, timeframe,
+                    {col: arr[in_range] for col, arr in columns.items()},
+                    covered_from=range_start,
+                    covered_to=min(range_end, closed_before)
+                )
+
+            live = {col: arr[~closed_mask][-1:] for col, arr in columns.items()}
+            stored = self.candle_store.load(
+                self.exchange_name, symbol, timeframe, since=since, until=closed_before, mmap=True
+            )
+            buffer = OHLCVBuffer.from_columns(stored, extra_capacity=1)
+            buffer.append_columns(live)
+        elif not buffer.is_monotonic:
+            buffer = OHLCVBuffer.from_columns(columns)
+
+        elapsed = time.perf_counter() - start
+        print(f"   {len(buffer)} mum cekildi ({elapsed:.1f} sn)")
+
+        return buffer.to_dataframe()
+
+
+def backfill_ohlcv(
+    symbol: str,
+    exchange_name: str = "binance",
+    timeframe: str = "1m",
+    days_back: int = 365,
+    max_concurrency: Optional[int] = None,
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Async kod yazmadan tek parite icin paralel backfill yapar
+
+    Ornek:
+        df = backfill_ohlcv("BTC/USDT", "binance", "1m", days_back=365)
+    """
+    async def _run():
+        async with AsyncDataFetcher(exchange_name, max_concurrency=max_concurrency, **kwargs) as fetcher:
+            return await fetcher.backfill(symbol, timeframe, days_back=days_back)
+
+    return asyncio.run(_run())
+
+
+def fetch_many_ohlcv(
+    symbols: List[str],
+    exchange_name: str = "binance",
+    timeframe: str = "15m",
+    days_back: int = 60,
+    max_concurrency: Optional[int] = None,
+    **kwargs
+) -> Dict[str, pd.DataFrame]:
+    """
+    Async kod yazmadan bircok pariteyi ayni anda ceker
+
+    Ornek:
+        sonuclar = fetch_many_ohlcv(["BTC/USDT", "ETH/USDT"], "binance", "15m", days_back=7)
+    """
+    async def _run():
+        async with AsyncDataFetcher(exchange_name, max_concurrency=max_concurrency, **kwargs) as fetcher:
+            return await fetcher.fetch_many(symbols, timeframe, days_back=days_back)
+
+    return asyncio.run(_run())
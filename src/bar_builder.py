@@ -0,0 +1,207 @@
+"""
+Islem (Trade) Bazli Bar Olusturucu
+
+Borsanin hazir mumlari (15m vs.) mumun icindeki anomalileri yumusatiyor.
+Ani islem patlamalarinda da zaman barlari kotu davraniyor: sakin saatte
+bir mumda 10 islem, patlamada 10.000 islem oluyor.
+
+Bu modulu ham islemlerden kendi barlarimizi kurmak icin yazdim:
+- time:   Sabit zaman araligi (borsa mumlariyla ayni hizalama)
+- tick:   Her N islemde bir bar
+- volume: Her N birim hacimde bir bar
+- dollar: Her N USDT islem tutarinda bir bar
+
+Butun bar tipleri tek NumPy geciste kuruluyor: once her isleme bir bar
+numarasi veriliyor, sonra ufunc.reduceat ile barlar tek seferde
+toplaniyor. Islem basina Python dongusu yok.
+
+Cikti DataProcessor'in bekledigi OHLCV formatinda:
+timestamp_ms, open, high, low, close, volume, timestamp
+"""
+
+from typing import Dict, List, Union
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from candle_store import OHLCV_COLUMNS
+from candle_buffer import OHLCVBuffer
+
+
+# Islem sutunlari (fetch_trades ciktisi)
+TRADE_COLUMNS = ['timestamp_ms', 'price', 'amount']
+
+BAR_TYPES = ['time', 'tick', 'volume', 'dollar']
+
+
+def trades_to_columns(trades: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    ccxt'nin islem listesini ([{'timestamp':..., 'price':..., 'amount':...}])
+    tipli sutunlara cevirir
+    """
+    n = len(trades)
+    timestamps = np.fromiter((t['timestamp'] for t in trades), dtype=np.int64, count=n)
+    prices = np.fromiter((t['price'] for t in trades), dtype=np.float64, count=n)
+    amounts = np.fromiter((t['amount'] for t in trades), dtype=np.float64, count=n)
+    return {'timestamp_ms': timestamps, 'price': prices, 'amount': amounts}
+
+
+def concat_trade_columns(pages: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Sayfa sayfa gelen islem sutunlarini tek kopyayla birlestirir"""
+    if not pages:
+        return {'timestamp_ms': np.empty(0, dtype=np.int64),
+                'price': np.empty(0, dtype=np.float64),
+                'amount': np.empty(0, dtype=np.float64)}
+    return {col: np.concatenate([page[col] for page in pages]) for col in TRADE_COLUMNS}
+
+
+def _timeframe_ms(size: Union[str, int]) -> int:
+    """'15m' gibi bir timeframe'i veya ms degerini ms'ye cevirir"""
+    if isinstance(size, str):
+        return int(ccxt.Exchange.parse_timeframe(size) * 1000)
+    return int(size)
+
+
+def assign_bar_ids(
+    trades: Dict[str, np.ndarray],
+    bar_type: str,
+    size: Union[str, int, float]
+) -> np.ndarray:
+    """
+    Her isleme ait oldugu barin numarasini verir (artan sirada)
+
+    volume/dollar barlarinda bir islem, kendisinden ONCEKI kumulatif
+    toplam [k*size, (k+1)*size) araligindaysa k. bara dusuyor. Yani
+    esigi gecen islem o barin son islemi oluyor, tasan kisim bir sonraki
+    barin hesabina sayiliyor.
+
+    Args:
+        trades: Zaman sirali islem sutunlari
+        bar_type: 'time', 'tick', 'volume' veya 'dollar'
+        size: time icin timeframe ('15m') veya ms, digerleri icin esik
+
+    Returns:
+        np.ndarray: int64 bar numaralari
+    """
+    timestamps = trades['timestamp_ms']
+
+    if bar_type == 'time':
+        return timestamps // _timeframe_ms(size)
+
+    if bar_type == 'tick':
+        return np.arange(len(timestamps), dtype=np.int64) // int(size)
+
+    if bar_type == 'volume':
+        values = trades['amount']
+    elif bar_type == 'dollar':
+        values = trades['price'] * trades['amount']
+    else:
+        raise ValueError(f"Bilinmeyen bar tipi: {bar_type} (secenekler: {BAR_TYPES})")
+
+    if size <= 0:
+        raise ValueError("Bar esigi pozitif olmali")
+
+    cumulative_before = np.cumsum(values) - values
+    return (cumulative_before // size).astype(np.int64)
+
+
+def aggregate_bars(
+    bar_ids: np.ndarray,
+    timestamps: np.ndarray,
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Ardisik ayni numarali satirlari tek bara toplar (first/max/min/last/sum)
+
+    Girdi bar_ids'e gore sirali olmali. Hem islemlerden (open=high=low=close
+    = fiyat) hem de mumlardan (resampler) bar kurmak icin kullaniliyor.
+
+    Returns:
+        dict: Bar numarasi ('bar_id'), ilk satirin zamani ve OHLCV sutunlari
+    """
+    n = len(bar_ids)
+    if n == 0:
+        empty = {col: np.empty(0, dtype=np.float64) for col in OHLCV_COLUMNS[1:]}
+        empty['timestamp_ms'] = np.empty(0, dtype=np.int64)
+        empty['bar_id'] = np.empty(0, dtype=np.int64)
+        return empty
+
+    # Her barin ilk ve son satiri
+    starts = np.flatnonzero(np.r_[True, bar_ids[1:] != bar_ids[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    return {
+        'bar_id': bar_ids[starts],
+        'timestamp_ms': timestamps[starts],
+        'open': opens[starts],
+        'high': np.maximum.reduceat(highs, starts),
+        'low': np.minimum.reduceat(lows, starts),
+        'close': closes[ends],
+        'volume': np.add.reduceat(volumes, starts),
+    }
+
+
+def build_bar_columns(
+    trades: Dict[str, np.ndarray],
+    bar_type: str = 'time',
+    size: Union[str, int, float] = '1m'
+) -> Dict[str, np.ndarray]:
+    """
+    Islemlerden bar sutunlari kurar
+
+    Zaman barlarinin zamani bucket baslangici (borsa mumlariyla ayni),
+    diger barlarin zamani ilk islemin zamani. Islem olmayan zaman
+    araliklari icin bar uretilmiyor.
+
+    Returns:
+        dict: OHLCV_COLUMNS sutunlari
+    """
+    timestamps = np.asarray(trades['timestamp_ms'], dtype=np.int64)
+    prices = np.asarray(trades['price'], dtype=np.float64)
+    amounts = np.asarray(trades['amount'], dtype=np.float64)
+
+    # Borsalar islemleri zaman sirasinda veriyor, degilse bir kez siraliyorum
+    if len(timestamps) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, prices, amounts = timestamps[order], prices[order], amounts[order]
+
+    sorted_trades = {'timestamp_ms': timestamps, 'price': prices, 'amount': amounts}
+    bar_ids = assign_bar_ids(sorted_trades, bar_type, size)
+    bars = aggregate_bars(bar_ids, timestamps, prices, prices, prices, prices, amounts)
+
+    if bar_type == 'time':
+        bars['timestamp_ms'] = bars['bar_id'] * _timeframe_ms(size)
+
+    return {col: bars[col] for col in OHLCV_COLUMNS}
+
+
+def build_bars(
+    trades: Dict[str, np.ndarray],
+    bar_type: str = 'time',
+    size: Union[str, int, float] = '1m',
+    dtype=np.float64
+) -> pd.DataFrame:
+    """
+    Islemlerden DataProcessor'a verilebilecek OHLCV DataFrame'i kurar
+
+    Nasil kullanilir:
+        trades = fetcher.fetch_trades("BTC/USDT", hours_back=6)
+        df = build_bars(trades, "dollar", 1_000_000)
+        processor = DataProcessor(df)
+
+    Args:
+        trades: fetch_trades ciktisi (timestamp_ms, price, amount)
+        bar_type: 'time', 'tick', 'volume' veya 'dollar'
+        size: time icin timeframe ('15m'), digerleri icin esik
+        dtype: Fiyat/hacim sutunlarinin tipi
+
+    Returns:
+        DataFrame: timestamp_ms, open, high, low, close, volume, timestamp
+    """
+    columns = build_bar_columns(trades, bar_type, size)
+    return OHLCVBuffer.from_columns(columns, dtype=dtype).to_dataframe()
@@ -0,0 +1,176 @@
+"""
+Sutun Bazli Mum Tamponu
+
+fetch_ohlcv eskiden her sayfayi all_ohlcv.extend(...) ile Python listesine
+ekliyordu. Milyonlarca 1m mumda bu, milyonlarca kutulanmis Python float'u
+ve zaten sirali verinin bastan siralanmasi demekti.
+
+Bu modulde her sayfayi dogrudan tipli NumPy sutunlarina yaziyorum:
+- timestamp_ms: int64
+- open, high, low, close, volume: float64 (istenirse float32)
+DataFrame bu sutunlardan kopyalamadan olusturuluyor, veri zaten siraliysa
+siralama atlaniyor.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from candle_store import OHLCV_COLUMNS
+
+
+# timestamp_ms disindaki sutunlar
+VALUE_COLUMNS = OHLCV_COLUMNS[1:]
+
+
+class OHLCVBuffer:
+    """
+    Buyuyebilen, tipli OHLCV tamponu
+
+    Fiyat ve hacim sutunlarini tek bir (5, kapasite) array'de tutuyorum.
+    Boylece to_dataframe() bu blogu pandas'a kopyalamadan verebiliyor.
+
+    Nasil kullanilir:
+        buffer = OHLCVBuffer(capacity=beklenen_mum_sayisi)
+        buffer.append_page(exchange.fetch_ohlcv(...))
+        df = buffer.to_dataframe()
+
+    Not: to_dataframe()'dan sonra tampona yazmaya devam etme, DataFrame
+    ayni bellegi kullaniyor.
+
+    Args:
+        capacity: Baslangic kapasitesi (mum sayisi). Asilirsa iki katina cikar.
+        dtype: Fiyat/hacim sutunlarinin tipi (float64 veya float32)
+    """
+
+    def __init__(self, capacity: int = 1024, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        capacity = max(int(capacity), 1)
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((len(VALUE_COLUMNS), capacity), dtype=self.dtype)
+        self._size = 0
+        self._monotonic = True
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def is_monotonic(self) -> bool:
+        """Zaman damgalari kesin artan sirada mi (tekrar ve geri gitme yok)"""
+        return self._monotonic
+
+    def _reserve(self, extra: int):
+        """En az extra satirlik yer acar (gerekirse kapasiteyi ikiye katlar)"""
+        needed = self._size + extra
+        if needed <= self.capacity:
+            return
+
+        new_capacity = max(needed, self.capacity * 2)
+        timestamps = np.empty(new_capacity, dtype=np.int64)
+        values = np.empty((len(VALUE_COLUMNS), new_capacity), dtype=self.dtype)
+        timestamps[:self._size] = self._timestamps[:self._size]
+        values[:, :self._size] = self._values[:, :self._size]
+        self._timestamps = timestamps
+        self._values = values
+
+    def _track_order(self, timestamps: np.ndarray):
+        if not self._monotonic or len(timestamps) == 0:
+            return
+        if self._size > 0 and timestamps[0] <= self._timestamps[self._size - 1]:
+            self._monotonic = False
+        elif len(timestamps) > 1 and not np.all(timestamps[1:] > timestamps[:-1]):
+            self._monotonic = False
+
+    def append_page(self, rows: list):
+        """
+        ccxt'den gelen bir sayfayi ([[ts, o, h, l, c, v], ...]) ekler
+
+        Sayfa tek bir np.asarray ile C tarafinda donusuyor, satir satir
+        Python nesnesi olusturmuyorum.
+        """
+        if not rows:
+            return
+
+        page = np.asarray(rows, dtype=np.float64)
+        if page.ndim != 2 or page.shape[1] < len(OHLCV_COLUMNS):
+            raise ValueError(f"Beklenmeyen OHLCV sayfa formati: {page.shape}")
+
+        n = len(page)
+        timestamps = page[:, 0].astype(np.int64)
+        self._reserve(n)
+        self._track_order(timestamps)
+
+        start, end = self._size, self._size + n
+        self._timestamps[start:end] = timestamps
+        self._values[:, start:end] = page[:, 1:len(OHLCV_COLUMNS)].T
+        self._size = end
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        """Sutunlar halindeki mumlari ekler (depo veya baska bir tampon)"""
+        n = len(columns['timestamp_ms'])
+        if n == 0:
+            return
+
+        timestamps = np.asarray(columns['timestamp_ms'], dtype=np.int64)
+        self._reserve(n)
+        self._track_order(timestamps)
+
+        start, end = self._size, self._size + n
+        self._timestamps[start:end] = timestamps
+        for i, col in enumerate(VALUE_COLUMNS):
+            self._values[i, start:end] = columns[col]
+        self._size = end
+
+    def truncate(self, n: int):
+        """Ilk n satiri birakir"""
+        self._size = min(self._size, max(int(n), 0))
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Dolu kismi sutunlar halinde doner (kopya degil, view)"""
+        n = self._size
+        columns = {'timestamp_ms': self._timestamps[:n]}
+        for i, col in enumerate(VALUE_COLUMNS):
+            columns[col] = self._values[i, :n]
+        return columns
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame olusturur (ham_veri CSV formatiyla ayni sutunlar)
+
+        Veri siraliysa fiyat/hacim blogu kopyalanmadan DataFrame'e veriliyor.
+        Sirali degilse bir kez (stable) siraliyorum. Tekrar eden zaman
+        damgalarini DataProcessor.clean_data() temizliyor.
+        """
+        n = self._size
+        timestamps = self._timestamps[:n]
+        values = self._values[:, :n]
+
+        if not self._monotonic:
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+            values = values[:, order]
+
+        df = pd.DataFrame(values.T, columns=VALUE_COLUMNS, copy=False)
+        df.insert(0, 'timestamp_ms', timestamps)
+        df['timestamp'] = pd.to_datetime(timestamps, unit='ms')
+        return df
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], dtype=np.float64,
+                     extra_capacity: int = 0) -> "OHLCVBuffer":
+        """Sutunlardan (tek kopya ile) tampon olusturur"""
+        buffer = cls(capacity=len(columns['timestamp_ms']) + extra_capacity, dtype=dtype)
+        buffer.append_columns(columns)
+        return buffer
+
+
+def estimate_candle_count(since: int, until: int, timeframe_ms: int, limit: Optional[int] = None) -> int:
+    """[since, until] araliginda beklenen mum sayisi (tamponu onceden ayirmak icin)"""
+    count = max(0, (until - since) // max(timeframe_ms, 1)) + 2
+    if limit:
+        count = min(count, limit)
+    return int(count)
@@ -0,0 +1,244 @@
+"""
+Yerel Mum Deposu
+
+Her calistirmada 60 gunluk veriyi bastan cekmemek icin bu modulu yazdim.
+Cekilen mumlari borsa/parite/timeframe bazinda diske kaydediyorum.
+Bir sonraki calistirmada sadece eksik kalan zaman araliklarini borsadan
+istiyorum.
+
+Dosya yapisi (sutun bazli, her sutun ayri bir .npy dosyasi):
+    data/candles/binance/BTC_USDT/15m/
+        timestamp_ms.npy
+        open.npy  high.npy  low.npy  close.npy  volume.npy
+        meta.json   <- hangi aralik kapsaniyor, kac satir var
+"""
+
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import CANDLE_STORE_DIR
+
+
+# Depodaki sutunlar ve veri tipleri
+OHLCV_COLUMNS = ['timestamp_ms', 'open', 'high', 'low', 'close', 'volume']
+COLUMN_DTYPES = {
+    'timestamp_ms': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+}
+
+
+class CandleStore:
+    """
+    Mum verilerini diskte sutun bazli saklayan depo
+
+    Sadece kapanmis mumlari sakliyorum. Henuz kapanmamis (canli) mum
+    her seferinde borsadan tekrar cekiliyor, boylece depoya yarim mum
+    yazilmiyor.
+
+    Nasil kullanilir:
+        store = CandleStore()
+        eksikler = store.missing_ranges("binance", "BTC/USDT", "15m", since, now)
+        store.merge("binance", "BTC/USDT", "15m", columns, covered_from, covered_to)
+        columns = store.load("binance", "BTC/USDT", "15m", since=since)
+    """
+
+    def __init__(self, root_dir: Optional[Path] = None):
+        self.root_dir = Path(root_dir) if root_dir is not None else CANDLE_STORE_DIR
+
+    def _partition_dir(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        """Borsa/parite/timeframe icin klasor yolunu doner"""
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return self.root_dir / exchange.lower() / safe_symbol / timeframe
+
+    def _read_meta(self, partition: Path) -> Optional[dict]:
+        meta_path = partition / "meta.json"
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Bozuk meta dosyasi varsa depoyu yok sayiyorum
+            return None
+
+    def coverage(self, exchange: str, symbol: str, timeframe: str) -> Optional[Tuple[int, int]]:
+        """
+        Depoda kapsanan zaman araligini doner
+
+        Returns:
+            (covered_from, covered_to) ms cinsinden, covered_to haric.
+            Depo bossa None.
+        """
+        meta = self._read_meta(self._partition_dir(exchange, symbol, timeframe))
+        if meta is None:
+            return None
+        return int(meta['covered_from']), int(meta['covered_to'])
+
+    def missing_ranges(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: int
+    ) -> List[Tuple[int, int]]:
+        """
+        [since, until) araliginda depoda olmayan kisimlari doner
+
+        Kapsanan aralik her zaman tek parca tutuluyor. Bu yuzden en fazla
+        iki eksik aralik olabilir: bastaki ve sondaki.
+
+        Args:
+            since: Baslangic (ms)
+            until: Bitis (ms, genellikle simdiki zaman)
+
+        Returns:
+            list: (baslangic, bitis) ms araliklari
+        """
+        covered = self.coverage(exchange, symbol, timeframe)
+        if covered is None:
+            return [(since, until)]
+
+        covered_from, covered_to = covered
+        ranges = []
+
+        # Depodan daha eski bir baslangic istenmisse bas kismi eksik
+        if since < covered_from:
+            ranges.append((since, covered_from))
+
+        # Son kisim her zaman cekiliyor (canli mum + yeni kapananlar).
+        # since deponun sonundan ilerideyse aradaki boslugu da dolduruyorum
+        # ki kapsanan aralik tek parca kalsin.
+        if covered_to < until:
+            ranges.append((covered_to, until))
+
+        return ranges
+
+    def load(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        mmap: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Depodaki mumlari sutunlar halinde okur
+
+        Args:
+            since: Bu zamandan itibaren (ms, dahil)
+            until: Bu zamana kadar (ms, haric)
+            mmap: True ise dosyalar bellege kopyalanmadan (memory-map) acilir
+
+        Returns:
+            dict: Sutun adi -> numpy array. Depo bossa bos array'ler.
+        """
+        partition = self._partition_dir(exchange, symbol, timeframe)
+        meta = self._read_meta(partition)
+        if meta is None:
+            return self._empty_columns()
+
+        columns = {}
+        for col in OHLCV_COLUMNS:
+            path = partition / f"{col}.npy"
+            if not path.exists():
+                return self._empty_columns()
+            columns[col] = np.load(path, mmap_mode='r' if mmap else None)
+
+            # Yazma yarida kesildiyse satir sayilari tutmaz
+            if len(columns[col]) != meta['rows']:
+                return self._empty_columns()
+
+        # Zaman damgalari sirali, araligi binary search ile buluyorum
+        ts = columns['timestamp_ms']
+        start = 0 if since is None else int(np.searchsorted(ts, since, side='left'))
+        end = len(ts) if until is None else int(np.searchsorted(ts, until, side='left'))
+
+        return {col: arr[start:end] for col, arr in columns.items()}
+
+    def merge(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        columns: Dict[str, np.ndarray],
+        covered_from: int,
+        covered_to: int
+    ):
+        """
+        Yeni cekilen kapanmis mumlari depoyla birlestirip kaydeder
+
+        Ayni zaman damgasi iki kez gelirse depodaki kaydi tutuyorum
+        (kapanmis mum degismez).
+
+        Args:
+            columns: Yeni mumlar (sutun adi -> array)
+            covered_from: Bu cekimin kapsadigi baslangic (ms)
+            covered_to: Bu cekimin kapsadigi bitis (ms, haric)
+        """
+        partition = self._partition_dir(exchange, symbol, timeframe)
+        existing = self.load(exchange, symbol, timeframe)
+        old_coverage = self.coverage(exchange, symbol, timeframe)
+
+        merged = {}
+        for col in OHLCV_COLUMNS:
+            merged[col] = np.concatenate([
+                np.asarray(existing[col], dtype=COLUMN_DTYPES[col]),
+                np.asarray(columns[col], dtype=COLUMN_DTYPES[col])
+            ])
+
+        # Sirala ve tekrar edenleri at (np.unique ilk gorulen indexi doner)
+        _, first_idx = np.unique(merged['timestamp_ms'], return_index=True)
+        merged = {col: arr[first_idx] for col, arr in merged.items()}
+
+        if old_coverage is not None:
+            covered_from = min(covered_from, old_coverage[0])
+            covered_to = max(covered_to, old_coverage[1])
+
+        partition.mkdir(parents=True, exist_ok=True)
+
+        # Once sutunlari, en son meta dosyasini yaziyorum.
+        # Boylece yarim kalan yazma load() tarafinda fark ediliyor.
+        for col, arr in merged.items():
+            self._atomic_save(partition / f"{col}.npy", arr)
+
+        meta = {
+            'exchange': exchange.lower(),
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'rows': int(len(merged['timestamp_ms'])),
+            'covered_from': int(covered_from),
+            'covered_to': int(covered_to),
+        }
+        tmp_meta = partition / f"meta.json.{os.getpid()}.tmp"
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_meta, partition / "meta.json")
+
+    def clear(self, exchange: str, symbol: str, timeframe: str):
+        """Bir parite/timeframe'in depodaki verisini siler"""
+        partition = self._partition_dir(exchange, symbol, timeframe)
+        if not partition.exists():
+            return
+        for path in partition.iterdir():
+            path.unlink()
+        partition.rmdir()
+
+    def _atomic_save(self, path: Path, arr: np.ndarray):
+        """Array'i once gecici dosyaya yazip sonra yerine tasir"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(arr))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, np.ndarray]:
+        return {col: np.empty(0, dtype=COLUMN_DTYPES[col]) for col in OHLCV_COLUMNS}
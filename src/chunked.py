@@ -0,0 +1,366 @@
+"""
+Parca Parca (Out-of-core) Isleme
+
+Yillarca 1m veri on milyonlarca mum demek. DataProcessor butun gecmisi
+DataFrame olarak bellege aliyor, ozellikler ve dedektor de butun matris
+uzerinde calisiyor; tepe bellek gecmisin uzunluguyla buyuyor.
+
+Bu modulde depodaki (candle_store) memory-map'li sutun dosyalarini
+sabit boyutlu parcalarla isliyorum:
+- Her parca ayri temizleniyor; tekrarlanan zaman kontrolu parca sinirini
+  asiyor (bir onceki parcanin son zamani tasiniyor)
+- Kayan ozellikler icin bir onceki parcanin son lookback-1 satiri bir
+  sonraki parcanin basina ekleniyor, sonuclar butun gecmis tek seferde
+  islenmis gibi cikiyor
+- Dedektor iki geciste calisiyor: once referans (z-score icin tam
+  ortalama/std, Isolation Forest ve IQR icin sinirli boyutlu ornek),
+  sonra her parca score_block() ile puanlanip sonuclar diske akitiliyor
+
+Tepe bellek gecmisin uzunluguna degil parca boyuna (chunk_rows) bagli.
+
+Ornek:
+    processor = ChunkedProcessor.from_store("binance", "BTC/USDT", "1m")
+    detector = AnomalyDetector()
+    ozet = detect_chunked(processor, detector, "results/anomaliler.csv")
+"""
+
+import mmap
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from anomaly_detector import AnomalyDetector
+from candle_store import CandleStore
+from config import AnomalyConfig, DataConfig
+from data_processor import RAW_COLUMNS
+from data_quality import candle_columns
+from feature_registry import FEATURE_REGISTRY, FeatureRegistry
+from feature_stats import merge_moments
+
+
+def _release_pages(arr: np.ndarray):
+    """
+    Memory-map'ten okunmus sayfalari birakir
+
+    Dosyadan okunan sayfalar process'in RSS'inde birikiyor (gecmis
+    uzadikca tepe bellek de buyuyor). Sayfalar temiz ve diskte zaten var,
+    her parcadan sonra birakmak guvenli. Desteklenmeyen sistemlerde
+    (Windows) bir sey yapmiyor.
+    """
+    handle = arr
+    while handle is not None and not isinstance(handle, mmap.mmap):
+        handle = getattr(handle, 'base', None)
+    if handle is not None and hasattr(mmap, 'MADV_DONTNEED'):
+        handle.madvise(mmap.MADV_DONTNEED)
+
+
+class ChunkedProcessor:
+    """
+    Uzun gecmisi sabit boyutlu parcalarla isleyen processor
+
+    Her parca (zamanlar, degerler) olarak veriliyor. degerler (n, sutun)
+    blogunun sutunlari column_names sirasinda: once ham OHLCV, sonra
+    ozellikler. Satirlar DataProcessor.clean_data() + add_features()
+    sonrasi kalan satirlarla ayni.
+
+    Args:
+        columns: Sutun sozlugu (CandleStore.load(mmap=True) ciktisi) veya DataFrame
+        features: Ozellikler (None ise DataConfig.FEATURES)
+        chunk_rows: Parca boyu (None ise DataConfig.CHUNK_ROWS)
+        dtype: Ozellik hesabi tipi (None ise DataConfig.FLOAT_DTYPE)
+        registry: Ozellik kayit defteri (None ise FEATURE_REGISTRY)
+    """
+
+    def __init__(
+        self,
+        columns: Union[Dict[str, np.ndarray], pd.DataFrame],
+        features: Optional[List[str]] = None,
+        chunk_rows: Optional[int] = None,
+        dtype: Optional[str] = None,
+        registry: Optional[FeatureRegistry] = None
+    ):
+        # Sutunlar kopyalanmiyor; memory-map'li dosyalar parca parca okunuyor
+        self.columns = candle_columns(columns)
+        self.chunk_rows = int(chunk_rows or DataConfig.CHUNK_ROWS)
+        self.dtype = np.dtype(dtype or DataConfig.FLOAT_DTYPE)
+        self.registry = registry or FEATURE_REGISTRY
+
+        if features is None:
+            features = DataConfig.FEATURES
+        unknown = [f for f in features if f not in self.registry]
+        if unknown:
+            print(f"   Bilinmeyen ozellikler atlandi: {unknown}")
+        self.features = list(dict.fromkeys(f for f in features if f not in unknown))
+        self.column_names = RAW_COLUMNS + self.features
+
+        # Bir satirin ozellikleri icin gereken onceki satir sayisi
+        self.history = self.registry.lookback(self.features) - 1 if self.features else 0
+
+    @classmethod
+    def from_store(
+        cls,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        store: Optional[CandleStore] = None,
+        **kwargs
+    ) -> "ChunkedProcessor":
+        """Depodaki bir bolumu memory-map ile acar (veri bellege okunmaz)"""
+        store = store or CandleStore()
+        columns = store.load(exchange, symbol, timeframe, since=since, until=until, mmap=True)
+        print(f"Depodan acildi: {exchange} {symbol} {timeframe} ({len(columns['timestamp_ms']):,} mum)")
+        return cls(columns, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.columns['timestamp_ms'])
+
+    def column_index(self, columns: List[str]) -> List[int]:
+        """Sutun isimlerinin blok icindeki indeksleri"""
+        missing = [c for c in columns if c not in self.column_names]
+        if missing:
+            raise ValueError(f"Eksik sutunlar: {missing}")
+        return [self.column_names.index(c) for c in columns]
+
+    def iter_blocks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Temizlenmis ve ozellikleri hesaplanmis parcalari sirayla verir
+
+        Depodaki zamanlar sirali oldugu icin tekrarlanan (ve geriye giden)
+        zamanlari bir onceki tutulan zamanla karsilastirip atiyorum; boylece
+        parca sinirindaki tekrarlar da yakalaniyor. Ozellik hesabi icin bir
+        onceki parcanin son `history` temiz satiri tasiniyor.
+
+        Yields:
+            (timestamps, values): (n,) int64 ms ve (n, len(column_names)) blok
+        """
+        n = len(self)
+        last_ts = None
+        tail = np.empty((0, len(RAW_COLUMNS)), dtype=self.dtype)
+
+        for start in range(0, n, self.chunk_rows):
+            end = min(start + self.chunk_rows, n)
+            ts = np.asarray(self.columns['timestamp_ms'][start:end], dtype=np.int64)
+
+            raw = np.empty((end - start, len(RAW_COLUMNS)), dtype=self.dtype)
+            for k, col in enumerate(RAW_COLUMNS):
+                raw[:, k] = self.columns[col][start:end]
+            for col in self.columns.values():
+                _release_pages(col)
+
+            # clean_data() ile ayni filtreler: eksik deger, gecersiz fiyat, tekrar
+            keep = ~np.isnan(raw).any(axis=1)
+            keep &= (raw[:, :4] > 0).all(axis=1)
+            kept_ts = ts[keep]
+            first = np.iinfo(np.int64).min if last_ts is None else last_ts
+            previous = np.maximum.accumulate(np.concatenate([[first], kept_ts[:-1]]))
+            keep[np.flatnonzero(keep)] = kept_ts > previous
+            del kept_ts, previous
+
+            if not keep.all():
+                ts = ts[keep]
+                raw = raw[keep]
+            if len(ts) == 0:
+                continue
+            last_ts = int(ts[-1])
+
+            # Onceki parcanin kuyrugunu basa ekleyip ozellikleri hesapliyorum
+            carried = len(tail)
+            window = np.concatenate([tail, raw]) if carried else raw
+            block = np.empty((len(window), len(self.column_names)), dtype=self.dtype)
+            block[:, :len(RAW_COLUMNS)] = window
+            if self.features:
+                inputs = {col: window[:, k] for k, col in enumerate(RAW_COLUMNS)}
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    self.registry.compute(inputs, self.features, out=block[:, len(RAW_COLUMNS):])
+                del inputs
+
+            tail = window[-self.history:].copy() if self.history else tail
+            del window, raw
+            block = block[carried:]
+
+            # add_features() gibi NaN'li satirlari (ilk satirlar, 0/0) atiyorum
+            valid = ~np.isnan(block).any(axis=1)
+            if not valid.all():
+                block = block[valid]
+                ts = ts[valid]
+            if len(ts):
+                yield ts, block
+
+
+def fit_reference_chunked(
+    processor: ChunkedProcessor,
+    detector: AnomalyDetector,
+    columns: Optional[List[str]] = None,
+    methods: Optional[List[str]] = None,
+    iqr_multiplier: float = 1.5,
+    sample_rows: Optional[int] = None
+) -> Dict:
+    """
+    Referansi butun gecmise bir geciste kurar (birinci gecis)
+
+    - z_score: ortalama ve std butun satirlardan tam hesaplaniyor
+      (parca parca birlestirilerek, detect_z_score() ile ayni)
+    - iqr ve isolation_forest: esit olasilikli sinirli boyutlu bir
+      ornek uzerinde. Ceyrekler ornekten tahmin (yaklasik); Isolation
+      Forest zaten her agaci 256 satirlik alt ornekle kuruyor.
+
+    Ornek her satira rastgele bir anahtar verip en kucuk sample_rows
+    anahtari tutarak seciliyor, bellekte en fazla ornek + bir parca var.
+
+    Args:
+        processor: ChunkedProcessor
+        detector: Referansi kurulacak dedektor
+        columns: Dedektor sutunlari (None ise [DataConfig.PRICE_COLUMN])
+        methods: Yontemler (None ise AnomalyConfig.METHODS)
+        iqr_multiplier: IQR carpani
+        sample_rows: Ornek boyu (None ise DataConfig.CHUNK_SAMPLE_ROWS)
+
+    Returns:
+        dict: detector.reference
+    """
+    columns = columns or [DataConfig.PRICE_COLUMN]
+    methods = methods or AnomalyConfig.METHODS
+    sample_rows = int(sample_rows or DataConfig.CHUNK_SAMPLE_ROWS)
+    index = processor.column_index(columns)
+    rng = np.random.default_rng(detector.random_state)
+
+    count = 0
+    mean = np.zeros(len(columns))
+    m2 = np.zeros(len(columns))
+    sample = np.empty((0, len(columns)))
+    keys = np.empty(0)
+
+    print(f"Referans hesaplaniyor (parca: {processor.chunk_rows:,} satir, ornek: {sample_rows:,})...")
+    for _, block in processor.iter_blocks():
+        X = block[:, index].astype(np.float64)
+        count, mean, m2 = merge_moments(count, mean, m2, X)
+
+        sample = np.concatenate([sample, X])
+        keys = np.concatenate([keys, rng.random(len(X))])
+        if len(keys) > sample_rows:
+            chosen = np.argpartition(keys, sample_rows)[:sample_rows]
+            chosen.sort()
+            sample, keys = sample[chosen], keys[chosen]
+        del X, block
+
+    if count == 0:
+        raise ValueError("Islenecek gecerli satir yok")
+
+    reference = detector.fit_reference(sample, methods=methods, iqr_multiplier=iqr_multiplier, columns=columns)
+    if "z_score" in methods:
+        reference['mean'] = mean
+        reference['std'] = np.sqrt(m2 / count)
+    reference['n_samples'] = count
+    reference['sample_rows'] = len(sample)
+    reference['columns'] = list(columns)
+    print(f"   {count:,} satir uzerinden referans kuruldu ({len(sample):,} satirlik ornek)")
+    return reference
+
+
+def detect_chunked(
+    processor: ChunkedProcessor,
+    detector: AnomalyDetector,
+    output_path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    methods: Optional[List[str]] = None,
+    z_score_threshold: Optional[float] = None,
+    iqr_multiplier: Optional[float] = None,
+    min_votes: int = 2,
+    sample_rows: Optional[int] = None,
+    all_rows_path: Optional[Union[str, Path]] = None
+) -> Dict:
+    """
+    Butun gecmiste anomali tespiti yapar, sonuclari diske akitir
+
+    Birinci geciste referans kuruluyor (fit_reference_chunked), ikinci
+    geciste her parca score_block() ile puanlanip ensemble oyu
+    hesaplaniyor. Anomaliler (ve istenirse butun satirlar) parca parca
+    CSV'ye ekleniyor; sutunlar anomali_tespiti.py ciktisiyla ayni.
+
+    Args:
+        processor: ChunkedProcessor
+        detector: AnomalyDetector
+        output_path: Anomalilerin yazilacagi CSV
+        columns: Dedektor sutunlari (None ise [DataConfig.PRICE_COLUMN])
+        methods: Yontemler (None ise AnomalyConfig.METHODS)
+        z_score_threshold: Z-score esigi (None ise AnomalyConfig.Z_SCORE_THRESHOLD)
+        iqr_multiplier: IQR carpani (None ise AnomalyConfig.IQR_MULTIPLIER)
+        min_votes: Anomali icin en az oy
+        sample_rows: Referans ornegi boyu
+        all_rows_path: Verilirse butun satirlar da bu CSV'ye yaziliyor
+
+    Returns:
+        dict: Ozet (satir, anomali sayilari, parca sayisi)
+    """
+    if z_score_threshold is None:
+        z_score_threshold = AnomalyConfig.Z_SCORE_THRESHOLD
+    if iqr_multiplier is None:
+        iqr_multiplier = AnomalyConfig.IQR_MULTIPLIER
+
+    reference = fit_reference_chunked(
+        processor, detector, columns=columns, methods=methods,
+        iqr_multiplier=iqr_multiplier, sample_rows=sample_rows
+    )
+    index = processor.column_index(reference['columns'])
+
+    output_path = Path(output_path)
+    outputs = [output_path] + ([Path(all_rows_path)] if all_rows_path else [])
+    for path in outputs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+
+    total = 0
+    chunks = 0
+    method_counts = {method: 0 for method in reference['methods']}
+    ensemble_count = 0
+
+    print("Parcalar puanlaniyor...")
+    for ts, block in processor.iter_blocks():
+        results = detector.score_block(block[:, index], z_score_threshold=z_score_threshold)
+
+        # ensemble_voting() ile ayni oylama (her parcada ekrana yazdirmadan)
+        votes = np.zeros(len(ts))
+        for method, (labels, _) in results.items():
+            anomalies = labels == -1
+            votes += anomalies
+            method_counts[method] += int(anomalies.sum())
+        ensemble = np.where(votes >= min_votes, -1, 1)
+
+        frame = pd.DataFrame(block, columns=processor.column_names, copy=False)
+        frame.insert(0, 'timestamp_ms', ts)
+        frame.insert(1, 'timestamp', pd.to_datetime(ts, unit='ms'))
+        for method, (labels, scores) in results.items():
+            frame[f'{method}_anomali'] = labels
+            frame[f'{method}_skor'] = scores
+        frame['ensemble_anomali'] = ensemble
+        frame['ensemble_oy'] = votes
+
+        anomalies = frame[ensemble == -1]
+        if len(anomalies):
+            anomalies.to_csv(output_path, mode='a', header=not output_path.exists(), index=False)
+        if all_rows_path:
+            frame.to_csv(all_rows_path, mode='a', header=chunks == 0, index=False)
+
+        total += len(ts)
+        ensemble_count += int((ensemble == -1).sum())
+        chunks += 1
+        del frame, anomalies, results, block
+
+    print(f"   {chunks} parca, {total:,} satir puanlandi")
+    print(f"   Ensemble: {ensemble_count:,} anomali tespit edildi")
+    for method, count in method_counts.items():
+        print(f"      - {method}: {count:,}")
+
+    return {
+        'toplam_mum': total,
+        'parca_sayisi': chunks,
+        'parca_boyu': processor.chunk_rows,
+        'referans_ornegi': reference['sample_rows'],
+        'anomali_sayilari': method_counts,
+        'toplam_anomali': ensemble_count,
+    }
@@ -18,6 +18,18 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 RESULTS_DIR = BASE_DIR / "results"
 
+# Cekilen mumlari borsa/parite/timeframe bazinda burada sakliyorum
+CANDLE_STORE_DIR = DATA_DIR / "candles"
+
+# Borsa market bilgisi onbellegi
+MARKET_CACHE_DIR = DATA_DIR / "markets"
+
+# Hazirlanmis ozellik matrisleri onbellegi (feature_cache.py)
+FEATURE_CACHE_DIR = DATA_DIR / "features"
+
+# Egitilmis Isolation Forest modelleri (model_store.py)
+MODEL_DIR = DATA_DIR / "models"
+
 # Klasorler yoksa olusturuyorum
 DATA_DIR.mkdir(exist_ok=True)
 RESULTS_DIR.mkdir(exist_ok=True)
@@ -44,6 +56,18 @@ class ExchangeConfig:
     # API anahtarlari (opsiyonel - public veriler icin gerekmiyor)
     API_KEY = os.getenv("API_KEY", "")
     API_SECRET = os.getenv("API_SECRET", "")
+    
+    # Yerel mum deposu kullanilsin mi (sadece eksik araliklar borsadan cekilir)
+    USE_CANDLE_STORE = os.getenv("USE_CANDLE_STORE", "1") == "1"
+    
+    # Async cekimde ayni borsaya ayni anda gidebilecek maksimum istek sayisi
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
+    
+    # Market bilgisi kac saniye gecerli sayilsin (varsayilan 6 saat)
+    MARKET_CACHE_TTL = int(os.getenv("MARKET_CACHE_TTL", "21600"))
+    
+    # Gecici ag hatalarinda bir sayfa en fazla kac kez tekrar denensin
+    MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
 
 
 # Anomali tespit ayarlari
@@ -71,6 +95,22 @@ class AnomalyConfig:
     # Hangi yontemleri kullanacagiz
     METHODS = ["isolation_forest", "z_score", "iqr"]
     
+    # Online dedektorler (online_detectors.py): kayan pencere boyu ve
+    # Half-Space Trees agac sayisi / derinligi
+    ONLINE_WINDOW = 500
+    HST_TREES = 25
+    HST_DEPTH = 15
+    
+    # Paralel tespit (parallel.py): "thread" veya "process" ve isci
+    # sayisi (0 = cekirdek sayisi)
+    PARALLEL_BACKEND = os.getenv("PARALLEL_BACKEND", "thread")
+    N_WORKERS = int(os.getenv("N_WORKERS", "0"))
+    
+    # Walk-forward tespit (walk_forward.py): referans penceresi ve adim
+    # (satir). 15m mumlarda 2880 = 30 gun, 96 = 1 gun
+    WALK_FORWARD_WINDOW = 2880
+    WALK_FORWARD_STEP = 96
+    
     # Grafik olusturulsun mu (opsiyonel)
     PLOT_RESULTS = True
     SAVE_PLOTS = True
@@ -96,9 +136,45 @@ class DataConfig:
         "volatility",       # Volatilite (standart sapma)
         "price_momentum"    # Momentum (fiyat trendi)
     ]
+    # Aykiri degerlere dayanikli secenekler (rolling_stats.py), ornek:
+    # "rolling_median_500", "rolling_mad_500", "rolling_q95_500", "robust_zscore_500"
+    
+    # Referans pariteye gore ozellikler (cross_asset.py). anomali_tespiti.py'de
+    # REFERANS_PARITE verilince eklenir ve dedektore kapanis yerine
+    # CROSS_TARGET verilir (BTC kaynakli hareketler anomali sayilmasin diye)
+    CROSS_FEATURES = ["rolling_corr_100", "rolling_beta_100", "residual_return_100"]
+    CROSS_TARGET = "residual_return_100"
+    
+    # Kalin timeframe ozellikleri (timeframe -> ozellikler). Kalin mumlar
+    # cekilen veriden turetiliyor, her satir sadece kapanmis mumlari goruyor.
+    # Ornek: {"1h": ["volatility", "price_momentum"], "4h": ["volatility"]}
+    # -> volatility_1h, price_momentum_1h, volatility_4h sutunlari
+    HIGHER_TIMEFRAMES = {}
     
     # Veri kayit formati
     SAVE_FORMAT = "csv"  # csv veya json
+    
+    # Fiyat ve ozellik sutunlarinin tipi (float32 bellegi yariya indirir)
+    FLOAT_DTYPE = os.getenv("FLOAT_DTYPE", "float64")
+    
+    # Veri isleme sirasinda tepe bellek raporlansin mi
+    REPORT_MEMORY = os.getenv("REPORT_MEMORY", "0") == "1"
+    
+    # Eksik mumlar (bosluklar) icin ne yapilsin
+    # none: sadece raporla, ffill: onceki kapanisla doldur,
+    # mark: ffill + is_filled sutunu, nan: NaN birak (sonra atilir),
+    # refetch: sadece bosluklari borsadan tekrar cek, kalanlari ffill
+    GAP_POLICY = os.getenv("GAP_POLICY", "none")
+    
+    # Hazirlanmis veri onbellege alinsin mi (sadece dedektor ayari degisince
+    # veri hazirligi tekrarlanmaz) ve onbellek en fazla kac MB olsun
+    USE_FEATURE_CACHE = os.getenv("USE_FEATURE_CACHE", "1") == "1"
+    FEATURE_CACHE_MAX_MB = int(os.getenv("FEATURE_CACHE_MAX_MB", "2048"))
+    
+    # Uzun gecmis parca parca islenirken (chunked.py) parca boyu ve
+    # Isolation Forest / IQR referansi icin tutulan ornek boyu
+    CHUNK_ROWS = int(os.getenv("CHUNK_ROWS", "1000000"))
+    CHUNK_SAMPLE_ROWS = int(os.getenv("CHUNK_SAMPLE_ROWS", "200000"))
 
 
 # Log seviyesi
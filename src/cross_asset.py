@@ -0,0 +1,168 @@
+"""
+Capraz Parite (Cross-Asset) Kayan Istatistikler
+
+Altcoin'lerdeki anomalilerin cogu aslinda BTC hareketi: BTC %3 dusunce
+butun piyasa dusuyor ve tek pariteye bakan dedektor hepsini isaretliyor.
+
+Bu modulde bir pariteyi referans pariteye (ornek BTC/USDT) gore
+olcuyorum:
+- rolling_corr_n: getirilerin kayan korelasyonu
+- rolling_beta_n: kayan beta (cov / referans varyansi)
+- residual_return_n: referansla aciklanamayan getiri
+  (getiri - alfa - beta * referans getirisi)
+
+Ucu de ayni bes kayan toplamdan (x, y, x^2, y^2, x*y) cikiyor. Kayan
+toplamlar kumulatif toplamlarin farkindan (adim basina O(1)) bir kez
+hesaplaniyor ve uc ozellik arasinda paylasiliyor. Referans zaman
+damgasina gore hizalaniyor; bir tarafin eksik oldugu mumlar pencerede
+sayilmiyor.
+"""
+
+from typing import Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from data_quality import candle_columns
+
+
+# Hizalanmis referans kapanisinin sutun adi (add_reference / panel)
+REFERENCE_COLUMN = "ref_close"
+
+
+def align_reference(
+    timestamps: np.ndarray,
+    reference: Union[pd.DataFrame, Dict[str, np.ndarray]],
+    column: str = "close"
+) -> np.ndarray:
+    """
+    Referans paritenin bir sutununu verilen zamanlara hizalar
+
+    Ayni zamandaki mum eslesiyor (ayni timeframe), referansta olmayan
+    zamanlar NaN. Referans sirasiz veya tekrarli olabilir, ilk mum kaliyor.
+
+    Args:
+        timestamps: (T,) int64 ms, hizalanacak zamanlar
+        reference: Referans paritenin mumlari
+        column: Alinacak sutun
+
+    Returns:
+        numpy array: (T,) float64
+    """
+    columns = candle_columns(reference)
+    ref_ts, first = np.unique(columns['timestamp_ms'], return_index=True)
+    values = np.asarray(columns[column], dtype=np.float64)[first]
+
+    out = np.full(len(timestamps), np.nan)
+    if len(ref_ts) == 0:
+        return out
+    positions = np.searchsorted(ref_ts, timestamps)
+    positions[positions == len(ref_ts)] = 0
+    hit = ref_ts[positions] == timestamps
+    out[hit] = values[positions[hit]]
+    return out
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Son eksen boyunca kayan toplam: cumsum[t] - cumsum[t - window]
+
+    Girdiler getiri olcegindeki degerler (ve kareleri); kumulatif toplamin
+    buyumesinden gelen hata pencere toplamina gore ~1e-11 mertebesinde.
+    """
+    out = np.cumsum(x, axis=-1)
+    out[..., window:] -= out[..., :-window]
+    return out
+
+
+def _reference_sums(y: np.ndarray, invalid: np.ndarray, window: int) -> Tuple[np.ndarray, ...]:
+    """Cift sayisi ve referans tarafinin kayan toplamlari (y eksikler 0 yapilmis)"""
+    count = _rolling_sum((~invalid).astype(np.float64), window)
+    return count, _rolling_sum(y, window), _rolling_sum(y * y, window)
+
+
+def rolling_pair_moments(x: np.ndarray, y: np.ndarray, window: int) -> Tuple[np.ndarray, ...]:
+    """
+    Iki serinin kayan ortalama, varyans ve kovaryansi
+
+    Sadece iki tarafin da dolu oldugu satirlar sayiliyor. Pencerede
+    2'den az cift varsa NaN. Varyanslar toplamlardan (E[x^2] - E[x]^2)
+    geliyor; getiriler sifir civarinda oldugu icin sayisal kayip yok.
+
+    Panelde referans tek sutun (T, 1) geliyor. Eksikleri referansla ayni
+    olan paritelerde cift sayisi ve referans toplamlari ayni oldugu icin
+    bunlari bir kez hesaplayip yayiyorum; sadece fazladan eksigi olan
+    (sonradan listelenen) pariteler icin ayrica hesaplaniyor.
+
+    Args:
+        x: Parite getirileri, (T,) veya (T, parite)
+        y: Referans getirileri, x ile ayni boyut veya (T, 1)
+        window: Pencere boyu
+
+    Returns:
+        tuple: (mean_x, mean_y, var_x, var_y, cov); referans tarafi
+        ortaksa mean_y ve var_y (T, 1)
+    """
+    # Zaman eksenini sona alip ardisik kopyaliyorum: (T, parite) blokta
+    # eksen 0 boyunca kumulatif toplam ardisik satirlardakinden ~6 kat yavas
+    xv = np.array(np.moveaxis(x, 0, -1), dtype=np.float64, order='C')
+    yv = np.array(np.moveaxis(y, 0, -1), dtype=np.float64, order='C')
+    x_nan = np.isnan(xv)
+    y_nan = np.isnan(yv)
+    invalid = x_nan | y_nan
+
+    if yv.shape == xv.shape:
+        yv[invalid] = 0.0
+        count, sum_y, sum_yy = _reference_sums(yv, invalid, window)
+    else:
+        yv[y_nan] = 0.0
+        count, sum_y, sum_yy = _reference_sums(yv, y_nan, window)
+        own = (x_nan & ~y_nan).any(axis=-1)
+        if own.any():
+            rows = np.broadcast_to(yv, xv.shape)[own] * ~invalid[own]
+            own_sums = _reference_sums(rows, invalid[own], window)
+            count, sum_y, sum_yy = [np.repeat(arr, len(xv), axis=0) for arr in (count, sum_y, sum_yy)]
+            for arr, own_arr in zip((count, sum_y, sum_yy), own_sums):
+                arr[own] = own_arr
+    del x_nan, y_nan
+
+    # x, eksik ciftlerde 0 oldugu icin x*y toplamina referansin fazlasi girmiyor
+    xv[invalid] = 0.0
+    del invalid
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = _rolling_sum(xv, window) / count
+        mean_y = sum_y / count
+        var_x = np.maximum(_rolling_sum(xv * xv, window) / count - mean_x * mean_x, 0)
+        var_y = np.maximum(sum_yy / count - mean_y * mean_y, 0)
+        cov = _rolling_sum(xv * yv, window) / count - mean_x * mean_y
+
+    insufficient = count < 2
+    moments = [np.where(insufficient, np.nan, m) for m in (mean_x, mean_y, var_x, var_y, cov)]
+    # Eksenleri geri ceviriyorum (kopyasiz view): (T, ...)
+    return tuple(np.moveaxis(m, -1, 0) for m in moments)
+
+
+def rolling_correlation(moments: np.ndarray) -> np.ndarray:
+    """cov / (std_x * std_y); varyansi sifir olan pencerelerde NaN"""
+    _, _, var_x, var_y, cov = moments
+    denominator = np.sqrt(var_x * var_y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, cov / denominator, np.nan)
+
+
+def rolling_beta(moments: np.ndarray) -> np.ndarray:
+    """cov / var_y; referans varyansi sifirsa NaN"""
+    _, _, _, var_y, cov = moments
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(var_y > 0, cov / var_y, np.nan)
+
+
+def residual_return(x: np.ndarray, y: np.ndarray, moments: np.ndarray) -> np.ndarray:
+    """
+    x - (alfa + beta * y): referans hareketiyle aciklanamayan getiri
+
+    Alfa ve beta satirin kendi penceresinden (o mum dahil, sonrasi yok).
+    """
+    mean_x, mean_y = moments[0], moments[1]
+    beta = rolling_beta(moments)
+    return x - (mean_x - beta * mean_y) - beta * y
@@ -6,11 +6,32 @@ CCXT kutuphanesi sayesinde 100+ farkli borsadan veri cekebiliyor.
 """
 
 import ccxt
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import time
 
+from bar_builder import build_bars, concat_trade_columns, trades_to_columns
+from candle_buffer import OHLCVBuffer, estimate_candle_count
+from candle_store import CandleStore, OHLCV_COLUMNS, COLUMN_DTYPES
+from config import ExchangeConfig
+from market_cache import MarketCache, shared_market_cache
+from rate_limiter import RetryPolicy, TokenBucket, get_rate_limiter
+
+
+def rows_to_columns(rows: list) -> Dict[str, np.ndarray]:
+    """ccxt'den gelen [[ts, o, h, l, c, v], ...] listesini sutunlara ayirir"""
+    buffer = OHLCVBuffer(capacity=len(rows))
+    buffer.append_page(rows)
+    columns = buffer.columns()
+    return {col: columns[col].astype(COLUMN_DTYPES[col], copy=False) for col in OHLCV_COLUMNS}
+
+
+def columns_to_dataframe(columns: Dict[str, np.ndarray], dtype=np.float64) -> pd.DataFrame:
+    """Sutunlardan DataFrame olusturur (ham_veri CSV formatiyla ayni)"""
+    return OHLCVBuffer.from_columns(columns, dtype=dtype).to_dataframe()
+
 
 class DataFetcher:
     """
@@ -19,20 +40,64 @@ class DataFetcher:
     Nasil kullanilir:
         fetcher = DataFetcher("binance")
         df = fetcher.fetch_ohlcv("BTC/USDT", "15m", days_back=60)
+    
+    Yerel mum deposu acikken (varsayilan) ilk cekimden sonra sadece
+    eksik kalan araliklar borsadan isteniyor.
+    Disaridan borsa verilince (exchange=ReplayExchange(...)) depo, acikca
+    candle_store veya use_store=True verilmedikce kapali.
     """
     
-    def __init__(self, exchange_name: str = "binance", api_key: str = "", api_secret: str = ""):
+    def __init__(
+        self,
+        exchange_name: str = "binance",
+        api_key: str = "",
+        api_secret: str = "",
+        candle_store: Optional[CandleStore] = None,
+        use_store: Optional[bool] = None,
+        market_cache: Optional[MarketCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        price_dtype: str = "float64",
+        exchange: Optional[Any] = None
+    ):
         # Borsa baglantisini olusturuyorum
         # API key zorunlu degil, public veriler icin gerekmiyor
-        self.exchange_name = exchange_name.lower()
-        self.exchange = self._initialize_exchange(api_key, api_secret)
+        # exchange verilirse (ornegin ReplayExchange) onu kullaniyorum
+        if exchange is not None:
+            self.exchange_name = exchange.id.lower()
+            self.exchange = exchange
+        else:
+            self.exchange_name = exchange_name.lower()
+            self.exchange = self._initialize_exchange(api_key, api_secret)
+        
+        # Yerel mum deposu (None ise her seferinde tum veri borsadan cekilir)
+        # Disaridan verilen borsanin (ReplayExchange) sentetik mumlari gercek
+        # depoya yazilmasin: depo ancak acikca verilirse kullaniliyor
+        if use_store is None:
+            use_store = candle_store is not None if exchange is not None else ExchangeConfig.USE_CANDLE_STORE
+        self.candle_store = (candle_store or CandleStore()) if use_store else None
+        
+        # Market bilgisi onbellegi (butun fetcher'lar paylasiyor). Disaridan
+        # verilen borsanin (ReplayExchange) marketleri sadece bu fetcher'da kaliyor
+        if market_cache is None:
+            market_cache = MarketCache(persist=False) if exchange is not None else shared_market_cache()
+        self.market_cache = market_cache
+        
+        # Istek butcesi (ayni borsaya baglanan butun fetcher'lar paylasiyor)
+        # ve sadece hata veren sayfayi tekrar deneyen katman
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.exchange_name, self.exchange.rateLimit)
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=ExchangeConfig.MAX_RETRIES)
+        
+        # Fiyat/hacim sutunlarinin tipi (float32 bellegi yariya indirir)
+        self.price_dtype = np.dtype(price_dtype)
         
     def _initialize_exchange(self, api_key: str, api_secret: str) -> ccxt.Exchange:
         # Secilen borsaya baglaniyorum
         try:
             exchange_class = getattr(ccxt, self.exchange_name)
             config = {
-                'enableRateLimit': True,  # Rate limiting koruması
+                # Rate limiting'i paylasilan token bucket yapiyor (rate_limiter.py)
+                'enableRateLimit': False,
                 'timeout': 30000,
             }
             
@@ -74,9 +139,7 @@ class DataFetcher:
         """
         try:
             # Sembolün mevcut olup olmadığını kontrol et
-            self.exchange.load_markets()
-            if symbol not in self.exchange.symbols:
-                raise ValueError(f"'{symbol}' sembolü {self.exchange_name}'de bulunamadı")
+            self._validate_symbol(symbol)
             
             # Zaman aralığını hesapla
             since = self._calculate_since_timestamp(days_back)
@@ -84,44 +147,17 @@ class DataFetcher:
             print(f"Veri cekiliyor: {symbol} ({timeframe}) - Son {days_back} gun")
             print(f"   Baslangic: {datetime.fromtimestamp(since/1000)}")
             
-            # Veriyi çek (büyük veri setleri için parça parça)
-            all_ohlcv = []
-            current_since = since
-            
-            while True:
-                # Batch olarak çek
-                ohlcv = self.exchange.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    since=current_since,
-                    limit=1000  # Çoğu borsa max 1000 kayıt döner
-                )
-                
-                if not ohlcv:
-                    break
-                
-                all_ohlcv.extend(ohlcv)
-                
-                # Son zaman damgasını al
-                last_timestamp = ohlcv[-1][0]
-                
-                # Limit kontrolü
-                if limit and len(all_ohlcv) >= limit:
-                    all_ohlcv = all_ohlcv[:limit]
-                    break
-                
-                # Eğer güncel zamana ulaştıysak dur
-                if last_timestamp >= int(time.time() * 1000):
-                    break
-                
-                # Sonraki batch için timestamp'i güncelle
-                current_since = last_timestamp + 1
-                
-                # Rate limit koruması
-                time.sleep(self.exchange.rateLimit / 1000)
+            if self.candle_store is not None:
+                # Once yerel depoya bakiyorum, sadece eksik araliklari cekiyorum
+                buffer = self._fetch_with_store(symbol, timeframe, since)
+            else:
+                buffer = self._fetch_range(symbol, timeframe, since, limit=limit)
+            
+            if limit:
+                buffer.truncate(limit)
             
-            # DataFrame'e çevir
-            df = self._ohlcv_to_dataframe(all_ohlcv)
+            # DataFrame'e çevir (sütunlar kopyalanmadan)
+            df = buffer.to_dataframe()
             
             print(f"{len(df)} adet veri cekildi")
             print(f"   Tarih araligi: {df['timestamp'].min()} - {df['timestamp'].max()}")
@@ -135,6 +171,245 @@ class DataFetcher:
         except Exception as e:
             raise Exception(f"Veri çekerken hata: {e}")
     
+    def _validate_symbol(self, symbol: str):
+        """
+        Sembolü yerel market önbelleğinde arar
+        
+        Önbellekte yoksa (yeni listelenmiş olabilir) bir kez yeniden indiriyorum.
+        """
+        symbols = self.market_cache.load(
+            self.exchange, limiter=self.rate_limiter, retry_policy=self.retry_policy
+        )
+        if symbol in symbols:
+            return
+        
+        symbols = self.market_cache.load(
+            self.exchange, force=True, limiter=self.rate_limiter, retry_policy=self.retry_policy
+        )
+        if symbol not in symbols:
+            raise ValueError(f"'{symbol}' sembolü {self.exchange_name}'de bulunamadı")
+    
+    def _fetch_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: Optional[int] = None,
+        limit: Optional[int] = None,
+        buffer: Optional[OHLCVBuffer] = None
+    ) -> OHLCVBuffer:
+        """
+        [since, until] araligini sayfa sayfa borsadan ceker
+        
+        until verilmezse guncel zamana kadar ceker. Sayfalar dogrudan
+        tipli sutun tamponuna yaziliyor.
+        """
+        if buffer is None:
+            end = until if until is not None else int(time.time() * 1000)
+            timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            buffer = OHLCVBuffer(
+                capacity=estimate_candle_count(since, end, timeframe_ms, limit),
+                dtype=self.price_dtype
+            )
+        
+        start_size = len(buffer)
+        current_since = since
+        
+        while True:
+            # Batch olarak çek (rate limit + hata olursa sadece bu sayfa tekrar denenir)
+            ohlcv = self.retry_policy.call(
+                self.exchange, self.rate_limiter, 'fetch_ohlcv',
+                symbol=symbol,
+                timeframe=timeframe,
+                since=current_since,
+                limit=1000  # Çoğu borsa max 1000 kayıt döner
+            )
+            
+            if not ohlcv:
+                break
+            
+            buffer.append_page(ohlcv)
+            
+            # Son zaman damgasını al
+            last_timestamp = ohlcv[-1][0]
+            
+            # Limit kontrolü
+            if limit and len(buffer) - start_size >= limit:
+                buffer.truncate(start_size + limit)
+                break
+            
+            # İstenen bitişe (veya güncel zamana) ulaştıysak dur
+            end = until if until is not None else int(time.time() * 1000)
+            if last_timestamp >= end:
+                break
+            
+            # Sonraki batch için timestamp'i güncelle
+            current_since = last_timestamp + 1
+        
+        return buffer
+
+    def fetch_range(self, symbol: str, timeframe: str, since: int, until: int) -> Dict[str, np.ndarray]:
+        """
+        Sadece [since, until] araligindaki mumlari çeker (bosluk doldurmak icin)
+
+        Args:
+            symbol: Trading çifti
+            timeframe: Zaman dilimi
+            since: Başlangıç zamanı (ms, dahil)
+            until: Bitiş zamanı (ms, dahil)
+
+        Returns:
+            dict: OHLCV sütunları (aralik disina tasan sayfa kisimlari atilmis)
+        """
+        columns = self._fetch_range(symbol, timeframe, since, until=until).columns()
+        inside = (columns['timestamp_ms'] >= since) & (columns['timestamp_ms'] <= until)
+        return {col: arr[inside] for col, arr in columns.items()}
+
+    def _fetch_with_store(self, symbol: str, timeframe: str, since: int) -> OHLCVBuffer:
+        """
+        Yerel depoyu kullanarak [since, simdi] araligini doner
+        
+        Depoda olmayan araliklari borsadan cekip depoya ekliyorum.
+        Kapanmamis son mumu depoya yazmiyorum, sadece sonuca ekliyorum.
+        """
+        store = self.candle_store
+        now = int(time.time() * 1000)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        
+        # Bu zamandan once acilan mumlar kapanmis demektir
+        closed_before = now - timeframe_ms + 1
+        
+        missing = store.missing_ranges(self.exchange_name, symbol, timeframe, since, closed_before)
+        if not missing:
+            missing = [(closed_before, now)]
+        
+        live = None
+        for range_start, range_end in missing:
+            print(f"   Eksik aralik cekiliyor: {datetime.fromtimestamp(range_start/1000)} - "
+                  f"{datetime.fromtimestamp(range_end/1000)}")
+            fetched = self._fetch_range(symbol, timeframe, range_start, until=range_end).columns()
+            
+            closed = fetched['timestamp_ms'] < closed_before
+            if not closed.all():
+                live = {col: arr[~closed][-1:] for col, arr in fetched.items()}
+            
+            store.merge(
+                self.exchange_name, symbol, timeframe,
+                {col: arr[closed] for col, arr in fetched.items()},
+                covered_from=range_start,
+                covered_to=min(range_end, closed_before)
+            )
+        
+        # Depodan memory-map ile okuyup tek kopyayla tampona aliyorum
+        stored = store.load(self.exchange_name, symbol, timeframe, since=since,
+                            until=closed_before, mmap=True)
+        buffer = OHLCVBuffer.from_columns(stored, dtype=self.price_dtype, extra_capacity=1)
+        
+        # Canli (kapanmamis) mumu sona ekliyorum
+        if live is not None:
+            buffer.append_columns(live)
+        
+        return buffer
+
+    def fetch_trades(
+        self,
+        symbol: str,
+        hours_back: float = 1.0,
+        since: Optional[int] = None,
+        until: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Ham islemleri (trades) sayfa sayfa çeker
+
+        Args:
+            symbol: Trading çifti (örn: BTC/USDT)
+            hours_back: Kaç saat öncesinden başlasın (since verilmezse)
+            since: Başlangıç zamanı (ms)
+            until: Bitiş zamanı (ms), verilmezse güncel zaman
+
+        Returns:
+            dict: timestamp_ms, price, amount sütunları (zaman sıralı)
+        """
+        if not self.exchange.has.get('fetchTrades'):
+            raise ValueError(f"{self.exchange_name} islem (trade) verisi vermiyor")
+
+        self._validate_symbol(symbol)
+
+        if since is None:
+            since = int((time.time() - hours_back * 3600) * 1000)
+
+        print(f"Islemler cekiliyor: {symbol} - {datetime.fromtimestamp(since/1000)} sonrasi")
+
+        pages = []
+        current_since = since
+        # Son milisaniyedeki islemler bir sonraki sayfada tekrar gelebiliyor
+        seen_ids = set()
+
+        while True:
+            trades = self.retry_policy.call(
+                self.exchange, self.rate_limiter, 'fetch_trades',
+                symbol=symbol,
+                since=current_since,
+                limit=1000
+            )
+
+            new_trades = [t for t in trades if t['id'] is None or t['id'] not in seen_ids]
+            if not new_trades:
+                break
+
+            page = trades_to_columns(new_trades)
+            pages.append(page)
+
+            last_timestamp = int(page['timestamp_ms'][-1])
+            end = until if until is not None else int(time.time() * 1000)
+            if last_timestamp >= end:
+                break
+
+            # Ayni milisaniyedeki islemleri kacirmamak icin since'i ilerletmiyorum,
+            # o milisaniyede gordugum islemleri atliyorum
+            seen_ids = {t['id'] for t in new_trades if t['timestamp'] == last_timestamp}
+            current_since = last_timestamp
+
+        columns = concat_trade_columns(pages)
+        if until is not None:
+            keep = columns['timestamp_ms'] <= until
+            columns = {col: arr[keep] for col, arr in columns.items()}
+
+        print(f"{len(columns['timestamp_ms']):,} adet islem cekildi")
+        return columns
+
+    def fetch_bars(
+        self,
+        symbol: str,
+        bar_type: str = "volume",
+        size: Union[str, int, float] = 100.0,
+        hours_back: float = 1.0
+    ) -> pd.DataFrame:
+        """
+        Islemlerden time/tick/volume/dollar barlari kurar
+
+        Args:
+            symbol: Trading çifti (örn: BTC/USDT)
+            bar_type: 'time', 'tick', 'volume' veya 'dollar'
+            size: time için timeframe ('1m'), diğerleri için eşik
+            hours_back: Kaç saatlik islem kullanılsın
+
+        Returns:
+            DataFrame: fetch_ohlcv ile aynı formatta barlar
+        """
+        trades = self.fetch_trades(symbol, hours_back=hours_back)
+        df = build_bars(trades, bar_type, size, dtype=self.price_dtype)
+        print(f"{len(df)} adet {bar_type} bari olusturuldu")
+        return df
+
+    def _rows_to_columns(self, rows: list) -> Dict[str, np.ndarray]:
+        """ccxt'den gelen satir listesini sutunlara ayirir"""
+        return rows_to_columns(rows)
+    
+    def _columns_to_dataframe(self, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Sutunlardan DataFrame olusturur (ham_veri CSV formatiyla ayni)"""
+        return columns_to_dataframe(columns)
+    
     def _calculate_since_timestamp(self, days_back: int) -> int:
         """Kaç gün öncesinin timestamp'ini hesaplar"""
         since_date = datetime.now() - timedelta(days=days_back)
@@ -142,18 +417,7 @@ class DataFetcher:
     
     def _ohlcv_to_dataframe(self, ohlcv_data: list) -> pd.DataFrame:
         """OHLCV listesini DataFrame'e çevirir"""
-        df = pd.DataFrame(
-            ohlcv_data,
-            columns=['timestamp_ms', 'open', 'high', 'low', 'close', 'volume']
-        )
-        
-        # Timestamp'i datetime'a çevir
-        df['timestamp'] = pd.to_datetime(df['timestamp_ms'], unit='ms')
-        
-        # Sırala ve index'i sıfırla
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        
-        return df
+        return self._columns_to_dataframe(self._rows_to_columns(ohlcv_data))
     
     def get_available_symbols(self, quote_currency: str = "USDT") -> list:
         """
@@ -165,8 +429,10 @@ class DataFetcher:
         Returns:
             list: Sembol listesi
         """
-        self.exchange.load_markets()
-        symbols = [s for s in self.exchange.symbols if quote_currency in s]
+        all_symbols = self.market_cache.load(
+            self.exchange, limiter=self.rate_limiter, retry_policy=self.retry_policy
+        )
+        symbols = [s for s in all_symbols if quote_currency in s]
         return sorted(symbols)
     
     def get_exchange_info(self) -> Dict[str, Any]:
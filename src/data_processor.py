@@ -5,9 +5,31 @@ Borsadan cekilen ham verileri temizleyip, analiz icin hazirliyorum.
 Ayrica ekstra ozellikler (fiyat degisimi, volatilite vs.) ekliyorum.
 """
 
+import tracemalloc
+
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from cross_asset import REFERENCE_COLUMN, align_reference
+from data_quality import (
+    DataQualityReport, candle_columns, reindex_to_grid, refetch_gaps, repair_ohlc, validate_candles
+)
+from feature_registry import FEATURE_REGISTRY, FeatureRegistry
+from resampler import asof_positions, resample_columns
+
+
+# Varsayilan ozellikler (add_features(None) ile eklenenler)
+DEFAULT_FEATURES = [
+    "price_change",
+    "price_pct_change",
+    "volume_change",
+    "volatility",
+    "price_momentum"
+]
+
+# Ozellik hesabinda kullanilan ham sutunlar
+RAW_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
 
 
 class DataProcessor:
@@ -20,10 +42,90 @@ class DataProcessor:
     - Anomali tespiti icin veriyi hazirliyorum
     """
     
-    def __init__(self, df: pd.DataFrame):
-        # Veriyi alip kopyasini olusturuyorum
-        self.df = df.copy()
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        copy: bool = True,
+        dtype: Optional[str] = None,
+        track_memory: bool = False
+    ):
+        """
+        Args:
+            df: Ham OHLCV verisi
+            copy: False ise kopya almadan cagiranin DataFrame'i uzerinde calisir
+                  (buyuk verilerde tepe bellegi dusurur, df degisebilir)
+            dtype: Fiyat ve ozellik sutunlarinin tipi ('float32' bellegi yariya indirir)
+            track_memory: Islemler sirasinda tepe bellegi olc (memory_report)
+        """
+        self.float_dtype = np.dtype(dtype) if dtype is not None else None
+        self._memory = None
+        self.quality_report: Optional[DataQualityReport] = None
+        
+        # append() icin: add_features ile eklenenler ve artimli motor
+        self._features: List[str] = []
+        self._registry: Optional[FeatureRegistry] = None
+        self._engine = None
+        self._timeframe_columns: List[str] = []
+        if track_memory:
+            self._start_memory_tracking(df)
+        
+        # copy=True ise eskisi gibi kopyasini olusturuyorum
+        self.df = df.copy() if copy else df
         self._validate_dataframe()
+        
+        if self.float_dtype is not None:
+            self._cast_float_columns(RAW_COLUMNS)
+        self._update_memory_peak()
+    
+    def _cast_float_columns(self, columns: List[str]):
+        """Sutunlari float_dtype'a cevirir (zaten o tipteyse dokunmuyorum)"""
+        columns = [col for col in columns if self.df[col].dtype != self.float_dtype]
+        if columns:
+            self.df[columns] = self.df[columns].to_numpy(dtype=self.float_dtype)
+    
+    def _start_memory_tracking(self, df: pd.DataFrame):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._memory = {
+            'raw_bytes': int(df.memory_usage(index=True, deep=True).sum()),
+            'baseline': tracemalloc.get_traced_memory()[0],
+            'peak_extra': 0,
+        }
+    
+    def _update_memory_peak(self):
+        if self._memory is None:
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        self._memory['peak_extra'] = max(self._memory['peak_extra'], peak - self._memory['baseline'])
+    
+    def memory_report(self) -> Dict[str, float]:
+        """
+        Ham veri boyutu ve islemler sirasindaki tepe bellek (track_memory=True ile)
+        
+        Tepe degeri tracemalloc ile olculuyor: ham veri + islemler sirasinda
+        ayrilan en yuksek ek bellek. Islem sirasinda serbest kalan ham veri
+        (ornegin float32'ye cevrilen sutunlar) dusulmedigi icin bu bir ust sinir.
+        
+        Returns:
+            dict: raw_mb, current_mb, peak_mb, peak_ratio (tepe / ham veri)
+        """
+        current = int(self.df.memory_usage(index=True, deep=True).sum())
+        if self._memory is None:
+            return {'current_mb': current / 1e6}
+        
+        self._update_memory_peak()
+        raw = self._memory['raw_bytes']
+        peak = raw + self._memory['peak_extra']
+        report = {
+            'raw_mb': raw / 1e6,
+            'current_mb': current / 1e6,
+            'peak_mb': peak / 1e6,
+            'peak_ratio': peak / raw if raw else float('nan'),
+        }
+        print(f"Bellek: ham veri {report['raw_mb']:.1f} MB, tepe {report['peak_mb']:.1f} MB "
+              f"({report['peak_ratio']:.2f}x), su an {report['current_mb']:.1f} MB")
+        return report
     
     def _validate_dataframe(self):
         """DataFrame'in gerekli sütunlara sahip olduğunu kontrol eder"""
@@ -42,28 +144,44 @@ class DataProcessor:
         
         initial_rows = len(self.df)
         
-        # Eksik değerleri kontrol et
-        missing_count = self.df.isnull().sum().sum()
+        # Butun filtreleri tek bir maskede birlestiriyorum, boylece veri
+        # en fazla bir kez kopyalaniyor (hic satir silinmezse hic kopyalanmiyor)
+        # Maskeleri sutun sutun kuruyorum (butun tablo boyunda gecici bool tablo yok)
+        keep = np.ones(len(self.df), dtype=bool)
+        missing_count = 0
+        for col in self.df.columns:
+            null = self.df[col].isna().to_numpy()
+            missing_count += int(null.sum())
+            keep &= ~null
         if missing_count > 0:
             print(f"   {missing_count} eksik deger bulundu, temizleniyor...")
-            self.df = self.df.dropna()
         
         # Sıfır veya negatif fiyatları temizle
-        invalid_prices = (
-            (self.df['open'] <= 0) | 
-            (self.df['high'] <= 0) | 
-            (self.df['low'] <= 0) | 
-            (self.df['close'] <= 0)
-        )
+        invalid_prices = np.zeros(len(self.df), dtype=bool)
+        for col in ('open', 'high', 'low', 'close'):
+            invalid_prices |= self.df[col].to_numpy() <= 0
+        invalid_prices &= keep
         if invalid_prices.any():
             print(f"   {invalid_prices.sum()} gecersiz fiyat bulundu, temizleniyor...")
-            self.df = self.df[~invalid_prices]
+        keep &= ~invalid_prices
         
-        # Duplicate timestamp'leri kaldır
-        duplicates = self.df.duplicated(subset=['timestamp'], keep='first')
+        # Duplicate timestamp'leri kaldır (eskisi gibi kalan satirlar arasinda ilki kalir)
+        # Veri zaten siraliysa (normal durum) hash tablosu yerine komsu karsilastirmasi yetiyor
+        timestamps = self.df['timestamp']
+        duplicates = np.zeros(len(self.df), dtype=bool)
+        if timestamps.is_monotonic_increasing:
+            kept = timestamps.to_numpy()[keep]
+            duplicates[np.flatnonzero(keep)[1:][kept[1:] == kept[:-1]]] = True
+            del kept
+        else:
+            duplicates[keep] = timestamps[keep].duplicated(keep='first').to_numpy()
         if duplicates.any():
             print(f"   {duplicates.sum()} tekrarlanan timestamp bulundu, temizleniyor...")
-            self.df = self.df[~duplicates]
+        keep &= ~duplicates
+        
+        if not keep.all():
+            self.df = self.df[keep]
+        self._update_memory_peak()
         
         # Index'i sıfırla
         self.df = self.df.reset_index(drop=True)
@@ -76,13 +194,109 @@ class DataProcessor:
         
         return self.df
     
-    def add_features(self, features: Optional[List[str]] = None) -> pd.DataFrame:
+    def check_quality(self, timeframe: str) -> DataQualityReport:
+        """
+        Mum izgarasini dogrular (bosluklar, OHLC tutarsizligi, sifir hacim)
+        
+        Args:
+            timeframe: Verinin timeframe'i (15m, 1h...)
+        
+        Returns:
+            DataQualityReport: Yapilandirilmis kalite raporu
+        """
+        self.quality_report = validate_candles(self.df, timeframe)
+        self.quality_report.print_summary()
+        return self.quality_report
+    
+    def fill_gaps(
+        self,
+        timeframe: str,
+        policy: str = "ffill",
+        fetcher=None,
+        symbol: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Eksik mumlari doldurup veriyi duzenli izgaraya oturtur
+        
+        clean_data()'dan sonra, add_features()'tan once cagrilmali (sadece
+        OHLCV sutunlari kalir). Tutarsiz barlarin high/low degerleri de
+        duzeltiliyor.
+        
+        Args:
+            timeframe: Verinin timeframe'i
+            policy: 'ffill' (onceki kapanisla doldur), 'mark' (ffill + is_filled
+                    sutunu), 'nan' (NaN birak) veya 'refetch' (once sadece
+                    bosluklari borsadan tekrar cek, kalanlari ffill)
+            fetcher: policy='refetch' icin DataFetcher
+            symbol: policy='refetch' icin parite
+        
+        Returns:
+            DataFrame: Izgaraya oturtulmus veri
+        """
+        data = self.df
+        if policy == "refetch":
+            if fetcher is None or symbol is None:
+                raise ValueError("refetch politikasi icin fetcher ve symbol gerekli")
+            data, _ = refetch_gaps(fetcher, symbol, timeframe, data, self.quality_report)
+            policy = "ffill"
+        
+        initial_rows = len(self.df)
+        grid = repair_ohlc(reindex_to_grid(data, timeframe, policy=policy))
+        
+        self.df = pd.DataFrame(
+            {col: grid[col] for col in RAW_COLUMNS + (['is_filled'] if 'is_filled' in grid else [])},
+            copy=False
+        )
+        self.df.insert(0, 'timestamp_ms', grid['timestamp_ms'])
+        self.df['timestamp'] = pd.to_datetime(grid['timestamp_ms'], unit='ms')
+        if self.float_dtype is not None:
+            self._cast_float_columns(RAW_COLUMNS)
+        self.quality_report = None
+        self._update_memory_peak()
+        
+        added = len(self.df) - initial_rows
+        print(f"   Izgara ({policy}): {len(self.df)} mum, {max(added, 0)} eksik mum eklendi")
+        return self.df
+    
+    def add_reference(self, reference: pd.DataFrame, column: str = "close") -> pd.DataFrame:
+        """
+        Referans paritenin kapanisini zamana gore hizalayip ekler
+        
+        rolling_corr_n, rolling_beta_n ve residual_return_n ozellikleri bu
+        sutunu kullaniyor. clean_data() ve fill_gaps()'ten sonra,
+        add_features()'tan once cagrilmali. Referansin olmadigi mumlar NaN
+        kaliyor ve add_features() bu satirlari diger NaN satirlar gibi atiyor.
+        
+        Args:
+            reference: Referans paritenin OHLCV verisi (ayni timeframe)
+            column: Referansin hangi sutunu alinacak
+        
+        Returns:
+            DataFrame: ref_close sutunu eklenmis veri
+        """
+        timestamps = candle_columns(self.df)['timestamp_ms']
+        aligned = align_reference(timestamps, reference, column)
+        if self.float_dtype is not None:
+            aligned = aligned.astype(self.float_dtype)
+        self.df[REFERENCE_COLUMN] = aligned
+        self._update_memory_peak()
+        
+        matched = int((~np.isnan(aligned)).sum())
+        print(f"   Referans hizalandi: {matched}/{len(aligned)} mum eslesti")
+        return self.df
+    
+    def add_features(
+        self,
+        features: Optional[List[str]] = None,
+        registry: Optional[FeatureRegistry] = None
+    ) -> pd.DataFrame:
         """
         Teknik özellikler ekler
         
         Args:
             features: Eklenecek özellikler listesi
                      None ise tüm özellikler eklenir
+            registry: Özellik kayıt defteri (None ise FEATURE_REGISTRY)
         
         Returns:
             DataFrame: Özelliklerle zenginleştirilmiş veri
@@ -90,66 +304,182 @@ class DataProcessor:
         print("Teknik ozellikler ekleniyor...")
         
         if features is None:
-            features = [
-                "price_change",
-                "price_pct_change", 
-                "volume_change",
-                "volatility",
-                "price_momentum"
-            ]
-        
-        for feature in features:
-            if feature == "price_change":
-                # Fiyat değişimi (mutlak)
-                self.df['price_change'] = self.df['close'].diff()
-            
-            elif feature == "price_pct_change":
-                # Fiyat değişimi (yüzde)
-                self.df['price_pct_change'] = self.df['close'].pct_change() * 100
-            
-            elif feature == "volume_change":
-                # Hacim değişimi (yüzde)
-                self.df['volume_change'] = self.df['volume'].pct_change() * 100
-            
-            elif feature == "volatility":
-                # Volatilite (son 20 mumun standart sapması)
-                self.df['volatility'] = self.df['close'].rolling(window=20, min_periods=1).std()
-            
-            elif feature == "price_momentum":
-                # Momentum (son 14 mumun fiyat değişimi)
-                self.df['price_momentum'] = self.df['close'].diff(14)
-            
-            elif feature == "high_low_range":
-                # Mum aralığı (high - low)
-                self.df['high_low_range'] = self.df['high'] - self.df['low']
-            
-            elif feature == "high_low_pct":
-                # Mum aralığı yüzdesi
-                self.df['high_low_pct'] = ((self.df['high'] - self.df['low']) / self.df['low']) * 100
-            
-            elif feature == "body_size":
-                # Mum gövde büyüklüğü
-                self.df['body_size'] = abs(self.df['close'] - self.df['open'])
-            
-            elif feature == "upper_shadow":
-                # Üst gölge
-                self.df['upper_shadow'] = self.df['high'] - self.df[['open', 'close']].max(axis=1)
-            
-            elif feature == "lower_shadow":
-                # Alt gölge
-                self.df['lower_shadow'] = self.df[['open', 'close']].min(axis=1) - self.df['low']
+            features = DEFAULT_FEATURES
+
+        # Ozellikler kayit defterinden (feature_registry.py) geliyor.
+        # Bilinmeyenleri eskisi gibi atliyorum.
+        registry = registry or FEATURE_REGISTRY
+        unknown = [f for f in features if f not in registry]
+        if unknown:
+            print(f"   Bilinmeyen ozellikler atlandi: {unknown}")
+        known = [f for f in features if f not in unknown]
+
+        # Ham sutunlari bir kez NumPy'a alip butun ozellikleri tek geciste hesapliyorum
+        # Sonuclar dogrudan tek bir blok array'e yaziliyor ve bu blok
+        # DataFrame'e tek seferde ekleniyor (mevcut sutunlar kopyalanmiyor)
+        names = list(dict.fromkeys(known))
+        if names:
+            inputs = {col: self.df[col].to_numpy() for col in RAW_COLUMNS}
+            if REFERENCE_COLUMN in self.df.columns:
+                inputs[REFERENCE_COLUMN] = self.df[REFERENCE_COLUMN].to_numpy()
+            block = np.empty((len(self.df), len(names)), dtype=self.float_dtype or np.float64)
+            registry.compute(inputs, names, out=block)
+            del inputs
+            self._update_memory_peak()
+            self.df[names] = block
+            del block
+        self._update_memory_peak()
+        self._features = list(dict.fromkeys(self._features + names))
+        self._registry = registry
+        self._engine = None
         
         # İlk satırlardaki NaN'ları kaldır (rolling/diff işlemlerinden)
-        initial_rows = len(self.df)
-        self.df = self.df.dropna().reset_index(drop=True)
+        removed = self._drop_nan_rows()
+        
+        if removed:
+            print(f"   {len(known)} ozellik eklendi ({removed} NaN satir kaldirildi)")
+        else:
+            print(f"   {len(known)} ozellik eklendi")
+        
+        return self.df
+    
+    def _drop_nan_rows(self) -> int:
+        """NaN iceren satirlari atar, atilan satir sayisini doner"""
+        # NaN'lar sadece bastaysa (normal durum) kopyalamadan dilimliyorum
+        nan_rows = np.zeros(len(self.df), dtype=bool)
+        for col in self.df.columns:
+            nan_rows |= self.df[col].isna().to_numpy()
+        n_nan = int(nan_rows.sum())
+        if n_nan and nan_rows[:n_nan].all():
+            self.df = self.df.iloc[n_nan:].reset_index(drop=True)
+        elif n_nan:
+            self.df = self.df[~nan_rows].reset_index(drop=True)
+        del nan_rows
+        self._update_memory_peak()
+        return n_nan
+    
+    def add_timeframe_features(
+        self,
+        timeframe: str,
+        features: List[str],
+        base_timeframe: str,
+        candles: Optional[pd.DataFrame] = None,
+        registry: Optional[FeatureRegistry] = None
+    ) -> pd.DataFrame:
+        """
+        Kalin timeframe'de hesaplanan ozellikleri satirlara hizalar (ileriye bakmadan)
+        
+        Ozellikler kalin mumlar uzerinde kayit defterinden hesaplaniyor,
+        sonra her satira o satirin kapanisinda kapanmis son kalin mumun
+        degeri veriliyor (as-of). Indeks haritasi (searchsorted) timeframe
+        cifti icin bir kez hesaplaniyor ve butun sutunlar tek bir
+        indekslemeyle tasiniyor; merge_asof'u her sutun icin tekrarlamak
+        gerekmiyor. Henuz kalin mumu kapanmamis ilk satirlar atiliyor.
         
-        if initial_rows > len(self.df):
-            print(f"   {len(features)} ozellik eklendi ({initial_rows - len(self.df)} NaN satir kaldirildi)")
+        Sutun adlari "<ozellik>_<timeframe>": volatility_1h, price_momentum_4h
+        
+        Args:
+            timeframe: Kalin timeframe (1h, 4h, 1d...)
+            features: Kalin mumlarda hesaplanacak ozellikler
+            base_timeframe: Bu verinin timeframe'i (satirin kapanis zamani icin)
+            candles: Kalin mumlar (None ise bu veriden resample ile turetilir)
+            registry: Ozellik kayit defteri (None ise FEATURE_REGISTRY)
+        
+        Returns:
+            DataFrame: Yeni sutunlar eklenmis veri
+        """
+        print(f"{timeframe} ozellikleri ekleniyor...")
+        registry = registry or FEATURE_REGISTRY
+        unknown = [f for f in features if f not in registry]
+        if unknown:
+            print(f"   Bilinmeyen ozellikler atlandi: {unknown}")
+        names = list(dict.fromkeys(f for f in features if f not in unknown))
+        if not names:
+            return self.df
+        
+        base = candle_columns(self.df)
+        if candles is None:
+            higher = resample_columns(base, timeframe)
+        else:
+            # Disaridan gelen mumlar sirasiz veya tekrarli olabilir
+            higher = candle_columns(candles)
+            _, first = np.unique(higher['timestamp_ms'], return_index=True)
+            higher = {col: np.asarray(arr)[first] for col, arr in higher.items()}
+        
+        dtype = self.float_dtype or np.float64
+        block = np.empty((len(higher['timestamp_ms']), len(names)), dtype=dtype)
+        inputs = {col: np.asarray(higher[col], dtype=dtype) for col in RAW_COLUMNS}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            registry.compute(inputs, names, out=block)
+        del inputs
+        
+        # Timeframe cifti icin tek indeks haritasi, butun sutunlar icin ortak
+        positions = asof_positions(base['timestamp_ms'], higher['timestamp_ms'], timeframe, base_timeframe)
+        if len(block):
+            aligned = block[np.maximum(positions, 0)]
+            aligned[positions < 0] = np.nan
         else:
-            print(f"   {len(features)} ozellik eklendi")
+            aligned = np.full((len(positions), len(names)), np.nan, dtype=dtype)
+        del block, positions
+        
+        self.df[[f"{name}_{timeframe}" for name in names]] = aligned
+        self._timeframe_columns += [f"{name}_{timeframe}" for name in names]
+        del aligned
+        self._update_memory_peak()
         
+        removed = self._drop_nan_rows()
+        print(f"   {len(names)} ozellik {timeframe} mumlardan hizalandi"
+              + (f" ({removed} NaN satir kaldirildi)" if removed else ""))
         return self.df
     
+    def append(self, candle: list, ref_close: Optional[float] = None) -> np.ndarray:
+        """
+        Yeni bir mum ekler ve sadece o mumun ozelliklerini hesaplar
+        
+        add_features() ile eklenen ozellikler IncrementalFeatureEngine ile
+        (ayni kayit defteri tanimlari) guncelleniyor, gecmis bastan
+        hesaplanmiyor. Motor ilk cagrida df'in son `lookback` satirindan
+        kuruluyor.
+        
+        Args:
+            candle: [timestamp_ms, open, high, low, close, volume]
+            ref_close: Referans paritenin ayni mumdaki kapanisi
+                       (referansa gore ozellikler icin gerekli)
+        
+        Returns:
+            numpy array: Yeni mumun ozellikleri (add_features sirasiyla)
+        """
+        if not self._features:
+            raise ValueError("append() icin once add_features() cagrilmali")
+        if self._timeframe_columns:
+            raise ValueError(
+                f"Kalin timeframe ozellikleri artimli guncellenemiyor: {self._timeframe_columns}"
+            )
+        
+        timestamp = pd.to_datetime(int(candle[0]), unit='ms')
+        if timestamp <= self.df['timestamp'].iloc[-1]:
+            raise ValueError(f"Mum son satirdan eski veya ayni: {timestamp}")
+        
+        if self._engine is None:
+            from feature_engine import IncrementalFeatureEngine
+            
+            self._engine = IncrementalFeatureEngine(self._features, self._registry)
+            history = RAW_COLUMNS + ([REFERENCE_COLUMN] if self._engine.needs_reference else [])
+            self._engine.prime({col: self.df[col].to_numpy() for col in history})
+        
+        values = self._engine.update(*candle[1:6], ref_close=ref_close)
+        
+        row = {'timestamp': timestamp}
+        row.update(zip(RAW_COLUMNS, candle[1:6]))
+        if 'timestamp_ms' in self.df.columns:
+            row['timestamp_ms'] = int(candle[0])
+        if ref_close is not None and REFERENCE_COLUMN in self.df.columns:
+            row[REFERENCE_COLUMN] = ref_close
+        row.update(zip(self._features, values))
+        new = pd.DataFrame([row]).astype({col: self.df[col].dtype for col in row if col in self.df.columns})
+        self.df = pd.concat([self.df, new], ignore_index=True)
+        return values
+    
     def prepare_for_anomaly_detection(
         self, 
         target_column: str = "close",
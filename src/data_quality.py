@@ -0,0 +1,401 @@
+"""
+Mum Izgarasi (Grid) Dogrulama ve Onarim Modulu
+
+clean_data sadece NaN, sifir/negatif fiyat ve tekrar eden zamanlari
+temizliyor. OHLC tutarliligina (low <= open/close <= high) ve timeframe
+izgarasindaki eksik mumlara hic bakmiyor. Sessiz bosluklar diff(14)
+momentumunu ve rolling volatilite penceresini bozuyor: "14 mum once"
+aslinda 3 saat once olabiliyor.
+
+Bu modulde:
+- validate_candles(): Tek geciste (parca parca, kaynasik) butun kontrolleri
+  yapip yapilandirilmis bir kalite raporu uretiyor
+  (bosluk araliklari, tutarsiz barlar, sifir hacim serileri...)
+- reindex_to_grid(): Veriyi duzenli izgaraya oturtuyor, bosluklari
+  ileri doldurma (ffill), isaretleme (mark) veya NaN ile dolduruyor
+- repair_ohlc(): Tutarsiz barlarin high/low degerlerini duzeltiyor
+- refetch_gaps(): Sadece bosluk araliklarini borsadan tekrar cekiyor
+
+Hepsi vektorel; on milyonlarca satirda da hizli.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from candle_store import OHLCV_COLUMNS
+from resampler import bucket_end, bucket_start, timeframe_to_ms
+
+
+# Satir bayraklari (bir satirda birden fazla sorun olabilir)
+FLAG_MISSING_VALUE = 1      # NaN fiyat/hacim
+FLAG_NON_POSITIVE = 2       # Sifir veya negatif fiyat
+FLAG_OHLC = 4               # low <= open/close <= high bozuk
+FLAG_ZERO_VOLUME = 8        # Hacim sifir
+FLAG_DUPLICATE = 16         # Onceki mumla ayni zaman
+FLAG_OUT_OF_ORDER = 32      # Onceki mumdan eski zaman
+FLAG_MISALIGNED = 64        # Timeframe izgarasina oturmuyor
+
+FLAG_NAMES = {
+    FLAG_MISSING_VALUE: 'missing_value',
+    FLAG_NON_POSITIVE: 'non_positive_price',
+    FLAG_OHLC: 'ohlc_inconsistent',
+    FLAG_ZERO_VOLUME: 'zero_volume',
+    FLAG_DUPLICATE: 'duplicate_timestamp',
+    FLAG_OUT_OF_ORDER: 'out_of_order',
+    FLAG_MISALIGNED: 'misaligned',
+}
+
+# Kontroller bu kadar satirlik parcalarla yapiliyor (gecici array'ler cache'te kalsin)
+CHUNK_ROWS = 1 << 20
+
+
+def candle_columns(data: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """DataFrame veya sutun sozlugunden OHLCV sutunlarini (kopyalamadan) alir"""
+    if isinstance(data, pd.DataFrame):
+        if 'timestamp_ms' in data.columns:
+            timestamps = data['timestamp_ms'].to_numpy(dtype=np.int64)
+        else:
+            timestamps = data['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+        columns = {col: data[col].to_numpy() for col in OHLCV_COLUMNS[1:]}
+        columns['timestamp_ms'] = timestamps
+        return columns
+    return {col: np.asarray(data[col]) for col in OHLCV_COLUMNS}
+
+
+class DataQualityReport:
+    """
+    validate_candles() ciktisi
+
+    Attributes:
+        rows: Satir sayisi
+        timeframe: Kontrol edilen timeframe
+        flags: Satir basina bayraklar (uint8, FLAG_* bitleri)
+        gaps: (N, 3) int64 array: bosluk baslangici (ms), bitisi (ms, dahil),
+              eksik mum sayisi
+        zero_volume_runs: (N, 3) int64 array: baslangic satiri, bitis satiri
+                          (dahil), uzunluk
+    """
+
+    def __init__(self, rows: int, timeframe: str, flags: np.ndarray, gaps: np.ndarray,
+                 zero_volume_runs: np.ndarray, first_ms: Optional[int], last_ms: Optional[int]):
+        self.rows = rows
+        self.timeframe = timeframe
+        self.flags = flags
+        self.gaps = gaps
+        self.zero_volume_runs = zero_volume_runs
+        self.first_ms = first_ms
+        self.last_ms = last_ms
+
+    def rows_with(self, flag: int) -> np.ndarray:
+        """Belirli bir sorunu olan satirlarin indeksleri"""
+        return np.flatnonzero(self.flags & flag)
+
+    @property
+    def inconsistent_bars(self) -> np.ndarray:
+        return self.rows_with(FLAG_OHLC)
+
+    @property
+    def missing_candles(self) -> int:
+        return int(self.gaps[:, 2].sum()) if len(self.gaps) else 0
+
+    @property
+    def is_clean(self) -> bool:
+        return len(self.gaps) == 0 and not (self.flags & ~np.uint8(FLAG_ZERO_VOLUME)).any()
+
+    def counts(self) -> Dict[str, int]:
+        """Her sorun tipinden kac satir var"""
+        return {name: int(np.count_nonzero(self.flags & flag)) for flag, name in FLAG_NAMES.items()}
+
+    def to_dict(self, max_items: int = 50) -> dict:
+        """JSON'a yazilabilir ozet (uzun listeler max_items ile kisaltiliyor)"""
+        def _ts(ms):
+            return str(pd.to_datetime(int(ms), unit='ms'))
+
+        return {
+            'rows': self.rows,
+            'timeframe': self.timeframe,
+            'start': _ts(self.first_ms) if self.first_ms is not None else None,
+            'end': _ts(self.last_ms) if self.last_ms is not None else None,
+            'is_clean': self.is_clean,
+            'counts': self.counts(),
+            'gap_count': int(len(self.gaps)),
+            'missing_candles': self.missing_candles,
+            'gaps': [
+                {'start': _ts(s), 'end': _ts(e), 'missing': int(n)}
+                for s, e, n in self.gaps[:max_items]
+            ],
+            'inconsistent_bars': self.inconsistent_bars[:max_items].tolist(),
+            'zero_volume_runs': [
+                {'start_row': int(s), 'end_row': int(e), 'length': int(n)}
+                for s, e, n in self.zero_volume_runs[:max_items]
+            ],
+        }
+
+    def print_summary(self):
+        counts = self.counts()
+        print(f"Veri kalitesi ({self.timeframe}, {self.rows:,} mum):")
+        if self.is_clean and not counts['zero_volume']:
+            print("   Sorun bulunamadi")
+            return
+        if len(self.gaps):
+            print(f"   {len(self.gaps)} bosluk, toplam {self.missing_candles:,} eksik mum")
+            longest = self.gaps[np.argmax(self.gaps[:, 2])]
+            print(f"   En uzun bosluk: {pd.to_datetime(int(longest[0]), unit='ms')} "
+                  f"({int(longest[2])} mum)")
+        for name, count in counts.items():
+            if count:
+                print(f"   {name}: {count:,} satir")
+        if len(self.zero_volume_runs):
+            print(f"   {len(self.zero_volume_runs)} sifir hacim serisi "
+                  f"(en uzun {int(self.zero_volume_runs[:, 2].max())} mum)")
+
+
+def _count_missing(starts: np.ndarray, next_ts: np.ndarray, timeframe: str) -> np.ndarray:
+    """Iki mum arasinda kac mum eksik (starts: beklenen sonraki mum)"""
+    if timeframe.endswith('M'):
+        step = int(timeframe[:-1] or 1)
+        a = starts.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+        b = next_ts.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+        return (b - a) // step
+    return (next_ts - starts) // timeframe_to_ms(timeframe)
+
+
+def validate_candles(
+    data: Union[pd.DataFrame, Dict[str, np.ndarray]],
+    timeframe: str,
+    chunk_rows: int = CHUNK_ROWS
+) -> DataQualityReport:
+    """
+    Mumlari tek geciste dogrular
+
+    Veriyi parca parca dolasiyorum. Her parcada butun kontroller ayni
+    gecici array'ler uzerinde yapilip satir bayraklarina yaziliyor, boylece
+    on milyonlarca satirda bile bellek ve cache kullanimi sinirli kaliyor.
+
+    Args:
+        data: DataFrame (fetch_ohlcv ciktisi) veya OHLCV sutunlari
+        timeframe: Beklenen timeframe (1m, 15m, 1h, 1d, 1w, 1M...)
+        chunk_rows: Parca boyu
+
+    Returns:
+        DataQualityReport
+    """
+    columns = candle_columns(data)
+    ts = columns['timestamp_ms']
+    o, h, l, c, v = (columns[col] for col in OHLCV_COLUMNS[1:])
+    n = len(ts)
+
+    flags = np.zeros(n, dtype=np.uint8)
+    gap_parts: List[np.ndarray] = []
+
+    for start in range(0, n, chunk_rows):
+        end = min(start + chunk_rows, n)
+        f = flags[start:end]
+        co, ch, cl, cc, cv = o[start:end], h[start:end], l[start:end], c[start:end], v[start:end]
+        cts = ts[start:end]
+
+        bad = np.isnan(co) | np.isnan(ch) | np.isnan(cl) | np.isnan(cc) | np.isnan(cv)
+        f[bad] |= FLAG_MISSING_VALUE
+
+        bad = (co <= 0) | (ch <= 0) | (cl <= 0) | (cc <= 0)
+        f[bad] |= FLAG_NON_POSITIVE
+
+        # low <= min(open, close) ve max(open, close) <= high
+        body_top = np.maximum(co, cc)
+        body_bottom = np.minimum(co, cc)
+        bad = (cl > body_bottom) | (ch < body_top) | (cl > ch)
+        f[bad] |= FLAG_OHLC
+
+        f[cv == 0] |= FLAG_ZERO_VOLUME
+
+        f[bucket_start(cts, timeframe) != cts] |= FLAG_MISALIGNED
+
+        # Bir onceki mumla karsilastirma (parca sinirinda bir satir geriye bakiyorum)
+        prev = ts[start - 1:end - 1] if start > 0 else ts[:end - 1]
+        curr = cts if start > 0 else cts[1:]
+        offset = 0 if start > 0 else 1
+        step = curr - prev
+        f[offset:][step == 0] |= FLAG_DUPLICATE
+        f[offset:][step < 0] |= FLAG_OUT_OF_ORDER
+
+        expected = bucket_end(bucket_start(prev, timeframe), timeframe)
+        gap = np.flatnonzero(curr > expected)
+        if len(gap):
+            gap_starts = expected[gap]
+            missing = _count_missing(gap_starts, curr[gap], timeframe)
+            # Bitis: son eksik mumun acilis zamani
+            gap_ends = bucket_start(curr[gap] - 1, timeframe)
+            gap_parts.append(np.column_stack([gap_starts, gap_ends, missing]))
+
+    gaps = np.concatenate(gap_parts) if gap_parts else np.empty((0, 3), dtype=np.int64)
+    gaps = gaps[gaps[:, 2] > 0] if len(gaps) else gaps
+
+    # Sifir hacim serileri: bayrak dizisindeki 0->1 ve 1->0 gecisleri
+    zero = (flags & FLAG_ZERO_VOLUME) != 0
+    edges = np.diff(np.concatenate([[False], zero, [False]]).astype(np.int8))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1
+    zero_runs = np.column_stack([run_starts, run_ends, run_ends - run_starts + 1]).astype(np.int64)
+
+    return DataQualityReport(
+        rows=n,
+        timeframe=timeframe,
+        flags=flags,
+        gaps=gaps.astype(np.int64),
+        zero_volume_runs=zero_runs,
+        first_ms=int(ts[0]) if n else None,
+        last_ms=int(ts[-1]) if n else None,
+    )
+
+
+def drop_unclosed(df: pd.DataFrame, timeframe: str, now_ms: Optional[int] = None) -> pd.DataFrame:
+    """
+    Henuz kapanmamis son mum(lar)i atar (kopyalamadan, sondan dilimleyerek)
+
+    Canli mumun hacmi yarim ve fiyati her saniye degisiyor; analizde
+    volume_change'i bozuyor ve icerik hash'ini her calistirmada degistiriyor.
+
+    Args:
+        df: Zaman sirali mumlar
+        timeframe: Timeframe
+        now_ms: Simdiki zaman (ms, varsayilan time.time())
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    ends = bucket_end(bucket_start(candle_columns(df)['timestamp_ms'], timeframe), timeframe)
+    closed_rows = int(np.searchsorted(ends, now_ms, side='right'))
+    return df if closed_rows == len(df) else df.iloc[:closed_rows]
+
+
+def repair_ohlc(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Tutarsiz barlarda high'i max(o, h, l, c), low'u min(o, h, l, c) yapar
+
+    Returns:
+        dict: Yeni sutunlar (girdi degismiyor)
+    """
+    o, h, l, c = (columns[col] for col in ('open', 'high', 'low', 'close'))
+    repaired = dict(columns)
+    repaired['high'] = np.maximum(np.maximum(o, h), np.maximum(l, c))
+    repaired['low'] = np.minimum(np.minimum(o, h), np.minimum(l, c))
+    return repaired
+
+
+def reindex_to_grid(
+    data: Union[pd.DataFrame, Dict[str, np.ndarray]],
+    timeframe: str,
+    policy: str = 'ffill'
+) -> Dict[str, np.ndarray]:
+    """
+    Mumlari ilk ve son mum arasindaki duzenli izgaraya oturtur
+
+    Tekrar eden zamanlarda ilk mum kaliyor, izgaraya oturmayan mumlar
+    atiliyor. Eksik mumlar icin:
+    - 'ffill': open=high=low=close=onceki kapanis, volume=0
+    - 'mark':  ffill ile ayni, ayrica 'is_filled' sutunu True
+    - 'nan':   fiyat ve hacim NaN (sonra clean_data atabilir)
+
+    Args:
+        data: DataFrame veya OHLCV sutunlari (zaman sirali olmasi gerekmiyor)
+        timeframe: Sabit genislikli timeframe (1m ... 1w)
+        policy: 'ffill', 'mark' veya 'nan'
+
+    Returns:
+        dict: Izgaradaki OHLCV sutunlari (+ 'is_filled' bool)
+    """
+    if policy not in ('ffill', 'mark', 'nan'):
+        raise ValueError(f"Bilinmeyen bosluk politikasi: {policy} (ffill, mark, nan)")
+    if timeframe.endswith('M'):
+        raise ValueError("Takvim ayi (1M) izgarasi sabit genislikli degil, reindex desteklenmiyor")
+
+    columns = candle_columns(data)
+    ts = columns['timestamp_ms']
+    width = timeframe_to_ms(timeframe)
+
+    # Izgaraya oturan mumlar; tekrar eden zamanlarda ilki kaliyor
+    take = np.flatnonzero(bucket_start(ts, timeframe) == ts)
+    if len(take) == 0:
+        raise ValueError("Izgaraya oturan mum yok")
+    take_ts = ts[take]
+    if not (take_ts[1:] >= take_ts[:-1]).all():
+        order = np.argsort(take_ts, kind='stable')
+        take, take_ts = take[order], take_ts[order]
+    first_of_run = np.concatenate([[True], take_ts[1:] != take_ts[:-1]])
+    if not first_of_run.all():
+        take, take_ts = take[first_of_run], take_ts[first_of_run]
+    all_rows = len(take) == len(ts) and take[-1] == len(ts) - 1
+
+    first = int(take_ts[0])
+    size = (int(take_ts[-1]) - first) // width + 1
+    positions = (take_ts - first) // width
+
+    # Eksik izgara noktalari ve her birinden onceki son mevcut mum
+    present = np.zeros(size, dtype=bool)
+    present[positions] = True
+    missing = np.flatnonzero(~present)
+    previous = take[np.searchsorted(positions, missing, side='right') - 1]
+
+    grid = {'timestamp_ms': first + np.arange(size, dtype=np.int64) * width}
+    for col in OHLCV_COLUMNS[1:]:
+        values = columns[col] if all_rows else columns[col][take]
+        dtype = np.result_type(values.dtype, np.float32) if policy == 'nan' else values.dtype
+        out = np.empty(size, dtype=dtype)
+        out[positions] = values
+        if policy == 'nan':
+            out[missing] = np.nan
+        elif col == 'volume':
+            out[missing] = 0
+        else:
+            # Eksik mum: open=high=low=close=onceki kapanis
+            out[missing] = columns['close'][previous]
+        grid[col] = out
+
+    if policy == 'mark':
+        grid['is_filled'] = ~present
+    return grid
+
+
+def refetch_gaps(
+    fetcher,
+    symbol: str,
+    timeframe: str,
+    data: Union[pd.DataFrame, Dict[str, np.ndarray]],
+    report: Optional[DataQualityReport] = None
+) -> Tuple[Dict[str, np.ndarray], DataQualityReport]:
+    """
+    Sadece bosluk araliklarini borsadan tekrar ceker ve veriye ekler
+
+    Args:
+        fetcher: DataFetcher
+        symbol: Parite
+        timeframe: Timeframe
+        data: Mevcut mumlar
+        report: Onceden hesaplanmis rapor (yoksa hesaplanir)
+
+    Returns:
+        (sutunlar, yeni rapor): Birlestirilmis zaman sirali mumlar ve
+        tekrar cekimden sonra kalan sorunlar (borsada da olmayan mumlar)
+    """
+    columns = candle_columns(data)
+    if report is None:
+        report = validate_candles(columns, timeframe)
+
+    parts = [columns]
+    for gap_start, gap_end, missing in report.gaps:
+        print(f"   Bosluk tekrar cekiliyor: {pd.to_datetime(int(gap_start), unit='ms')} "
+              f"({int(missing)} mum)")
+        parts.append(fetcher.fetch_range(symbol, timeframe, int(gap_start), int(gap_end)))
+
+    merged = {col: np.concatenate([p[col] for p in parts]) for col in OHLCV_COLUMNS}
+    order = np.argsort(merged['timestamp_ms'], kind='stable')
+    merged = {col: arr[order] for col, arr in merged.items()}
+
+    # Ayni mum iki kez geldiyse ilkini (mevcut veriyi) tutuyorum
+    ts = merged['timestamp_ms']
+    keep = np.concatenate([[True], ts[1:] != ts[:-1]])
+    merged = {col: arr[keep] for col, arr in merged.items()}
+
+    return merged, validate_candles(merged, timeframe)
@@ -0,0 +1,267 @@
+"""
+Ozellik Matrisi Onbellegi
+
+Her calistirmada clean_data, add_features ve prepare_for_anomaly_detection
+bastan calisiyordu; sadece CONTAMINATION veya Z_SCORE_THRESHOLD gibi
+dedektor ayarlari degistiginde bile.
+
+Bu modulde hazirlanmis veriyi icerik adresli (content-addressed) olarak
+diske yaziyorum:
+- Anahtar = mumlarin iceriginin + ozellik listesinin + ayarlarin hash'i
+  (ayni mumlar ve ayarlar -> ayni anahtar, herhangi biri degisirse yeni anahtar)
+- Array'ler C-ardisik .npy dosyalari; okurken memory-map ile aciliyor
+- Toplam boyut siniri asilinca en uzun suredir kullanilmayan (LRU) kayitlar siliniyor
+
+Dosya yapisi:
+    data/features/<anahtar>/
+        frame_values.npy   <- (sutun, T) float blok (DataFrame'in float sutunlari)
+        frame_<sutun>.npy  <- diger sutunlar (timestamp_ms, timestamp...)
+        <isim>.npy         <- ek array'ler (X matrisi gibi)
+        meta.json          <- sutun sirasi, ayarlar, boyut
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from candle_store import OHLCV_COLUMNS
+from config import FEATURE_CACHE_DIR, DataConfig
+from data_quality import candle_columns
+
+
+# Ozellik formulleri degisirse eski kayitlar kullanilmasin diye anahtara giriyor
+CACHE_VERSION = 1
+
+
+class CachedFeatures:
+    """
+    Onbellekten okunan kayit
+
+    Attributes:
+        frame: Hazirlanmis DataFrame (float sutunlar memory-map'li dosyanin view'i)
+        arrays: Ek array'ler (memory-map, salt okunur)
+        meta: put() ile verilen ek bilgiler
+    """
+
+    def __init__(self, frame: pd.DataFrame, arrays: Dict[str, np.ndarray], meta: dict):
+        self.frame = frame
+        self.arrays = arrays
+        self.meta = meta
+
+
+class FeatureCache:
+    """
+    Hazirlanmis ozellik matrisleri icin icerik adresli disk onbellegi
+
+    Nasil kullanilir:
+        cache = FeatureCache()
+        anahtar = cache.key(ham_df, ozellikler, {"dtype": "float64"})
+        kayit = cache.get(anahtar)
+        if kayit is None:
+            ...                               # Veriyi hazirla
+            cache.put(anahtar, processor.df, {"X": X})
+
+    Args:
+        root_dir: Onbellek klasoru (varsayilan data/features)
+        max_bytes: Toplam boyut siniri (varsayilan DataConfig.FEATURE_CACHE_MAX_MB)
+    """
+
+    def __init__(self, root_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.root_dir = Path(root_dir) if root_dir is not None else FEATURE_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else DataConfig.FEATURE_CACHE_MAX_MB * 1024 ** 2
+
+    @staticmethod
+    def key(
+        candles: Union[pd.DataFrame, Dict[str, np.ndarray]],
+        features: List[str],
+        settings: Optional[dict] = None
+    ) -> str:
+        """
+        Mumlarin icerigi, ozellik listesi ve ayarlardan anahtar uretir
+
+        Zaman araligi yerine icerigi hash'liyorum: canli (kapanmamis) son
+        mum degistiginde veya bir bosluk sonradan dolduruldugunda anahtar
+        da degisiyor.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        columns = candle_columns(candles)
+        for col in OHLCV_COLUMNS:
+            arr = np.ascontiguousarray(columns[col])
+            digest.update(f"{col}:{arr.dtype.str}:{len(arr)};".encode())
+            digest.update(memoryview(arr).cast('B'))
+
+        header = {'version': CACHE_VERSION, 'features': list(features), 'settings': settings or {}}
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root_dir / key
+
+    def _read_meta(self, entry: Path) -> Optional[dict]:
+        try:
+            with open(entry / "meta.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str) -> Optional[CachedFeatures]:
+        """
+        Kaydi memory-map ile acar (yoksa veya bozuksa None)
+
+        Okunan kaydin son kullanim zamanini guncelliyorum (LRU).
+        """
+        entry = self._entry_dir(key)
+        meta = self._read_meta(entry)
+        if meta is None:
+            return None
+
+        try:
+            values = np.load(entry / "frame_values.npy", mmap_mode='r')
+            frame = pd.DataFrame(values.T, columns=meta['float_columns'], copy=False)
+            for col in meta['columns']:
+                if col in meta['float_columns']:
+                    continue
+                arr = np.load(entry / f"frame_{col}.npy", mmap_mode='r')
+                dtype = meta['column_dtypes'][col]
+                if dtype.startswith('datetime64'):
+                    arr = arr.view(dtype)
+                frame.insert(meta['columns'].index(col), col, arr)
+            arrays = {name: np.load(entry / f"{name}.npy", mmap_mode='r') for name in meta['arrays']}
+        except (OSError, ValueError, KeyError):
+            # Yarim kalmis veya bozuk kayit
+            return None
+
+        os.utime(entry / "meta.json")
+        print(f"Ozellik onbellegi kullanildi: {key[:12]} ({len(frame):,} satir)")
+        return CachedFeatures(frame, arrays, meta.get('extra', {}))
+
+    def put(
+        self,
+        key: str,
+        frame: pd.DataFrame,
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+        meta: Optional[dict] = None
+    ):
+        """
+        Hazirlanmis DataFrame'i ve ek array'leri kaydeder
+
+        Once gecici bir klasore yazip sonra tek seferde yerine tasiyorum,
+        boylece yarim yazilmis bir kayit hic gorulmuyor.
+
+        Args:
+            key: key() ile uretilen anahtar
+            frame: Hazirlanmis veri (float, int, bool ve datetime sutunlar)
+            arrays: Ek array'ler (isim -> array), ornek {"X": X}
+            meta: JSON'a yazilabilir ek bilgiler (kalite raporu gibi)
+        """
+        arrays = arrays or {}
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.root_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+
+        float_columns = [col for col in frame.columns if frame[col].dtype.kind == 'f']
+        # Float sutunlari tek bir (sutun, T) blokta tutuyorum: okurken
+        # DataFrame kopyalanmadan bu blogun uzerine kuruluyor
+        dtype = np.result_type(*[frame[col].dtype for col in float_columns]) if float_columns else np.float64
+        values = np.empty((len(float_columns), len(frame)), dtype=dtype)
+        for i, col in enumerate(float_columns):
+            values[i] = frame[col].to_numpy()
+        np.save(tmp / "frame_values.npy", values)
+        del values
+
+        column_dtypes = {}
+        for col in frame.columns:
+            column_dtypes[col] = str(frame[col].dtype)
+            if col in float_columns:
+                continue
+            arr = frame[col].to_numpy()
+            if arr.dtype.kind == 'M':
+                arr = arr.astype('datetime64[ms]')
+                column_dtypes[col] = 'datetime64[ms]'
+                arr = arr.view(np.int64)
+            elif arr.dtype.kind not in 'iub':
+                raise ValueError(f"'{col}' sutunu onbellege yazilamaz (tip: {arr.dtype})")
+            np.save(tmp / f"frame_{col}.npy", np.ascontiguousarray(arr))
+
+        for name, arr in arrays.items():
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+
+        size = sum(path.stat().st_size for path in tmp.iterdir())
+        info = {
+            'columns': list(frame.columns),
+            'float_columns': float_columns,
+            'column_dtypes': column_dtypes,
+            'arrays': list(arrays),
+            'rows': int(len(frame)),
+            'bytes': int(size),
+            'extra': meta or {},
+        }
+        with open(tmp / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2, ensure_ascii=False, default=str)
+
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Baska bir process ayni kaydi once yazdi
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        print(f"Ozellik onbellegine yazildi: {key[:12]} ({size / 1e6:.1f} MB)")
+        self.evict()
+
+    def entries(self) -> List[dict]:
+        """Kayitlar (anahtar, boyut, son kullanim), en eskiden en yeniye"""
+        if not self.root_dir.exists():
+            return []
+        result = []
+        for entry in self.root_dir.iterdir():
+            if entry.name.startswith('.') or not entry.is_dir():
+                continue
+            meta = self._read_meta(entry)
+            if meta is None:
+                continue
+            result.append({
+                'key': entry.name,
+                'bytes': meta['bytes'],
+                'rows': meta['rows'],
+                'last_used': (entry / "meta.json").stat().st_mtime,
+            })
+        return sorted(result, key=lambda e: e['last_used'])
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Toplam boyut sinira inene kadar en eski kullanilan kayitlari siler
+
+        Returns:
+            int: Silinen kayit sayisi
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+
+        removed = 0
+        for e in entries:
+            if total <= limit:
+                break
+            shutil.rmtree(self._entry_dir(e['key']), ignore_errors=True)
+            total -= e['bytes']
+            removed += 1
+
+        if removed:
+            print(f"   Ozellik onbelleginden {removed} eski kayit silindi ({total / 1e6:.1f} MB kaldi)")
+        return removed
+
+    def clear(self):
+        """Butun onbellegi siler"""
+        shutil.rmtree(self.root_dir, ignore_errors=True)
@@ -0,0 +1,152 @@
+"""
+Artimli (Incremental) Ozellik Motoru
+
+DataProcessor.add_features her cagrida ozellikleri butun gecmis icin
+bastan hesapliyor. Tek bir yeni mum eklemek O(n) maliyet demek.
+
+Bu modulde formul tutmuyorum: her ozelligin mum mum hali kayit
+defterinden (FeatureRegistry.stepper) geliyor, add_features ile ayni
+tanimlar. Motor sadece:
+- Istenen ozellikleri ve ara degerleri hesap sirasina diziyor (resolve)
+- Her dugum icin bir durumlu fonksiyon tutuyor
+- Yeni mumda dugumleri sirayla guncelleyip istenenleri donuyor
+
+Maliyet ozellige gore degisiyor:
+- Gecikme, yuzde degisim ve volatilite aileleri adim basina O(1)
+- Medyan, MAD ve kantil aileleri O(log w) (SortedWindow)
+- Tek mumluk ozellikler (govde, golge, robust_zscore...) O(1)
+- Kendi durumlu karsiligi olmayan pencereli ozellikler (su an referans
+  pariteye gore ozelliklerin pair_moments_N ara degeri) her mumda son
+  pencereyi bastan hesapliyor: adim basina O(w). Motor bunlari
+  `windowed` listesinde tutuyor ve kurulurken uyari yaziyor.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cross_asset import REFERENCE_COLUMN
+from data_processor import DEFAULT_FEATURES, RAW_COLUMNS
+from feature_registry import FEATURE_REGISTRY, FeatureRegistry
+
+
+class IncrementalFeatureEngine:
+    """
+    Mum mum ozellik hesaplayan durumlu motor
+
+    Nasil kullanilir:
+        engine = IncrementalFeatureEngine(["price_pct_change", "volatility_50"])
+        engine.prime(gecmis_sutunlar)          # Sadece son `lookback` mum okunur
+        row = engine.update(o, h, l, c, v)     # Her yeni mumda
+
+    Gecmis yetersizken (ilk mumlar) ilgili ozellik NaN doner; add_features()
+    bu satirlari dropna ile atiyor.
+
+    Args:
+        features: Hesaplanacak ozellikler (None ise varsayilanlar)
+        registry: Ozellik kayit defteri (None ise FEATURE_REGISTRY)
+
+    Attributes:
+        lookback: Durumu kurmak icin gereken gecmis mum sayisi
+        needs_reference: Referans kapanisi (ref_close) gerekiyor mu
+        windowed: Artimli olmayan, her mumda pencereden yeniden hesaplanan
+                  dugumler (adim basina O(w); bos degilse uyari yaziliyor)
+    """
+
+    def __init__(
+        self,
+        features: Optional[List[str]] = None,
+        registry: Optional[FeatureRegistry] = None
+    ):
+        self.features = list(features) if features is not None else list(DEFAULT_FEATURES)
+        self.registry = registry or FEATURE_REGISTRY
+
+        unknown = [f for f in self.features if f not in self.registry]
+        if unknown:
+            raise ValueError(
+                f"Bilinmeyen ozellikler: {unknown} (feature_registry.py'de kayitli degil)"
+            )
+
+        available = RAW_COLUMNS + [REFERENCE_COLUMN]
+        self._order = self.registry.resolve(self.features, available)
+        self._inputs = {name: self.registry.get(name).inputs for name in self._order}
+        self.needs_reference = any(REFERENCE_COLUMN in inputs for inputs in self._inputs.values())
+        self.lookback = self.registry.lookback(self.features)
+
+        # Durumlu karsiligi olmayan pencereli dugumler her mumda O(w)
+        self.windowed = [
+            name for name in self._order
+            if self.registry.get(name).incremental is None and self.registry.get(name).window > 1
+        ]
+        if self.windowed:
+            print(f"   Uyari: {self.windowed} artimli degil, her mumda pencereden "
+                  f"yeniden hesaplaniyor (adim basina O(pencere))")
+        self.reset()
+
+    def reset(self):
+        """Butun durumu siler"""
+        self._steppers = {name: self.registry.stepper(name) for name in self._order}
+        self.count = 0
+
+    def update(
+        self,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        ref_close: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Yeni bir mum ekler ve o mumun ozelliklerini doner
+
+        Args:
+            ref_close: Referans paritenin ayni mumdaki kapanisi (referansa
+                       gore ozellikler icin gerekli)
+
+        Returns:
+            numpy array: self.features sirasiyla ozellik degerleri
+        """
+        if self.needs_reference and ref_close is None:
+            raise ValueError(f"Bu ozellikler icin {REFERENCE_COLUMN} gerekli: {self.features}")
+
+        values = {
+            'open': np.float64(open_), 'high': np.float64(high), 'low': np.float64(low),
+            'close': np.float64(close), 'volume': np.float64(volume),
+            REFERENCE_COLUMN: np.float64(np.nan if ref_close is None else ref_close),
+        }
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name in self._order:
+                values[name] = self._steppers[name](*(values[i] for i in self._inputs[name]))
+
+        self.count += 1
+        return np.array([values[f] for f in self.features], dtype=np.float64)
+
+    def prime(self, columns: Dict[str, np.ndarray]):
+        """
+        Durumu gecmis mumlardan kurar (sadece son `lookback` mum okunur)
+
+        Args:
+            columns: open, high, low, close, volume (ve gerekirse ref_close)
+                     sutunlari (eskiden yeniye)
+        """
+        self.reset()
+        n = len(columns['close'])
+        start = max(0, n - self.lookback)
+        self.transform({col: values[start:] for col, values in columns.items()})
+
+    def transform(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Butun mumlari sirayla isler (durumu devam ettirir)
+
+        Returns:
+            numpy array: (mum sayisi, ozellik sayisi)
+        """
+        n = len(columns['close'])
+        out = np.empty((n, len(self.features)))
+        arrays = [np.asarray(columns[col], dtype=np.float64) for col in RAW_COLUMNS]
+        reference = columns.get(REFERENCE_COLUMN)
+        for i in range(n):
+            ref_close = reference[i] if reference is not None else None
+            out[i] = self.update(*(a[i] for a in arrays), ref_close=ref_close)
+        return out
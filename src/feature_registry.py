@@ -0,0 +1,521 @@
+"""
+Ozellik Kayit Defteri (Feature Registry)
+
+add_features eskiden uzun bir if/elif zinciriydi. Her dal ortak ara
+degerleri kendisi tekrar hesapliyordu (high - low iki kez, open/close
+max/min icin gecici DataFrame'ler) ve yeni ozellik eklemek zinciri
+degistirmek demekti.
+
+Bu modulde her ozellik girdilerini ve pencere boyunu bildiriyor:
+- Kayit defteri bagimliliklardan bir DAG kuruyor (graphlib)
+- Ortak ara degerler (candle_range, body_top...) bir kez hesaplaniyor
+- Hesaplar ardisik NumPy array'leri uzerinde vektorel yapiliyor
+- Disaridan yeni ozellik eklemek icin register_feature yeterli
+
+Fonksiyonlar eksen 0 (zaman) boyunca calisiyor, yani hem (T,) hem de
+(T, parite) array'leri kabul ediyor.
+
+Ayni tanimlar mum mum (artimli) hesapta da kullaniliyor (stepper):
+- Tek mumluk ozellikler (window=1) ayni fonksiyonla skalerler uzerinde
+- Gecikme ve volatilite ailelerinin O(1) durumlu karsiligi var
+  (lag_diff_step, lag_pct_change_step, rolling_std_step), vektorel
+  yardimcilarin hemen yaninda
+- Medyan, MAD ve kantil aileleri pencereyi sirali tutuyor
+  (sorted_window_step, SortedWindow ile O(log w))
+- Digerleri son `window` girdiyi tutup ayni fonksiyonu o pencerede
+  calistiriyor ve son degeri aliyor; bu yedek yol adim basina O(window),
+  artimli degil (IncrementalFeatureEngine bunlar icin uyari yaziyor)
+Formul her ozellik icin tek yerde.
+
+Ornek:
+    @register_feature("close_to_high", inputs=["close", "high"])
+    def close_to_high(close, high):
+        return (high - close) / close * 100
+
+    processor.add_features(["close_to_high", "volatility_50"])
+"""
+
+import re
+from graphlib import CycleError, TopologicalSorter
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cross_asset import (
+    REFERENCE_COLUMN, residual_return, rolling_beta, rolling_correlation, rolling_pair_moments
+)
+from rolling_stats import (
+    RollingWelford, SortedWindow, robust_zscore, rolling_mad, rolling_median, rolling_quantile
+)
+
+
+class FeatureSpec:
+    """
+    Tek bir ozelligin tanimi
+
+    Args:
+        name: Ozellik adi (DataFrame sutunu)
+        func: Girdi array'lerini alip ayni uzunlukta array donduren fonksiyon
+        inputs: Girdi isimleri (ham sutunlar veya baska ozellikler)
+        window: Kac mum geriye bakiyor (bilgi ve onbellek icin)
+        intermediate: True ise sadece ara deger, sonuca yazilmaz
+        incremental: Mum mum hesap icin durumlu fonksiyon ureten fabrika
+                     (yoksa FeatureRegistry.stepper pencereden hesaplar)
+    """
+
+    def __init__(self, name: str, func: Callable, inputs: List[str], window: int = 1,
+                 intermediate: bool = False, incremental: Optional[Callable[[], Callable]] = None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.window = window
+        self.intermediate = intermediate
+        self.incremental = incremental
+
+    def __repr__(self) -> str:
+        return f"FeatureSpec({self.name!r}, inputs={self.inputs}, window={self.window})"
+
+
+class FeatureRegistry:
+    """
+    Ozellikleri ve bagimliliklarini tutan kayit defteri
+
+    Sabit isimli ozellikler register() ile, parametreli aileler
+    (volatility_50, price_momentum_7 gibi) register_family() ile ekleniyor.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, FeatureSpec] = {}
+        self._families: List[tuple] = []
+
+    def register(self, name: str, inputs: List[str], window: int = 1, intermediate: bool = False,
+                 incremental: Optional[Callable[[], Callable]] = None):
+        """Dekorator: fonksiyonu ozellik olarak kaydeder"""
+        def decorator(func: Callable) -> Callable:
+            self.add(FeatureSpec(name, func, inputs, window, intermediate, incremental))
+            return func
+        return decorator
+
+    def add(self, spec: FeatureSpec):
+        self._specs[spec.name] = spec
+
+    def register_family(self, prefix: str, factory: Callable[[int], FeatureSpec]):
+        """
+        "<prefix>_<n>" seklindeki isimler icin ozellik uretir
+
+        Args:
+            prefix: Isim on eki (ornek: "volatility")
+            factory: n -> FeatureSpec
+        """
+        self.register_pattern(rf"{re.escape(prefix)}_(\d+)", factory)
+
+    def register_pattern(self, pattern: str, factory: Callable[..., FeatureSpec]):
+        r"""
+        Birden fazla parametreli isimler icin ozellik uretir
+
+        Args:
+            pattern: Butun isimle eslesecek regex, her grup bir tamsayi
+                     (ornek: r"rolling_q(\d+)_(\d+)")
+            factory: (grup1, grup2, ...) -> FeatureSpec
+        """
+        self._families.append((re.compile(rf"^{pattern}$"), factory))
+
+    def get(self, name: str) -> Optional[FeatureSpec]:
+        spec = self._specs.get(name)
+        if spec is not None:
+            return spec
+        for pattern, factory in self._families:
+            match = pattern.match(name)
+            if match:
+                spec = factory(*(int(g) for g in match.groups()))
+                self._specs[name] = spec
+                return spec
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def names(self, include_intermediate: bool = False) -> List[str]:
+        """Kayitli sabit isimli ozellikler"""
+        return [n for n, s in self._specs.items() if include_intermediate or not s.intermediate]
+
+    def resolve(self, features: List[str], available: List[str]) -> List[str]:
+        """
+        Istenen ozellikleri ve ara degerleri hesap sirasina dizer
+
+        Args:
+            features: Istenen ozellikler
+            available: Elde hazir olan sutunlar (open, high...)
+
+        Returns:
+            list: Hesaplanacak isimler (bagimliliklar once)
+        """
+        available = set(available)
+        graph: Dict[str, List[str]] = {}
+        stack = list(features)
+
+        while stack:
+            name = stack.pop()
+            if name in graph or name in available:
+                continue
+            spec = self.get(name)
+            if spec is None:
+                raise KeyError(f"Bilinmeyen ozellik veya sutun: {name}")
+            graph[name] = [i for i in spec.inputs if i not in available]
+            stack.extend(spec.inputs)
+
+        try:
+            return list(TopologicalSorter(graph).static_order())
+        except CycleError as e:
+            raise ValueError(f"Ozellikler arasinda dongusel bagimlilik var: {e.args[1]}")
+
+    def lookback(self, features: List[str]) -> int:
+        """Istenen ozellikler icin gereken en uzun gecmis (mum)"""
+        memo: Dict[str, int] = {}
+        return max((self._chain_window(f, memo) for f in features), default=1)
+
+    def _chain_window(self, name: str, memo: Dict[str, int]) -> int:
+        if name in memo:
+            return memo[name]
+        spec = self.get(name)
+        if spec is None:
+            memo[name] = 1
+            return 1
+        parents = [self._chain_window(i, memo) for i in spec.inputs]
+        memo[name] = spec.window + max(parents, default=1) - 1
+        return memo[name]
+
+    def stepper(self, name: str) -> Callable:
+        """
+        Ozelligi mum mum hesaplayan durumlu fonksiyon
+
+        Donen fonksiyon her mumda girdilerin (spec.inputs) o mumdaki
+        degerlerini alip ozelligin o mumdaki degerini donuyor; sonuc
+        compute()'un ayni satirdaki degeriyle ayni.
+
+        incremental'i olmayan pencereli ozelliklerde pencere her mumda
+        bastan hesaplaniyor (_window_stepper, adim basina O(window)).
+        """
+        spec = self.get(name)
+        if spec is None:
+            raise KeyError(f"Bilinmeyen ozellik: {name}")
+        if spec.incremental is not None:
+            return spec.incremental()
+        if spec.window <= 1:
+            return spec.func
+        return _window_stepper(spec)
+
+    def compute(
+        self,
+        columns: Dict[str, np.ndarray],
+        features: List[str],
+        out: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Ozellikleri tek geciste hesaplar
+
+        Her ara deger bir kez hesaplanip butun ozellikler arasinda paylasiliyor.
+        out verilirse her ozellik hesaplanir hesaplanmaz out[..., i] sutununa
+        yaziliyor ve artik kimsenin ihtiyaci olmayan ara degerler hemen
+        birakiliyor (tepe bellek dusuk kalsin diye). Son eksen ozellik
+        ekseni: (T, parite) girdiler icin out (T, parite, len(features)) olabilir.
+
+        Args:
+            columns: Ham sutunlar (isim -> array, eksen 0 zaman)
+            features: Istenen ozellikler
+            out: (..., len(features)) array, verilirse sonuclar out[..., i]'ye yazilir
+
+        Returns:
+            dict: Ozellik adi -> array (istenen sirada; out verilirse out'un sutunlari)
+        """
+        order = self.resolve(features, available=list(columns))
+        if out is None:
+            values = dict(columns)
+            for name in order:
+                spec = self._specs[name]
+                values[name] = spec.func(*(values[i] for i in spec.inputs))
+            return {name: values[name] for name in features}
+
+        # Her degerin kac kez daha girdi olarak kullanilacagi
+        remaining: Dict[str, int] = {}
+        for name in order:
+            for i in self._specs[name].inputs:
+                remaining[i] = remaining.get(i, 0) + 1
+        targets: Dict[str, List[int]] = {}
+        for position, name in enumerate(features):
+            targets.setdefault(name, []).append(position)
+
+        values = {}
+        for name in order:
+            spec = self._specs[name]
+            args = [values[i] if i in values else columns[i] for i in spec.inputs]
+            result = spec.func(*args)
+            del args
+            for position in targets.get(name, []):
+                out[..., position] = result
+            if remaining.get(name, 0):
+                values[name] = result
+            del result
+            for i in spec.inputs:
+                remaining[i] -= 1
+                if remaining[i] == 0 and i in values:
+                    del values[i]
+        return {name: out[..., targets[name][0]] for name in features}
+
+
+# -- Vektorel yardimcilar (eksen 0 boyunca) ---------------------------------
+
+def lag_diff(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """x[t] - x[t-periods] (ilk satirlar NaN), pandas diff() ile ayni"""
+    out = np.empty(x.shape, dtype=np.float64)
+    out[:periods] = np.nan
+    out[periods:] = x[periods:] - x[:-periods]
+    return out
+
+
+def lag_pct_change(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """(x[t] / x[t-periods] - 1) * 100, pandas pct_change() * 100 ile ayni"""
+    out = np.empty(x.shape, dtype=np.float64)
+    out[:periods] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[periods:] = (x[periods:] / x[:-periods] - 1) * 100
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    rolling(window, min_periods=1).std()
+
+    Sonuclar add_features'in eski ciktisiyla birebir ayni kalsin diye
+    pandas'in rolling cekirdegini kullaniyorum (C'de, tek gecis).
+    """
+    if x.ndim == 1:
+        return pd.Series(x, copy=False).rolling(window=window, min_periods=1).std().to_numpy()
+    return pd.DataFrame(x, copy=False).rolling(window=window, min_periods=1).std().to_numpy()
+
+
+# -- Mum mum (artimli) karsiliklar ------------------------------------------
+
+def lag_diff_step(periods: int = 1) -> Callable[[float], float]:
+    """lag_diff'in mum mum hali (son periods+1 deger tutuluyor)"""
+    values = deque(maxlen=periods + 1)
+
+    def step(x: float) -> float:
+        values.append(x)
+        return x - values[0] if len(values) > periods else np.nan
+    return step
+
+
+def lag_pct_change_step(periods: int = 1) -> Callable[[float], float]:
+    """lag_pct_change'in mum mum hali"""
+    values = deque(maxlen=periods + 1)
+
+    def step(x: float) -> float:
+        values.append(x)
+        if len(values) <= periods:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.float64(x) / values[0] - 1) * 100
+    return step
+
+
+def rolling_std_step(window: int) -> Callable[[float], float]:
+    """rolling_std'nin mum mum hali (kayan Welford, O(1))"""
+    welford = RollingWelford(window)
+
+    def step(x: float) -> float:
+        welford.push(x)
+        return welford.std()
+    return step
+
+
+def sorted_window_step(window: int, statistic: Callable[[SortedWindow], float]) -> Callable[[float], float]:
+    """rolling_median / rolling_mad / rolling_quantile'in mum mum hali (SortedWindow, O(log w))"""
+    values = SortedWindow(window)
+
+    def step(x: float) -> float:
+        values.push(x)
+        return statistic(values)
+    return step
+
+
+def _window_stepper(spec: FeatureSpec) -> Callable:
+    """
+    Son `window` girdiyi tutup spec.func'u o pencerede calistirir
+
+    Tuple donduren ara degerlerde (pair_moments) her elemanin son degeri
+    aliniyor. Adim basina maliyet pencere boyunda.
+    """
+    buffers = [deque(maxlen=spec.window) for _ in spec.inputs]
+
+    def step(*args):
+        for buffer, value in zip(buffers, args):
+            buffer.append(value)
+        result = spec.func(*(np.array(buffer, dtype=np.float64) for buffer in buffers))
+        if isinstance(result, tuple):
+            return tuple(r[-1] for r in result)
+        return result[-1]
+    return step
+
+
+# -- Varsayilan kayit defteri -----------------------------------------------
+
+FEATURE_REGISTRY = FeatureRegistry()
+register_feature = FEATURE_REGISTRY.register
+
+
+# Ortak ara degerler (bir kez hesaplaniyor)
+
+@register_feature("candle_range", inputs=["high", "low"], intermediate=True)
+def _candle_range(high, low):
+    return high - low
+
+
+@register_feature("body_top", inputs=["open", "close"], intermediate=True)
+def _body_top(open_, close):
+    return np.maximum(open_, close)
+
+
+@register_feature("body_bottom", inputs=["open", "close"], intermediate=True)
+def _body_bottom(open_, close):
+    return np.minimum(open_, close)
+
+
+# Ozellikler (add_features'in eski isimleri ve formulleri)
+
+@register_feature("price_change", inputs=["close"], window=2, incremental=lambda: lag_diff_step(1))
+def _price_change(close):
+    return lag_diff(close, 1)
+
+
+@register_feature("price_pct_change", inputs=["close"], window=2, incremental=lambda: lag_pct_change_step(1))
+def _price_pct_change(close):
+    return lag_pct_change(close, 1)
+
+
+@register_feature("volume_change", inputs=["volume"], window=2, incremental=lambda: lag_pct_change_step(1))
+def _volume_change(volume):
+    return lag_pct_change(volume, 1)
+
+
+@register_feature("volatility", inputs=["close"], window=20, incremental=lambda: rolling_std_step(20))
+def _volatility(close):
+    return rolling_std(close, 20)
+
+
+@register_feature("price_momentum", inputs=["close"], window=15, incremental=lambda: lag_diff_step(14))
+def _price_momentum(close):
+    return lag_diff(close, 14)
+
+
+@register_feature("high_low_range", inputs=["candle_range"])
+def _high_low_range(candle_range):
+    return candle_range
+
+
+@register_feature("high_low_pct", inputs=["candle_range", "low"])
+def _high_low_pct(candle_range, low):
+    return (candle_range / low) * 100
+
+
+@register_feature("body_size", inputs=["close", "open"])
+def _body_size(close, open_):
+    return np.abs(close - open_)
+
+
+@register_feature("upper_shadow", inputs=["high", "body_top"])
+def _upper_shadow(high, body_top):
+    return high - body_top
+
+
+@register_feature("lower_shadow", inputs=["body_bottom", "low"])
+def _lower_shadow(body_bottom, low):
+    return body_bottom - low
+
+
+# Parametreli aileler: volatility_50, price_momentum_7, price_pct_change_5...
+
+FEATURE_REGISTRY.register_family(
+    "volatility",
+    lambda n: FeatureSpec(f"volatility_{n}", lambda close: rolling_std(close, n), ["close"], window=n,
+                          incremental=lambda: rolling_std_step(n))
+)
+FEATURE_REGISTRY.register_family(
+    "price_momentum",
+    lambda n: FeatureSpec(f"price_momentum_{n}", lambda close: lag_diff(close, n), ["close"], window=n + 1,
+                          incremental=lambda: lag_diff_step(n))
+)
+FEATURE_REGISTRY.register_family(
+    "price_pct_change",
+    lambda n: FeatureSpec(f"price_pct_change_{n}", lambda close: lag_pct_change(close, n), ["close"], window=n + 1,
+                          incremental=lambda: lag_pct_change_step(n))
+)
+
+# Saglam (robust) kayan istatistikler: rolling_median_500, rolling_mad_500,
+# rolling_q95_500 (yuzde 95 kantil), robust_zscore_500
+
+FEATURE_REGISTRY.register_family(
+    "rolling_median",
+    lambda n: FeatureSpec(f"rolling_median_{n}", lambda close: rolling_median(close, n), ["close"], window=n,
+                          incremental=lambda: sorted_window_step(n, SortedWindow.median))
+)
+FEATURE_REGISTRY.register_family(
+    "rolling_mad",
+    lambda n: FeatureSpec(f"rolling_mad_{n}", lambda close: rolling_mad(close, n), ["close"], window=n,
+                          incremental=lambda: sorted_window_step(n, SortedWindow.mad))
+)
+FEATURE_REGISTRY.register_pattern(
+    r"rolling_q(\d+)_(\d+)",
+    lambda p, n: FeatureSpec(
+        f"rolling_q{p}_{n}", lambda close: rolling_quantile(close, n, p / 100), ["close"], window=n,
+        incremental=lambda: sorted_window_step(n, lambda values: values.quantile(p / 100))
+    )
+)
+FEATURE_REGISTRY.register_family(
+    "robust_zscore",
+    lambda n: FeatureSpec(
+        f"robust_zscore_{n}",
+        robust_zscore,
+        ["close", f"rolling_median_{n}", f"rolling_mad_{n}"]
+    )
+)
+
+# Referans pariteye gore (cross_asset.py): rolling_corr_100, rolling_beta_100,
+# residual_return_100. Girdi olarak hizalanmis referans kapanisi (ref_close)
+# gerekiyor: DataProcessor.add_reference() veya PanelProcessor.add_features(reference=...)
+
+@register_feature("ref_pct_change", inputs=[REFERENCE_COLUMN], window=2, intermediate=True,
+                  incremental=lambda: lag_pct_change_step(1))
+def _ref_pct_change(ref_close):
+    return lag_pct_change(ref_close, 1)
+
+
+# Bes kayan toplam bir kez hesaplanip uc ozellik arasinda paylasiliyor
+FEATURE_REGISTRY.register_family(
+    "pair_moments",
+    lambda n: FeatureSpec(
+        f"pair_moments_{n}",
+        lambda x, y: rolling_pair_moments(x, y, n),
+        ["price_pct_change", "ref_pct_change"],
+        window=n,
+        intermediate=True
+    )
+)
+FEATURE_REGISTRY.register_family(
+    "rolling_corr",
+    lambda n: FeatureSpec(f"rolling_corr_{n}", rolling_correlation, [f"pair_moments_{n}"])
+)
+FEATURE_REGISTRY.register_family(
+    "rolling_beta",
+    lambda n: FeatureSpec(f"rolling_beta_{n}", rolling_beta, [f"pair_moments_{n}"])
+)
+FEATURE_REGISTRY.register_family(
+    "residual_return",
+    lambda n: FeatureSpec(
+        f"residual_return_{n}",
+        residual_return,
+        ["price_pct_change", "ref_pct_change", f"pair_moments_{n}"]
+    )
+)
@@ -0,0 +1,335 @@
+"""
+Ozellik Matrisi Istatistikleri (Paylasilan Baglam)
+
+detect_all_methods her yontemi ayni X uzerinde bagimsiz calistiriyordu:
+- StandardScaler ortalama/std hesapliyor (Isolation Forest icin)
+- detect_z_score np.mean / np.std'yi tekrar hesapliyor
+- detect_iqr her ozellik icin iki ayri np.percentile cagiriyor
+Her adim kendi X boyutunda gecici array'lerini de ayiriyordu.
+
+Bu modulde istatistikleri bir kez hesaplayip butun yontemlere
+veriyorum (FeatureStats):
+- Ortalama ve std: satir bloklari uzerinden tek geciste (Chan
+  birlestirmesi), gecici bellek blok boyu kadar
+- Ceyrekler: her sutun icin tek bir np.partition (butun kantillerin
+  komsu siralari ayni anda), np.percentile ile ayni lineer interpolasyon
+- Standartlastirilmis matris: ilk istendiginde bir kez hesaplaniyor,
+  Isolation Forest ve z-score ayni matrisi kullaniyor
+
+Walk-forward tespitte (walk_forward.py) pencere her adimda kayiyor;
+SlidingFeatureStats istatistikleri bastan hesaplamadan guncelliyor:
+cikan blogun momentleri geri aliniyor, sutunlar sirali tutuluyor.
+"""
+
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Momentler bu kadar satirlik bloklarla hesaplaniyor (gecici bellek siniri)
+STATS_BLOCK_ROWS = 65536
+
+
+def merge_moments(
+    count: int,
+    mean: np.ndarray,
+    m2: np.ndarray,
+    X: np.ndarray
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Yeni blogu ortalama / kare sapma toplamina ekler (Chan birlestirmesi)"""
+    n_b = len(X)
+    mean_b = X.mean(axis=0, dtype=np.float64)
+    deviation = X - mean_b
+    deviation *= deviation
+    m2_b = deviation.sum(axis=0)
+    total = count + n_b
+    delta = mean_b - mean
+    mean = mean + delta * (n_b / total)
+    m2 = m2 + m2_b + delta ** 2 * (count * n_b / total)
+    return total, mean, m2
+
+
+def remove_moments(
+    count: int,
+    mean: np.ndarray,
+    m2: np.ndarray,
+    X: np.ndarray
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Blogu ortalama / kare sapma toplamindan cikarir (merge_moments'in tersi)"""
+    n_b = len(X)
+    rest = count - n_b
+    if rest <= 0:
+        return 0, np.zeros_like(mean), np.zeros_like(m2)
+    mean_b = X.mean(axis=0, dtype=np.float64)
+    deviation = X - mean_b
+    deviation *= deviation
+    m2_b = deviation.sum(axis=0)
+    mean_rest = (mean * count - mean_b * n_b) / rest
+    delta = mean_b - mean_rest
+    m2 = m2 - m2_b - delta ** 2 * (rest * n_b / count)
+    return rest, mean_rest, np.maximum(m2, 0.0)
+
+
+def _lerp(low: np.ndarray, high: np.ndarray, fraction: float) -> np.ndarray:
+    """np.percentile'in lineer interpolasyonu (t >= 0.5'te ust uctan)"""
+    diff = high - low
+    if fraction >= 0.5:
+        return high - diff * (1 - fraction)
+    return low + diff * fraction
+
+
+class FeatureStats:
+    """
+    Bir ozellik matrisinin tek seferde hesaplanan istatistikleri
+
+    Nasil kullanilir:
+        stats = FeatureStats(X)
+        sonuclar = detector.detect_all_methods(X, stats=stats)
+        print(stats.mean, stats.std, stats.quantile(0.25))
+
+    Args:
+        X: Veri matrisi (n_samples, n_features)
+        quantiles: Hesaplanacak kantiller (0-1), varsayilan Q1 ve Q3
+
+    Attributes:
+        n_samples: Satir sayisi
+        mean: Ozellik ortalamalari
+        std: Ozellik standart sapmalari (ddof=0, np.std ile ayni)
+        quantiles: Kantil -> ozellik degerleri (sadece kullanilirsa hesaplaniyor)
+    """
+
+    def __init__(self, X: np.ndarray, quantiles: Sequence[float] = (0.25, 0.75)):
+        self.X = X
+        self.n_samples, n_features = X.shape
+
+        count, mean, m2 = 0, np.zeros(n_features), np.zeros(n_features)
+        for start in range(0, self.n_samples, STATS_BLOCK_ROWS):
+            count, mean, m2 = merge_moments(count, mean, m2, X[start:start + STATS_BLOCK_ROWS])
+        self.mean = mean
+        self.std = np.sqrt(m2 / count) if count else np.full(n_features, np.nan)
+
+        self._requested = tuple(quantiles)
+        self._quantiles: Optional[Dict[float, np.ndarray]] = None
+        self._standardized: Optional[np.ndarray] = None
+        # Paralel tespitte (parallel.py) ayni baglami birden cok thread
+        # kullaniyor; tembel hesaplar bir kez yapilsin
+        self._lock = threading.Lock()
+
+    def _partition_quantiles(self, X: np.ndarray, quantiles: Sequence[float]) -> Dict[float, np.ndarray]:
+        """
+        Butun kantiller icin her sutunda tek partition
+
+        Her kantil icin gereken iki komsu sira (floor ve floor + 1)
+        np.partition'a birlikte veriliyor; sutun basina bir kopya + bir
+        partition. NaN iceren sutunlarda np.percentile gibi NaN.
+        """
+        n = self.n_samples
+        out = {q: np.full(X.shape[1], np.nan) for q in quantiles}
+        if n == 0:
+            return out
+
+        positions = {q: q * (n - 1) for q in quantiles}
+        kth = sorted({min(int(p) + k, n - 1) for p in positions.values() for k in (0, 1)})
+
+        for j in range(X.shape[1]):
+            if np.isnan(self.mean[j]):
+                continue
+            column = np.array(X[:, j], dtype=np.float64)
+            column.partition(kth)
+            for q, position in positions.items():
+                below = int(position)
+                above = min(below + 1, n - 1)
+                out[q][j] = _lerp(column[below], column[above], position - below)
+        return out
+
+    @property
+    def quantiles(self) -> Dict[float, np.ndarray]:
+        """Kantil -> ozellik degerleri (ilk istendiginde hepsi birlikte hesaplaniyor)"""
+        with self._lock:
+            if self._quantiles is None:
+                if self.X is None:
+                    raise ValueError("release() sonrasi kantiller hesaplanamaz")
+                self._quantiles = self._partition_quantiles(self.X, self._requested)
+        return self._quantiles
+
+    def quantile(self, q: float) -> np.ndarray:
+        if q not in self._requested:
+            raise KeyError(f"{q} kantili istenmemis (istenenler: {list(self._requested)})")
+        return self.quantiles[q]
+
+    @property
+    def scale(self) -> np.ndarray:
+        """Standartlastirma boleni; sabit sutunlarda 1 (StandardScaler gibi)"""
+        return np.where(self.std > 0, self.std, 1.0)
+
+    def standardized(self) -> np.ndarray:
+        """
+        (X - ortalama) / std matrisi (ilk cagrida hesaplanip saklaniyor)
+
+        Tek bir float64 kopya ayriliyor, bolme yerinde yapiliyor.
+        Yontemler bu matrisi degistirmiyor.
+        """
+        with self._lock:
+            if self._standardized is None:
+                if self.X is None:
+                    raise ValueError("release() sonrasi standartlastirilmis matris hesaplanamaz")
+                Z = np.subtract(self.X, self.mean, dtype=np.float64)
+                Z /= self.scale
+                self._standardized = Z
+        return self._standardized
+
+    def release(self):
+        """X'i ve standartlastirilmis matrisi birakir (istatistikler kaliyor)"""
+        self.X = None
+        self._standardized = None
+
+    def to_dict(self) -> Dict:
+        """Ozet (JSON'a yazilabilir)"""
+        return {
+            'n_samples': int(self.n_samples),
+            'mean': self.mean.tolist(),
+            'std': self.std.tolist(),
+            'quantiles': {str(q): v.tolist() for q, v in (self._quantiles or {}).items()},
+        }
+
+
+class SlidingFeatureStats:
+    """
+    Kayan pencerenin istatistikleri, pencere kaydikca guncelleniyor
+
+    - Ortalama/std: cikan blok remove_moments ile geri aliniyor, giren
+      blok merge_moments ile ekleniyor. Hata birikmesin diye pencere
+      tamamen yenilendiginde momentler sirali sutunlardan yeniden
+      hesaplaniyor (RollingZScore'daki gibi).
+    - Kantiller: her sutun sirali tutuluyor; cikan degerler ikili aramayla
+      bulunup siliniyor, giren degerler sirali yerlerine ekleniyor.
+      Kantil sirali sutundan dogrudan okunuyor (np.percentile ile ayni).
+
+    Sirali sutunlar onceden ayrilmis tek bir (pencere, ozellik) tamponda
+    (sutun sirali, Fortran duzeni) yerinde guncelleniyor: her sutunda
+    kalan degerler pencere boyunda tek bir ara tampona sikistiriliyor ve
+    girenlerle birlikte ayni sutuna geri yaziliyor. Adim basina maliyet
+    pencere boyunda dogrusal; yeni (pencere, ozellik) kopyasi, sort veya
+    partition yok.
+
+    Nasil kullanilir:
+        stats = SlidingFeatureStats(X[:2880])
+        stats.slide(X[:96], X[2880:2976])     # pencere 96 satir kaydi
+        print(stats.mean, stats.std, stats.quantile(0.25))
+
+    Args:
+        X: Ilk pencere (n_samples, n_features), NaN icermemeli
+        quantiles: Okunacak kantiller (0-1)
+    """
+
+    def __init__(self, X: np.ndarray, quantiles: Sequence[float] = (0.25, 0.75)):
+        self._requested = tuple(quantiles)
+        self._buffer = np.asfortranarray(np.sort(np.asarray(X, dtype=np.float64), axis=0))
+        self._n = len(self._buffer)
+        # slide() icin sutun basina ara tampon ve maske (bir kez ayriliyor)
+        self._scratch = np.empty(len(self._buffer))
+        self._keep = np.empty(len(self._buffer), dtype=bool)
+        self._resync()
+
+    @property
+    def _sorted(self) -> np.ndarray:
+        """Pencerenin sirali sutunlari (tampondan view)"""
+        return self._buffer[:self._n]
+
+    def _resync(self):
+        """Momentleri sirali sutunlardan bastan hesaplar"""
+        count, mean, m2 = 0, np.zeros(self._sorted.shape[1]), np.zeros(self._sorted.shape[1])
+        for start in range(0, len(self._sorted), STATS_BLOCK_ROWS):
+            count, mean, m2 = merge_moments(count, mean, m2, self._sorted[start:start + STATS_BLOCK_ROWS])
+        self._count, self._mean, self._m2 = count, mean, m2
+        self._since_resync = 0
+
+    @property
+    def n_samples(self) -> int:
+        return self._n
+
+    def slide(self, leaving: np.ndarray, entering: np.ndarray):
+        """
+        Pencereden `leaving` satirlarini cikarip `entering` satirlarini ekler
+
+        Args:
+            leaving: Pencereden cikan satirlar (pencerede olmali)
+            entering: Pencereye giren satirlar
+        """
+        leaving = np.asarray(leaving, dtype=np.float64)
+        entering = np.asarray(entering, dtype=np.float64)
+
+        n, size = self._n, self._n - len(leaving) + len(entering)
+        if max(size, n) > len(self._buffer):
+            # Pencere buyuyorsa (normalde boy sabit) tamponu genisletiyorum
+            grown = np.empty((max(size, n), self._buffer.shape[1]), order='F')
+            grown[:n] = self._sorted
+            self._buffer = grown
+        if len(self._scratch) < len(self._buffer):
+            self._scratch = np.empty(len(self._buffer))
+            self._keep = np.empty(len(self._buffer), dtype=bool)
+
+        kept = n - len(leaving)
+        new_rank = np.arange(len(entering))
+        for j in range(self._buffer.shape[1]):
+            column = self._buffer[:, j]
+
+            # Cikanlar: kalanlar sirasini koruyarak ara tampona sikistiriliyor.
+            # Ayni degerden birden cok cikiyorsa ardisik sirada siliniyor.
+            keep = self._keep[:n]
+            keep[:] = True
+            if len(leaving):
+                old = np.sort(leaving[:, j])
+                rank = np.arange(len(old)) - np.searchsorted(old, old, side='left')
+                keep[np.searchsorted(column[:n], old, side='left') + rank] = False
+            rest = self._scratch[:kept]
+            np.compress(keep, column[:n], out=rest)
+
+            # Girenler: son konumlari (kalanlar arasindaki yer + kendi sirasi)
+            # bos birakilip kalanlar diger yerlere yaziliyor
+            if not len(entering):
+                column[:size] = rest
+                continue
+            new = np.sort(entering[:, j])
+            slots = np.searchsorted(rest, new, side='left') + new_rank
+            keep = self._keep[:size]
+            keep[:] = True
+            keep[slots] = False
+            column[:size][keep] = rest
+            column[slots] = new
+        self._n = size
+
+        self._since_resync += len(entering)
+        if self._since_resync >= self._n:
+            self._resync()
+            return
+        count, mean, m2 = remove_moments(self._count, self._mean, self._m2, leaving)
+        self._count, self._mean, self._m2 = merge_moments(count, mean, m2, entering)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._mean
+
+    @property
+    def std(self) -> np.ndarray:
+        """Standart sapma (ddof=0, np.std ile ayni)"""
+        if not self._count:
+            return np.full(len(self._mean), np.nan)
+        return np.sqrt(self._m2 / self._count)
+
+    @property
+    def scale(self) -> np.ndarray:
+        std = self.std
+        return np.where(std > 0, std, 1.0)
+
+    def quantile(self, q: float) -> np.ndarray:
+        if q not in self._requested:
+            raise KeyError(f"{q} kantili istenmemis (istenenler: {list(self._requested)})")
+        n = len(self._sorted)
+        if n == 0:
+            return np.full(self._sorted.shape[1], np.nan)
+        position = q * (n - 1)
+        below = int(position)
+        above = min(below + 1, n - 1)
+        return _lerp(self._sorted[below], self._sorted[above], position - below)
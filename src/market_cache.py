@@ -0,0 +1,207 @@
+"""
+Market Bilgisi Onbellegi
+
+fetch_ohlcv her cagrida load_markets() cagiriyordu. Binance'te bu birkac
+MB'lik bir indirme ve kisa cekimlerde suresinin cogunu bu aliyordu.
+Bu modulde market/sembol bilgisini diske yaziyorum ve belli bir sure (TTL)
+boyunca tekrar kullaniyorum.
+
+- Ayni process'teki butun DataFetcher'lar ayni ornegi (shared_market_cache)
+  ve dolayisiyla ayni bellek onbellegini kullaniyor
+- Farkli process'ler data/markets/<borsa>.json dosyasini paylasiyor
+- Bellek onbellegi ornege ait: farkli cache_dir'ler veya disaridan verilen
+  borsalar (ReplayExchange, hepsinin id'si 'replay') birbirinin kaydini gormuyor
+- Sembol kontrolu yerel bir set icinde arama oluyor
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from config import MARKET_CACHE_DIR, ExchangeConfig
+from rate_limiter import RetryPolicy, TokenBucket, get_rate_limiter
+
+
+class MarketCache:
+    """
+    Borsa market bilgisi icin TTL'li onbellek
+
+    Nasil kullanilir:
+        cache = MarketCache()
+        cache.load(exchange)          # Gerekirse indirir, yoksa diskten yukler
+        cache.has_symbol("binance", "BTC/USDT")
+
+    Args:
+        cache_dir: Disk onbellegi klasoru (None ise MARKET_CACHE_DIR)
+        ttl_seconds: Kayit kac saniye gecerli
+        persist: False ise sadece bellekte tutulur, diske yazilmaz/okunmaz
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl_seconds: Optional[int] = None,
+                 persist: bool = True):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else MARKET_CACHE_DIR
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else ExchangeConfig.MARKET_CACHE_TTL
+        self.persist = persist
+        self._memory: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self, exchange_id: str) -> Path:
+        return self.cache_dir / f"{exchange_id.lower()}.json"
+
+    def _is_fresh(self, entry: Optional[dict]) -> bool:
+        return entry is not None and (time.time() - entry['fetched_at']) < self.ttl_seconds
+
+    def get(self, exchange_id: str) -> Optional[dict]:
+        """
+        Gecerli (TTL'i dolmamis) kaydi doner
+
+        Once bellege, sonra diske bakiyorum. Baska bir process diski
+        guncellemisse yeni kaydi aliyorum.
+
+        Returns:
+            dict: {'fetched_at', 'markets', 'currencies', 'symbols'} veya None
+        """
+        key = exchange_id.lower()
+        entry = self._memory.get(key)
+        if self._is_fresh(entry):
+            return entry
+
+        entry = self._read_disk(key)
+        if self._is_fresh(entry):
+            with self._lock:
+                self._memory[key] = entry
+            return entry
+
+        return None
+
+    def _read_disk(self, exchange_id: str) -> Optional[dict]:
+        if not self.persist:
+            return None
+        path = self._cache_path(exchange_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry['symbols'] = frozenset(entry['markets'].keys())
+        return entry
+
+    def put(self, exchange_id: str, markets: dict, currencies: Optional[dict] = None) -> dict:
+        """Market bilgisini bellege ve diske yazar"""
+        key = exchange_id.lower()
+        entry = {
+            'fetched_at': time.time(),
+            'markets': markets,
+            'currencies': currencies or {},
+        }
+
+        if self.persist:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_path(key)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                # ccxt market sozlukleri duz tiplerden olusuyor, digerlerini str'e ceviriyorum
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+
+        entry['symbols'] = frozenset(markets.keys())
+        with self._lock:
+            self._memory[key] = entry
+        return entry
+
+    def invalidate(self, exchange_id: str):
+        """Bir borsanin kaydini bellekten ve diskten siler"""
+        key = exchange_id.lower()
+        with self._lock:
+            self._memory.pop(key, None)
+        path = self._cache_path(key)
+        if self.persist and path.exists():
+            path.unlink()
+
+    @staticmethod
+    def _request_policy(
+        exchange,
+        limiter: Optional[TokenBucket],
+        retry_policy: Optional[RetryPolicy]
+    ) -> Tuple[TokenBucket, RetryPolicy]:
+        """Indirme de borsanin paylasilan kovasindan (load_markets agirligi) ve retry'dan geciyor"""
+        limiter = limiter or get_rate_limiter(exchange.id, exchange.rateLimit)
+        retry_policy = retry_policy or RetryPolicy(max_retries=ExchangeConfig.MAX_RETRIES)
+        return limiter, retry_policy
+
+    def load(
+        self,
+        exchange,
+        force: bool = False,
+        limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ) -> FrozenSet[str]:
+        """
+        ccxt exchange nesnesine market bilgisini yukler
+
+        Onbellek gecerliyse indirme yapmadan set_markets() ile yukluyorum.
+        Boylece ccxt'nin kendi load_markets() cagrisi da indirme yapmiyor.
+        Indirme gerekirse fetch_ohlcv gibi rate limiter ve RetryPolicy'den
+        geciyor.
+
+        Args:
+            exchange: ccxt (sync) exchange nesnesi
+            force: True ise onbellegi yok sayip yeniden indirir
+            limiter: Borsanin kovasi (None ise get_rate_limiter)
+            retry_policy: Gecici hatalar icin (None ise varsayilan)
+
+        Returns:
+            frozenset: Borsadaki semboller
+        """
+        entry = None if force else self.get(exchange.id)
+        if entry is None:
+            limiter, retry_policy = self._request_policy(exchange, limiter, retry_policy)
+            markets = retry_policy.call(exchange, limiter, 'load_markets', reload=True)
+            entry = self.put(exchange.id, markets, getattr(exchange, 'currencies', None))
+        elif not exchange.markets:
+            exchange.set_markets(entry['markets'], entry['currencies'] or None)
+        return entry['symbols']
+
+    async def load_async(
+        self,
+        exchange,
+        force: bool = False,
+        limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ) -> FrozenSet[str]:
+        """load() metodunun ccxt.async_support exchange'leri icin karsiligi"""
+        entry = None if force else self.get(exchange.id)
+        if entry is None:
+            limiter, retry_policy = self._request_policy(exchange, limiter, retry_policy)
+            markets = await retry_policy.call_async(exchange, limiter, 'load_markets', reload=True)
+            entry = self.put(exchange.id, markets, getattr(exchange, 'currencies', None))
+        elif not exchange.markets:
+            exchange.set_markets(entry['markets'], entry['currencies'] or None)
+        return entry['symbols']
+
+    def symbols(self, exchange_id: str) -> FrozenSet[str]:
+        """Onbellekteki sembol setini doner (kayit yoksa bos set)"""
+        entry = self.get(exchange_id)
+        return entry['symbols'] if entry is not None else frozenset()
+
+    def has_symbol(self, exchange_id: str, symbol: str) -> bool:
+        """Sembol kontrolu: yerel set icinde arama"""
+        return symbol in self.symbols(exchange_id)
+
+
+_shared_cache: Optional[MarketCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_market_cache() -> MarketCache:
+    """Process icindeki butun DataFetcher'larin paylastigi varsayilan onbellek"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = MarketCache()
+        return _shared_cache
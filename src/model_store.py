@@ -0,0 +1,399 @@
+"""
+Isolation Forest Model Deposu
+
+detect_isolation_forest her calistirmada scaler'i ve modeli bastan
+egitiyor (fit_predict), sonra score_samples ile butun agaclari ikinci
+kez dolasiyordu. Zamanlanmis calistirmalar ve canli izleme her seferinde
+egitim maliyetini odemek zorunda degil.
+
+Bu modulde egitim ve puanlamayi ayiriyorum:
+- IsolationForestModel.train(): StandardScaler + IsolationForest bir kez
+  egitiliyor, agaclar duz (flat) array'lere cevriliyor
+- IsolationForestModel.predict(): agaclar tek geciste dolasiliyor, skor
+  score_samples ile ayni; etiket skor ve kayitli offset'ten cikiyor
+- ModelStore: modeli borsa/parite/timeframe bazinda .npy dosyalari olarak
+  sakliyor; yuklerken array'ler memory-map ile aciliyor (pickle yok,
+  yukleme maliyeti sadece meta.json okumak)
+
+Modelle birlikte ozellik semasi (sutun sirasi + ozellik formul surumu)
+kaydediliyor. Sema uyusmazsa model yuklenmiyor, yeniden egitilmesi
+gerekiyor.
+
+Dosya yapisi:
+    data/models/binance/BTC_USDT/15m/
+        feature.npy  threshold.npy  children.npy  leaf_value.npy
+        scaler_mean.npy  scaler_scale.npy
+        meta.json   <- sema, offset, agac sayisi, egitim bilgileri
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+from config import MODEL_DIR
+from feature_cache import CACHE_VERSION
+
+
+# Dosya bicimi degisirse eski modeller yuklenmesin diye meta'ya giriyor
+MODEL_FORMAT_VERSION = 1
+
+# Agaclar bu kadar satirlik bloklarla dolasiliyor (gecici bellek siniri)
+SCORE_BLOCK_ROWS = 1024
+
+_ARRAYS = ['feature', 'threshold', 'children', 'leaf_value', 'scaler_mean', 'scaler_scale']
+
+
+def _average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """
+    n ornekli bir agacta ortalama yol uzunlugu c(n)
+
+    sklearn.ensemble._iforest ile ayni formul (basarisiz BST aramasi).
+    """
+    n = np.asarray(n_samples, dtype=np.float64)
+    out = np.zeros_like(n)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
+
+
+def feature_schema(columns: List[str]) -> Dict:
+    """Modelin bekledigi girdi semasi (sutun sirasi + ozellik formul surumu)"""
+    return {
+        'format_version': MODEL_FORMAT_VERSION,
+        'feature_version': CACHE_VERSION,
+        'columns': list(columns),
+    }
+
+
+class IsolationForestModel:
+    """
+    Egitilmis scaler + Isolation Forest, duz array'ler halinde
+
+    Butun agaclarin dugumleri tek bir diziye ardarda konuyor; children
+    (dugum, 2) sol/sag cocuk. Yapraklar kendine donen dugum (iki cocugu
+    da kendisi), boylece butun noktalar max_depth adimda, dallanmadan
+    ayni anda indirilebiliyor. Her yaprakta
+    sklearn'deki yol uzunlugu katkisi (kenar sayisi + c(yapraktaki ornek))
+    onceden hesaplanmis.
+
+    Nasil kullanilir:
+        model = IsolationForestModel.train(X, columns=["price_pct_change"])
+        labels, scores = model.predict(X_yeni)
+
+    Attributes:
+        schema: feature_schema() ciktisi
+        offset: IsolationForest.offset_ (skor - offset < 0 ise anomali)
+        info: Egitim bilgileri (contamination, agac sayisi, ornek sayisi...)
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.children = arrays['children']
+        self.leaf_value = arrays['leaf_value']
+        self.scaler_mean = arrays['scaler_mean']
+        self.scaler_scale = arrays['scaler_scale']
+
+        self.schema = meta['schema']
+        self.offset = float(meta['offset'])
+        self.roots = np.asarray(meta['roots'], dtype=np.int32)
+        self.max_depth = int(meta['max_depth'])
+        self.denominator = float(meta['denominator'])
+        self.info = meta.get('info', {})
+
+    @property
+    def columns(self) -> List[str]:
+        return self.schema['columns']
+
+    @classmethod
+    def from_estimators(
+        cls,
+        scaler: StandardScaler,
+        model: IsolationForest,
+        columns: List[str],
+        info: Optional[Dict] = None
+    ) -> "IsolationForestModel":
+        """
+        Egitilmis sklearn nesnelerini duz array'lere cevirir
+
+        Args:
+            scaler: Egitilmis StandardScaler
+            model: Egitilmis IsolationForest (scaler ciktisiyla egitilmis)
+            columns: Girdi sutunlari (sirasiyla)
+            info: Meta'ya yazilacak ek bilgiler
+        """
+        if len(columns) != model.n_features_in_:
+            raise ValueError(f"{len(columns)} sutun verildi, model {model.n_features_in_} ozellikle egitilmis")
+
+        features, thresholds, children, leaf_values, roots = [], [], [], [], []
+        offset = 0
+        for estimator, subset in zip(model.estimators_, model.estimators_features_):
+            tree = estimator.tree_
+            n = tree.node_count
+            ids = np.arange(n)
+            is_leaf = tree.children_left == -1
+
+            # Dugum derinligi: cocuklarin numarasi ebeveynden buyuk
+            depth = np.zeros(n)
+            for node in range(n):
+                if not is_leaf[node]:
+                    depth[tree.children_left[node]] = depth[node] + 1
+                    depth[tree.children_right[node]] = depth[node] + 1
+
+            # Alt kume sutun numaralarini gercek sutun numarasina ceviriyorum
+            feature = np.where(is_leaf, 0, np.asarray(subset)[np.maximum(tree.feature, 0)])
+            features.append(feature)
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            children.append(np.stack([
+                np.where(is_leaf, ids, tree.children_left),
+                np.where(is_leaf, ids, tree.children_right),
+            ], axis=1) + offset)
+            leaf_values.append(np.where(
+                is_leaf, depth + _average_path_length(tree.n_node_samples), 0.0
+            ))
+            roots.append(offset)
+            offset += n
+
+        arrays = {
+            'feature': np.concatenate(features).astype(np.int32),
+            'threshold': np.concatenate(thresholds).astype(np.float64),
+            'children': np.concatenate(children).astype(np.int32),
+            'leaf_value': np.concatenate(leaf_values).astype(np.float64),
+            'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+            'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64),
+        }
+        meta = {
+            'schema': feature_schema(columns),
+            'offset': float(model.offset_),
+            'roots': roots,
+            'max_depth': max(int(e.tree_.max_depth) for e in model.estimators_),
+            'denominator': float(len(model.estimators_) * _average_path_length([model._max_samples])[0]),
+            'info': info or {},
+        }
+        return cls(arrays, meta)
+
+    @classmethod
+    def train(
+        cls,
+        X: np.ndarray,
+        columns: List[str],
+        contamination: float = 0.05,
+        n_estimators: int = 100,
+        random_state: int = 42,
+        n_jobs: int = -1
+    ) -> "IsolationForestModel":
+        """
+        Scaler ve Isolation Forest'i bir kez egitir
+
+        Args:
+            X: Egitim verisi (n_samples, n_features)
+            columns: X'in sutun isimleri (sema)
+            contamination: Beklenen anomali orani
+            n_estimators: Agac sayisi
+            random_state: Rastgelelik kontrolu
+            n_jobs: Egitimde kullanilacak cekirdek sayisi (-1: hepsi)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        scaler = StandardScaler().fit(X)
+        model = IsolationForest(
+            contamination=contamination,
+            n_estimators=n_estimators,
+            random_state=random_state,
+            n_jobs=n_jobs
+        ).fit(scaler.transform(X))
+
+        info = {
+            'contamination': contamination,
+            'n_estimators': n_estimators,
+            'random_state': random_state,
+            'n_samples': int(len(X)),
+        }
+        return cls.from_estimators(scaler, model, columns, info)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in _ARRAYS}
+
+    def meta(self) -> Dict:
+        return {
+            'schema': self.schema,
+            'offset': self.offset,
+            'roots': [int(r) for r in self.roots],
+            'max_depth': self.max_depth,
+            'denominator': self.denominator,
+            'info': self.info,
+        }
+
+    def check_columns(self, columns: List[str]):
+        """Girdi sutunlari semayla ayni sirada degilse hata verir"""
+        if list(columns) != self.columns:
+            raise ValueError(f"Model {self.columns} sutunlariyla egitilmis, verilen: {list(columns)}")
+
+    def _block_path_lengths(self, X: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Satir bloklari icin (baslangic, (blok, agac) yol uzunluklari)
+
+        sklearn gibi karsilastirmayi float32'ye cevrilmis girdiyle
+        yapiyorum; esikler float32 degerler arasindan secildigi icin
+        sonuc birebir ayni.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.scaler_mean):
+            raise ValueError(f"Model {len(self.scaler_mean)} ozellik bekliyor, {X.shape[1]} verildi")
+
+        width = X.shape[1]
+        children = self.children.reshape(-1)
+        for start in range(0, len(X), SCORE_BLOCK_ROWS):
+            block = X[start:start + SCORE_BLOCK_ROWS]
+            scaled = ((block - self.scaler_mean) / self.scaler_scale).astype(np.float32).reshape(-1)
+
+            # Satir x agac dugum numaralari; her adimda (dugum, sag mi)
+            # ciftinden cocuk tek bir duz index'le okunuyor
+            row_offset = (np.arange(len(block), dtype=np.int32) * width)[:, None]
+            node = np.broadcast_to(self.roots, (len(block), len(self.roots)))
+            for _ in range(self.max_depth):
+                go_right = scaled[row_offset + self.feature[node]] > self.threshold[node]
+                node = children[2 * node + go_right]
+
+            yield start, self.leaf_value[node]
+
+    def path_lengths(self, X: np.ndarray) -> np.ndarray:
+        """
+        Her satirin her agactaki yol uzunlugu (kenar sayisi + c(yapraktaki ornek))
+
+        Returns:
+            numpy array: (n_samples, n_trees)
+        """
+        blocks = [lengths for _, lengths in self._block_path_lengths(X)]
+        return np.concatenate(blocks) if blocks else np.empty((0, len(self.roots)))
+
+    def path_length_sums(self, X: np.ndarray) -> np.ndarray:
+        """Her satirin butun agaclardaki yol uzunluklari toplami"""
+        X = np.asarray(X)
+        sums = np.empty(1 if X.ndim == 1 else len(X))
+        for start, lengths in self._block_path_lengths(X):
+            sums[start:start + len(lengths)] = lengths.sum(axis=1)
+        return sums
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """IsolationForest.score_samples ile ayni skor (kucuk = daha anormal)"""
+        depths = self.path_length_sums(X)
+        return -np.exp2(-depths / self.denominator) if self.denominator else np.full(len(depths), -1.0)
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tek geciste etiket ve skor
+
+        Returns:
+            tuple: (etiketler, skorlar). Etiket 1: normal, -1: anomali
+        """
+        scores = self.score_samples(X)
+        return np.where(scores - self.offset < 0, -1, 1), scores
+
+
+class ModelStore:
+    """
+    Egitilmis modelleri borsa/parite/timeframe bazinda saklayan depo
+
+    Nasil kullanilir:
+        store = ModelStore()
+        model = store.load("binance", "BTC/USDT", "15m", columns=sutunlar)
+        if model is None:
+            model = IsolationForestModel.train(X, columns=sutunlar)
+            store.save("binance", "BTC/USDT", "15m", model)
+        labels, scores = model.predict(X_yeni)
+
+    Args:
+        root_dir: Depo klasoru (varsayilan data/models)
+    """
+
+    def __init__(self, root_dir: Optional[Path] = None):
+        self.root_dir = Path(root_dir) if root_dir is not None else MODEL_DIR
+
+    def _model_dir(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return self.root_dir / exchange.lower() / safe_symbol / timeframe
+
+    def save(self, exchange: str, symbol: str, timeframe: str, model: IsolationForestModel):
+        """
+        Modeli kaydeder (varsa ustune yazar)
+
+        Once array'leri, en son meta.json'u yaziyorum; yarim kalan yazma
+        load() tarafinda eski/eksik meta olarak gorunuyor.
+        """
+        model_dir = self._model_dir(exchange, symbol, timeframe)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        meta_path = model_dir / "meta.json"
+        if meta_path.exists():
+            meta_path.unlink()
+
+        for name, arr in model.arrays().items():
+            tmp_path = model_dir / f"{name}.npy.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(arr))
+            os.replace(tmp_path, model_dir / f"{name}.npy")
+
+        tmp_meta = model_dir / f"meta.json.{os.getpid()}.tmp"
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(model.meta(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+
+        print(f"Model kaydedildi: {exchange.lower()} {symbol} {timeframe} "
+              f"({model.info.get('n_estimators', len(model.roots))} agac)")
+
+    def load(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        columns: Optional[List[str]] = None
+    ) -> Optional[IsolationForestModel]:
+        """
+        Kayitli modeli memory-map ile acar
+
+        Args:
+            columns: Beklenen girdi sutunlari; verilirse sema ayni olmali
+
+        Returns:
+            IsolationForestModel veya None (yok, bozuk ya da sema farkli)
+        """
+        model_dir = self._model_dir(exchange, symbol, timeframe)
+        try:
+            with open(model_dir / "meta.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        schema = meta.get('schema', {})
+        if schema.get('format_version') != MODEL_FORMAT_VERSION or schema.get('feature_version') != CACHE_VERSION:
+            print(f"Kayitli model eski surumde, yeniden egitilecek: {symbol} {timeframe}")
+            return None
+        if columns is not None and schema.get('columns') != list(columns):
+            print(f"Kayitli model farkli sutunlarla egitilmis ({schema.get('columns')}), yeniden egitilecek")
+            return None
+
+        try:
+            arrays = {name: np.load(model_dir / f"{name}.npy", mmap_mode='r') for name in _ARRAYS}
+            model = IsolationForestModel(arrays, meta)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        print(f"Kayitli model kullanildi: {exchange.lower()} {symbol} {timeframe}")
+        return model
+
+    def clear(self, exchange: str, symbol: str, timeframe: str):
+        """Bir parite/timeframe'in kayitli modelini siler"""
+        model_dir = self._model_dir(exchange, symbol, timeframe)
+        if not model_dir.exists():
+            return
+        for path in model_dir.iterdir():
+            path.unlink()
+        model_dir.rmdir()
@@ -0,0 +1,562 @@
+"""
+Akan Veri (Online) Dedektorleri
+
+detect_z_score ve detect_iqr ortalama/std ve ceyrekleri her cagrida
+butun dizi uzerinden hesapliyor; tek bir yeni mumu puanlamak butun
+gecmisi bir kez dolasmak demek. detect_isolation_forest ise modeli
+her seferinde bastan egitiyor.
+
+Bu modulde ayni yontemlerin akan veri karsiliklarini yaziyorum. Hepsi
+ayni arayuzu kullaniyor: update(x) -> (etiket, skor)
+- RollingZScore: kayan pencereli Welford (ortalama + M2), adim basina O(1)
+- EWZScore: ustel agirlikli ortalama ve varyans, adim basina O(1)
+- RollingIQR: her ozellik icin sirali pencere (SortedWindow), ceyrekler
+  ikili aramayla O(log w)
+- HalfSpaceTrees: Isolation Forest'in akan veri karsiligi (Tan vd. 2011).
+  Agaclar veriye bakmadan rastgele kuruluyor, sadece dugumlerdeki kutle
+  sayaclari guncelleniyor: adim basina O(agac * derinlik)
+
+Her nokta once mevcut duruma gore puanlaniyor, sonra duruma ekleniyor
+(nokta kendi referansina girmiyor, score_latest ile ayni mantik).
+Etiketler toplu yontemlerle ayni: 1 normal, -1 anomali. Isinma
+bitene kadar (yeterli gecmis yok) sonuc (1, nan).
+"""
+
+import math
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from config import AnomalyConfig
+from rolling_stats import SortedWindow
+
+
+class OnlineDetector:
+    """
+    Akan veri dedektorlerinin ortak arayuzu
+
+    Alt siniflar sadece update()'i yaziyor; update_many() varsayilan
+    olarak noktalari sirayla update()'e veriyor.
+
+    Nasil kullanilir:
+        detector = RollingZScore(window=500, threshold=3.0)
+        for x in akan_veri:
+            label, score = detector.update(x)
+    """
+
+    # Skor yonu: True ise buyuk skor daha anormal (z, iqr), False ise
+    # kucuk skor daha anormal (isolation_forest score_samples gibi)
+    higher_is_anomalous = True
+
+    def update(self, x: Union[float, np.ndarray]) -> Tuple[int, float]:
+        """
+        Yeni noktayi puanlar ve duruma ekler
+
+        Args:
+            x: Tek ozellik icin sayi, cok ozellik icin (n_features,) array
+
+        Returns:
+            tuple: (etiket, skor). Etiket 1: normal, -1: anomali
+        """
+        raise NotImplementedError
+
+    def update_many(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Noktalari sirayla isler (her biri update() ile ayni sonucu verir)
+
+        Args:
+            X: (n_samples,) veya (n_samples, n_features)
+
+        Returns:
+            tuple: (etiketler, skorlar)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        labels = np.ones(len(X), dtype=int)
+        scores = np.empty(len(X))
+        for i in range(len(X)):
+            labels[i], scores[i] = self.update(X[i])
+        return labels, scores
+
+
+def _as_row(x: Union[float, np.ndarray]) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64).reshape(-1)
+
+
+class RollingZScore(OnlineDetector):
+    """
+    Kayan pencereli z-score
+
+    Her ozellik icin son `window` noktanin ortalamasi ve std'si (ddof=0,
+    detect_z_score ile ayni) kayan Welford ile tutuluyor. Cikan noktanin
+    katkisi geri aliniyor; kayan toplamlarda hata birikmesin diye her
+    `window` adimda bir pencere bastan hesaplaniyor.
+
+    Args:
+        window: Pencere boyu
+        threshold: Z-score esigi
+        min_periods: Puanlamaya baslamak icin gereken nokta sayisi
+    """
+
+    def __init__(self, window: int = 500, threshold: float = 3.0, min_periods: int = 30):
+        if window < 2:
+            raise ValueError("window en az 2 olmali")
+        self.window = window
+        self.threshold = threshold
+        self.min_periods = min(max(min_periods, 2), window)
+
+        self._values: Optional[np.ndarray] = None
+        self._pos = 0
+        self.n = 0
+        self.mean: Optional[np.ndarray] = None
+        self.m2: Optional[np.ndarray] = None
+        self._since_resync = 0
+
+    def _init_state(self, width: int):
+        self._values = np.empty((self.window, width))
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+
+    def _resync(self):
+        values = self._values[:self.n]
+        self.mean = values.mean(axis=0)
+        self.m2 = ((values - self.mean) ** 2).sum(axis=0)
+        self._since_resync = 0
+
+    def score(self, x: np.ndarray) -> float:
+        """Noktanin mevcut penceredeki en buyuk |z| degeri (duruma eklemeden)"""
+        if self.n < self.min_periods:
+            return math.nan
+        std = np.sqrt(np.maximum(self.m2, 0.0) / self.n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.abs(x - self.mean) / std
+        # Sabit ozellikte (std = 0) z tanimsiz, o ozellik oy vermiyor
+        z[~np.isfinite(z)] = 0.0
+        return float(z.max())
+
+    def update(self, x: Union[float, np.ndarray]) -> Tuple[int, float]:
+        x = _as_row(x)
+        if np.isnan(x).any():
+            return 1, math.nan
+        if self._values is None:
+            self._init_state(len(x))
+
+        z = self.score(x)
+        label = -1 if z > self.threshold else 1
+
+        if self.n == self.window:
+            # Cikan noktayi Welford'dan geri al, yerine yenisini koy
+            old = self._values[self._pos].copy()
+            delta = x - old
+            old_mean = self.mean
+            self.mean = old_mean + delta / self.n
+            self.m2 = self.m2 + delta * (x - self.mean + old - old_mean)
+        else:
+            self.n += 1
+            delta = x - self.mean
+            self.mean = self.mean + delta / self.n
+            self.m2 = self.m2 + delta * (x - self.mean)
+        self._values[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+
+        return label, z
+
+
+class EWZScore(OnlineDetector):
+    """
+    Ustel agirlikli (exponentially weighted) z-score
+
+    Pencere tutmuyor: ortalama ve varyans her noktada
+    mean += alpha * d, var = (1 - alpha) * (var + alpha * d^2)
+    ile guncelleniyor (d = x - onceki ortalama). Eski noktalarin etkisi
+    yari omur (halflife) kadar adimda yariya iniyor.
+
+    Args:
+        halflife: Yari omur (mum sayisi); alpha verilmezse kullanilir
+        threshold: Z-score esigi
+        alpha: Dogrudan agirlik (0-1)
+        min_periods: Puanlamaya baslamak icin gereken nokta sayisi
+    """
+
+    def __init__(
+        self,
+        halflife: float = 100.0,
+        threshold: float = 3.0,
+        alpha: Optional[float] = None,
+        min_periods: int = 30
+    ):
+        if alpha is None:
+            alpha = 1.0 - math.exp(math.log(0.5) / halflife)
+        if not 0.0 < alpha < 1.0:
+            raise ValueError("alpha 0 ile 1 arasinda olmali")
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_periods = max(min_periods, 2)
+
+        self.n = 0
+        self.mean: Optional[np.ndarray] = None
+        self.var: Optional[np.ndarray] = None
+
+    def update(self, x: Union[float, np.ndarray]) -> Tuple[int, float]:
+        x = _as_row(x)
+        if np.isnan(x).any():
+            return 1, math.nan
+        if self.mean is None:
+            self.mean = x.copy()
+            self.var = np.zeros_like(x)
+            self.n = 1
+            return 1, math.nan
+
+        delta = x - self.mean
+        z = math.nan
+        if self.n >= self.min_periods:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                zs = np.abs(delta) / np.sqrt(self.var)
+            zs[~np.isfinite(zs)] = 0.0
+            z = float(zs.max())
+
+        increment = self.alpha * delta
+        self.mean = self.mean + increment
+        self.var = (1.0 - self.alpha) * (self.var + delta * increment)
+        self.n += 1
+
+        return (-1 if z > self.threshold else 1), z
+
+
+class RollingIQR(OnlineDetector):
+    """
+    Kayan pencereli IQR
+
+    Her ozellik icin son `window` nokta SortedWindow'da sirali tutuluyor:
+    eklemek/cikarmak ikili aramayla, Q1 ve Q3 sirali listeden dogrudan
+    okunuyor (np.percentile ile ayni lineer interpolasyon). Skor
+    detect_iqr ile ayni: sinirdan uzaklik / IQR (ozellikler arasinda en
+    buyugu).
+
+    Args:
+        window: Pencere boyu
+        multiplier: IQR carpani
+        min_periods: Puanlamaya baslamak icin gereken nokta sayisi
+    """
+
+    def __init__(self, window: int = 500, multiplier: float = 1.5, min_periods: int = 30):
+        self.window = window
+        self.multiplier = multiplier
+        self.min_periods = min(max(min_periods, 2), window)
+        self._windows = None
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Mevcut pencerenin (alt sinir, ust sinir, IQR) degerleri"""
+        q1 = np.array([w.quantile(0.25) for w in self._windows])
+        q3 = np.array([w.quantile(0.75) for w in self._windows])
+        iqr = q3 - q1
+        return q1 - self.multiplier * iqr, q3 + self.multiplier * iqr, iqr
+
+    def update(self, x: Union[float, np.ndarray]) -> Tuple[int, float]:
+        x = _as_row(x)
+        if np.isnan(x).any():
+            return 1, math.nan
+        if self._windows is None:
+            self._windows = [SortedWindow(self.window) for _ in range(len(x))]
+
+        label, score = 1, math.nan
+        if len(self._windows[0]) >= self.min_periods:
+            lower, upper, iqr = self.bounds()
+            distance = np.maximum(lower - x, 0) + np.maximum(x - upper, 0)
+            if (distance > 0).any():
+                label = -1
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = distance / iqr
+            # IQR = 0 olan ozellikte sinir disi her nokta sonsuz uzak
+            ratio[np.isnan(ratio)] = 0.0
+            score = float(ratio.max())
+
+        for window, value in zip(self._windows, x):
+            window.push(float(value))
+        return label, score
+
+
+class HalfSpaceTrees(OnlineDetector):
+    """
+    Half-Space Trees: Isolation Forest'in akan veri karsiligi
+
+    Her agac tam dolu bir ikili agac: her dugum rastgele bir ozelligi
+    kendi araliginin ortasindan ikiye boluyor. Araliklar ilk `window`
+    noktanin min/max'indan rastgele genisletilerek bir kez seciliyor;
+    agaclar bir daha degismiyor. Ogrenilen tek sey dugumlerdeki kutle
+    (kac nokta o yari uzaya dustu):
+    - referans kutle (r): bir onceki pencerede sayilan
+    - son kutle (l): bu pencerede sayilan
+    Her `window` noktada l referans oluyor ve sifirlaniyor.
+
+    Skor: her agacta noktanin indigi yol boyunca, kutlesi size_limit'in
+    altina dusen ilk dugumdeki (veya yapraktaki) r * 2^derinlik; agaclar
+    toplaniyor. Seyrek bolgedeki nokta az kutle gorur, yani KUCUK skor
+    daha anormal (isolation_forest score_samples ile ayni yon).
+
+    Esik: son `window` skorun contamination kantili. Nokta bu kantilin
+    altindaysa anomali.
+
+    Dugumler dizilerde heap sirasinda tutuluyor (cocuklar 2i+1, 2i+2);
+    bir noktayi butun agaclarda ayni anda derinlik adimi kadar fancy
+    index ile indiriyorum.
+
+    Args:
+        n_trees: Agac sayisi
+        depth: Agac derinligi
+        window: Kutle penceresi (ve isinma) boyu
+        contamination: Beklenen anomali orani (esik kantili)
+        size_limit: Puanlamada inilecek en kucuk kutle (varsayilan window * 0.1)
+        limits: (min, max) ozellik araliklari; verilmezse isinmadan
+        random_state: Rastgelelik kontrolu
+    """
+
+    higher_is_anomalous = False
+
+    def __init__(
+        self,
+        n_trees: int = 25,
+        depth: int = 15,
+        window: int = 250,
+        contamination: float = 0.05,
+        size_limit: Optional[float] = None,
+        limits: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        random_state: int = 42
+    ):
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window = window
+        self.contamination = contamination
+        self.size_limit = window * 0.1 if size_limit is None else size_limit
+        self.limits = limits
+        self.random_state = random_state
+
+        self._warmup = []
+        self._built = False
+        self._count = 0
+        self._recent_scores = SortedWindow(window)
+
+        n_nodes = 2 ** (depth + 1) - 1
+        self._trees = np.arange(n_trees)[:, None]
+        # Dugum derinligine gore 2^k agirligi (yol ustundeki k. dugum)
+        self._depth_weight = 2.0 ** np.arange(depth + 1)
+        self.reference_mass = np.zeros((n_trees, n_nodes))
+        self.latest_mass = np.zeros((n_trees, n_nodes))
+
+    def _build(self, low: np.ndarray, high: np.ndarray):
+        """Rastgele yari uzay agaclarini kurar (veriye bakmadan)"""
+        rng = np.random.default_rng(self.random_state)
+        width = len(low)
+        n_internal = 2 ** self.depth - 1
+        self.split_feature = np.empty((self.n_trees, n_internal), dtype=np.intp)
+        self.split_value = np.empty((self.n_trees, n_internal))
+
+        for t in range(self.n_trees):
+            # Calisma alani: rastgele bir s noktasi etrafinda araligin iki kati
+            span = np.where(high > low, high - low, 1.0)
+            s = low + rng.random(width) * span
+            reach = 2 * np.maximum(s - low, high - s)
+            reach[reach == 0] = 1.0
+            node_low = (s - reach)[None]
+            node_high = (s + reach)[None]
+
+            # Seviye seviye: k. seviyedeki 2^k dugum ayni anda bolunuyor,
+            # cocuklarin araliklari ebeveynin araligindan kopyalaniyor
+            for k in range(self.depth):
+                first, count = 2 ** k - 1, 2 ** k
+                rows = np.arange(count)
+                q = rng.integers(0, width, size=count)
+                mid = (node_low[rows, q] + node_high[rows, q]) * 0.5
+                self.split_feature[t, first:first + count] = q
+                self.split_value[t, first:first + count] = mid
+
+                node_low = np.repeat(node_low, 2, axis=0)
+                node_high = np.repeat(node_high, 2, axis=0)
+                node_high[2 * rows, q] = mid
+                node_low[2 * rows + 1, q] = mid
+
+        n_nodes = self.reference_mass.shape[1]
+        self._tree_index = np.arange(self.n_trees)
+        self._internal_offset = self._tree_index * n_internal
+        self._node_offset = self._tree_index * n_nodes
+        self._flat_feature = self.split_feature.ravel()
+        self._flat_value = self.split_value.ravel()
+        self._built = True
+
+    def _paths(self, X: np.ndarray) -> np.ndarray:
+        """
+        Noktalarin her agactaki yolu
+
+        Args:
+            X: (n_samples, n_features)
+
+        Returns:
+            numpy array: (n_samples, n_trees, depth + 1) dugum numaralari
+        """
+        n = len(X)
+        paths = np.zeros((n, self.n_trees, self.depth + 1), dtype=np.intp)
+        node = np.zeros((n, self.n_trees), dtype=np.intp)
+        rows = np.arange(n)[:, None]
+        for k in range(self.depth):
+            feature = self.split_feature[self._trees.T, node]
+            go_right = X[rows, feature] > self.split_value[self._trees.T, node]
+            node = 2 * node + 1 + go_right
+            paths[:, :, k + 1] = node
+        return paths
+
+    def _mass_scores(self, paths: np.ndarray) -> np.ndarray:
+        """Yollardan kutle skoru (referans kutleye gore)"""
+        mass = self.reference_mass[self._trees.T[..., None], paths]
+        # Kutlesi size_limit'in altina dusen ilk dugum (yoksa yaprak)
+        small = mass <= self.size_limit
+        small[..., -1] = True
+        stop = small.argmax(axis=-1)
+        picked = np.take_along_axis(mass, stop[..., None], axis=-1)[..., 0]
+        return (picked * self._depth_weight[stop]).sum(axis=-1)
+
+    def _add_mass(self, paths: np.ndarray):
+        trees = np.broadcast_to(self._trees[None], paths.shape)
+        np.add.at(self.latest_mass, (trees.ravel(), paths.ravel()), 1.0)
+
+    def _end_window(self):
+        self.reference_mass, self.latest_mass = self.latest_mass, self.reference_mass
+        self.latest_mass.fill(0.0)
+
+    def _finish_warmup(self):
+        X = np.array(self._warmup)
+        self._warmup = []
+        if self.limits is not None:
+            low, high = (np.asarray(v, dtype=np.float64).reshape(-1) for v in self.limits)
+        else:
+            low, high = X.min(axis=0), X.max(axis=0)
+        self._build(low, high)
+        self._add_mass(self._paths(X))
+        self._end_window()
+        self._count = 0
+
+    def _label(self, score: float) -> int:
+        label = 1
+        if len(self._recent_scores) >= self.window // 2:
+            if score < self._recent_scores.quantile(self.contamination):
+                label = -1
+        self._recent_scores.push(score)
+        return label
+
+    def update(self, x: Union[float, np.ndarray]) -> Tuple[int, float]:
+        x = _as_row(x)
+        if np.isnan(x).any():
+            return 1, math.nan
+
+        if not self._built:
+            self._warmup.append(x)
+            if len(self._warmup) == self.window:
+                self._finish_warmup()
+            return 1, math.nan
+
+        # Tek nokta icin _paths/_mass_scores'un duz (ravel) index'li hali:
+        # nokta basina numpy cagrisi sayisi yariya iniyor
+        node = np.zeros(self.n_trees, dtype=np.intp)
+        path = np.empty((self.n_trees, self.depth + 1), dtype=np.intp)
+        path[:, 0] = self._node_offset
+        for k in range(self.depth):
+            flat = self._internal_offset + node
+            node = 2 * node + 1 + (x[self._flat_feature[flat]] > self._flat_value[flat])
+            path[:, k + 1] = self._node_offset + node
+
+        mass = self.reference_mass.ravel()[path]
+        small = mass <= self.size_limit
+        small[:, -1] = True
+        stop = small.argmax(axis=1)
+        score = float(mass[self._tree_index, stop] @ self._depth_weight[stop])
+        label = self._label(score)
+
+        # Bir agacin yolunda ayni dugum iki kez yok, add.at gerekmiyor
+        self.latest_mass.ravel()[path] += 1.0
+        self._count += 1
+        if self._count == self.window:
+            self._end_window()
+            self._count = 0
+        return label, score
+
+    def update_many(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        update() ile ayni sonuc, pencere pencere vektorel
+
+        Bir pencere icinde referans kutle sabit, yani pencerenin butun
+        noktalari tek seferde indirilip puanlanabiliyor. Sadece esik
+        (son skorlarin kantili) sirayla ilerliyor.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        labels = np.ones(len(X), dtype=int)
+        scores = np.full(len(X), np.nan)
+        valid = ~np.isnan(X).any(axis=1)
+
+        i = 0
+        while i < len(X):
+            if not self._built or not valid[i]:
+                labels[i], scores[i] = self.update(X[i])
+                i += 1
+                continue
+
+            # Sonraki pencere sinirina veya ilk eksik satira kadar
+            end = min(i + self.window - self._count, len(X))
+            gaps = np.flatnonzero(~valid[i:end])
+            if len(gaps):
+                end = i + gaps[0]
+
+            paths = self._paths(X[i:end])
+            block_scores = self._mass_scores(paths)
+            for j, score in enumerate(block_scores):
+                labels[i + j] = self._label(float(score))
+            scores[i:end] = block_scores
+
+            self._add_mass(paths)
+            self._count += end - i
+            if self._count == self.window:
+                self._end_window()
+                self._count = 0
+            i = end
+
+        return labels, scores
+
+
+# Isimle secim (make_online_detector)
+ONLINE_DETECTORS: Dict[str, type] = {
+    "rolling_z_score": RollingZScore,
+    "ew_z_score": EWZScore,
+    "rolling_iqr": RollingIQR,
+    "half_space_trees": HalfSpaceTrees,
+}
+
+
+def make_online_detector(name: str, **kwargs) -> OnlineDetector:
+    """
+    Ismi verilen online dedektoru AnomalyConfig ayarlariyla olusturur
+
+    Args:
+        name: ONLINE_DETECTORS'daki isim
+        **kwargs: Varsayilanlari ezen parametreler
+    """
+    if name not in ONLINE_DETECTORS:
+        raise ValueError(f"Bilinmeyen online dedektor: {name} (secenekler: {list(ONLINE_DETECTORS)})")
+
+    defaults = {
+        "rolling_z_score": {'window': AnomalyConfig.ONLINE_WINDOW,
+                            'threshold': AnomalyConfig.Z_SCORE_THRESHOLD},
+        "ew_z_score": {'halflife': AnomalyConfig.ONLINE_WINDOW / 5,
+                       'threshold': AnomalyConfig.Z_SCORE_THRESHOLD},
+        "rolling_iqr": {'window': AnomalyConfig.ONLINE_WINDOW,
+                        'multiplier': AnomalyConfig.IQR_MULTIPLIER},
+        "half_space_trees": {'n_trees': AnomalyConfig.HST_TREES,
+                             'depth': AnomalyConfig.HST_DEPTH,
+                             'window': AnomalyConfig.ONLINE_WINDOW,
+                             'contamination': AnomalyConfig.CONTAMINATION,
+                             'random_state': AnomalyConfig.RANDOM_STATE},
+    }[name]
+    defaults.update(kwargs)
+    return ONLINE_DETECTORS[name](**defaults)
@@ -0,0 +1,313 @@
+"""
+Coklu Parite (Panel) Ozellik Hesabi
+
+DataProcessor tek bir paritenin DataFrame'ini isliyor. 300 pariteyi
+islemek icin 300 processor kurup ozellik kodunu 300 kez calistirmak
+gerekiyordu.
+
+Bu modulde butun pariteleri ortak bir zaman ekseninde, tek bir ardisik
+(zaman x parite x alan) array'inde tutuyorum:
+- Ozellikler (DataConfig.FEATURES) butun pariteler icin tek geciste,
+  (T, parite) array'leri uzerinde vektorel hesaplaniyor
+- Sonradan listelenen paritelerin baslangici NaN; NaN'lar ozelliklere
+  tek parite islenmis gibi yayiliyor (ilk satirlar NaN, sonra normal)
+- Dedektore parite bazinda veya butun pariteler alt alta (stacked)
+  matrisler kopyalanmadan (view olarak) veriliyor
+
+Ornek:
+    frames = fetch_many_ohlcv(["BTC/USDT", "ETH/USDT"], "binance", "15m", days_back=7)
+    panel = PanelProcessor.from_frames(frames)
+    panel.clean_data()
+    panel.add_features()
+    X, zamanlar = panel.symbol_matrix("ETH/USDT")
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config import DataConfig
+from cross_asset import REFERENCE_COLUMN
+from data_processor import RAW_COLUMNS
+from data_quality import candle_columns
+from feature_registry import FEATURE_REGISTRY, FeatureRegistry
+
+
+class PanelProcessor:
+    """
+    Bircok pariteyi ortak zaman ekseninde tutan processor
+
+    Attributes:
+        timestamps: (T,) int64 ms, butun paritelerin zamanlarinin birlesimi
+        symbols: Parite isimleri (eksen 1 sirasi)
+        values: (T, parite, alan) ham OHLCV (alanlar RAW_COLUMNS sirasinda)
+        features: (T, parite, ozellik) add_features() sonrasi
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        symbols: List[str],
+        values: np.ndarray,
+        dtype: Optional[str] = None
+    ):
+        """
+        Args:
+            timestamps: (T,) artan int64 ms zaman damgalari
+            symbols: Parite isimleri
+            values: (T, len(symbols), 5) open, high, low, close, volume
+            dtype: Fiyat ve ozelliklerin tipi (None ise values'un tipi)
+        """
+        values = np.ascontiguousarray(values, dtype=dtype or values.dtype)
+        if values.shape != (len(timestamps), len(symbols), len(RAW_COLUMNS)):
+            raise ValueError(
+                f"values boyutu (T, parite, {len(RAW_COLUMNS)}) olmali, {values.shape} geldi"
+            )
+
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.symbols = list(symbols)
+        self.values = values
+        self.features: Optional[np.ndarray] = None
+        self.feature_names: List[str] = []
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, Union[pd.DataFrame, Dict[str, np.ndarray]]],
+        dtype: Optional[str] = None
+    ) -> "PanelProcessor":
+        """
+        Parite -> DataFrame sozlugunden panel kurar (fetch_many ciktisi)
+
+        Ortak zaman ekseni butun zamanlarin birlesimi. Paritenin olmadigi
+        zamanlar (listelenmeden once, bosluklar) NaN kaliyor. Ayni zamanda
+        birden fazla mum varsa ilki kaliyor.
+        """
+        symbols = list(frames)
+        columns = [candle_columns(frames[symbol]) for symbol in symbols]
+        if not columns:
+            raise ValueError("Panel icin en az bir parite gerekli")
+
+        timestamps = np.unique(np.concatenate([c['timestamp_ms'] for c in columns]))
+        dtype = np.dtype(dtype or DataConfig.FLOAT_DTYPE)
+        values = np.full((len(timestamps), len(symbols), len(RAW_COLUMNS)), np.nan, dtype=dtype)
+
+        for s, col in enumerate(columns):
+            ts = col['timestamp_ms']
+            order = np.argsort(ts, kind='stable')
+            first = np.concatenate([[True], ts[order][1:] != ts[order][:-1]])
+            rows = order[first]
+            positions = np.searchsorted(timestamps, ts[rows])
+            for k, field in enumerate(RAW_COLUMNS):
+                values[positions, s, k] = col[field][rows]
+
+        print(f"Panel kuruldu: {len(timestamps):,} zaman x {len(symbols)} parite")
+        return cls(timestamps, symbols, values)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.timestamps), len(self.symbols)
+
+    def field(self, name: str) -> np.ndarray:
+        """Bir ham alanin (T, parite) view'i"""
+        return self.values[:, :, RAW_COLUMNS.index(name)]
+
+    def clean_data(self) -> np.ndarray:
+        """
+        Hatali hucreleri NaN yapar (DataProcessor.clean_data karsiligi)
+
+        Tek paritede satir siliniyordu. Panelde satiri silmek diger
+        paritelerin verisini de silerdi, bu yuzden sadece o paritenin o
+        zamandaki butun alanlarini NaN yapiyorum.
+
+        Returns:
+            (T, parite) bool: Gecerli hucreler
+        """
+        print("Panel temizleniyor...")
+        invalid = np.isnan(self.values).any(axis=2)
+        listed = ~np.isnan(self.values).all(axis=2)
+        missing = int((invalid & listed).sum())
+
+        non_positive = (self.values[:, :, :4] <= 0).any(axis=2)
+        bad = invalid | non_positive
+        self.values[bad] = np.nan
+
+        if missing:
+            print(f"   {missing} eksik degerli hucre NaN yapildi")
+        if non_positive.any():
+            print(f"   {int(non_positive.sum())} gecersiz fiyatli hucre NaN yapildi")
+        valid = ~bad
+        print(f"   {int(valid.sum()):,} gecerli hucre ({valid.mean() * 100:.1f}%)")
+        return valid
+
+    def add_features(
+        self,
+        features: Optional[List[str]] = None,
+        registry: Optional[FeatureRegistry] = None,
+        reference: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Butun pariteler icin ozellikleri tek geciste hesaplar
+
+        Kayit defterindeki fonksiyonlar (T, parite) array'lerini eksen 0
+        boyunca isliyor. Sonuclar dogrudan (T, parite, ozellik) blogunun
+        ilgili dilimine yaziliyor.
+
+        reference verilirse o paritenin kapanisi (T, 1) olarak butun
+        paritelere yayiliyor (rolling_corr_n, rolling_beta_n,
+        residual_return_n icin); zaman ekseni zaten ortak.
+
+        Args:
+            features: Ozellikler (None ise DataConfig.FEATURES)
+            registry: Ozellik kayit defteri (None ise FEATURE_REGISTRY)
+            reference: Referans parite (panelde olmali)
+
+        Returns:
+            numpy array: (T, parite, ozellik)
+        """
+        print("Panel ozellikleri hesaplaniyor...")
+        if features is None:
+            features = DataConfig.FEATURES
+
+        registry = registry or FEATURE_REGISTRY
+        unknown = [f for f in features if f not in registry]
+        if unknown:
+            print(f"   Bilinmeyen ozellikler atlandi: {unknown}")
+        names = list(dict.fromkeys(f for f in features if f not in unknown))
+
+        inputs = {field: self.field(field) for field in RAW_COLUMNS}
+        if reference is not None:
+            if reference not in self._symbol_index:
+                raise ValueError(f"Referans parite panelde yok: {reference}")
+            s = self._symbol_index[reference]
+            inputs[REFERENCE_COLUMN] = self.field('close')[:, s:s + 1]
+        block = np.empty(self.shape + (len(names),), dtype=self.values.dtype)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            registry.compute(inputs, names, out=block)
+
+        self.features = block
+        self.feature_names = names
+        print(f"   {len(names)} ozellik x {len(self.symbols)} parite hesaplandi")
+        return block
+
+    def _select(self, columns: Optional[List[str]]) -> Tuple[np.ndarray, Union[slice, List[int]]]:
+        """
+        Istenen sutunlarin hangi blokta ve hangi dilimde oldugunu bulur
+
+        Sutunlar ayni blokta ardisiksa slice donuyor (view), degilse indeks
+        listesi (kopya).
+        """
+        if self.features is None and (columns is None or any(c not in RAW_COLUMNS for c in columns)):
+            raise ValueError("Once add_features() cagrilmali")
+
+        if columns is None:
+            return self.features, slice(None)
+
+        for block, names in ((self.features, self.feature_names), (self.values, RAW_COLUMNS)):
+            if block is None or any(c not in names for c in columns):
+                continue
+            index = [names.index(c) for c in columns]
+            if index == list(range(index[0], index[0] + len(index))):
+                return block, slice(index[0], index[0] + len(index))
+            return block, index
+
+        raise ValueError(f"Sutunlar ayni blokta degil veya bulunamadi: {columns}")
+
+    def symbol_matrix(
+        self,
+        symbol: str,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tek paritenin dedektor matrisi (NaN satirlar haric)
+
+        Gecerli satirlar ardisiksa (normal durum: sadece listelenmeden
+        onceki ve ozelliklerin ilk NaN satirlari) sonuc panelin view'i,
+        kopya alinmiyor.
+
+        Args:
+            symbol: Parite
+            columns: Sutunlar (None ise butun ozellikler)
+
+        Returns:
+            (X, timestamps): (n, sutun) matris ve satirlarin zamanlari (ms)
+        """
+        block, index = self._select(columns)
+        X = block[:, self._symbol_index[symbol], index]
+
+        valid = ~np.isnan(X).any(axis=1)
+        rows = np.flatnonzero(valid)
+        if len(rows) == 0:
+            return X[:0], self.timestamps[:0]
+        if rows[-1] - rows[0] + 1 == len(rows):
+            window = slice(rows[0], rows[-1] + 1)
+            return X[window], self.timestamps[window]
+        return X[valid], self.timestamps[valid]
+
+    def stacked_matrix(
+        self,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Butun paritelerin satirlari alt alta (tek model icin)
+
+        (T, parite, sutun) blogu (T * parite, sutun) olarak yeniden
+        sekillendiriliyor; butun ozellikler isteniyorsa ve hic NaN satir
+        yoksa bu bir view. NaN satirlar
+        (listelenmeden onceki zamanlar) varsa sadece gecerli satirlar
+        bir kez kopyalaniyor.
+
+        Returns:
+            (X, time_index, symbol_index): Matris ve her satirin
+            zaman / parite indeksi
+        """
+        block, index = self._select(columns)
+        selected = block[:, :, index]
+        X = selected.reshape(-1, selected.shape[2])
+
+        valid = ~np.isnan(X).any(axis=1)
+        if valid.all():
+            rows = np.arange(len(X))
+        else:
+            rows = np.flatnonzero(valid)
+            X = X[rows]
+
+        time_index, symbol_index = np.divmod(rows, len(self.symbols))
+        return X, time_index, symbol_index
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Tek paritenin DataFrame'i (DataProcessor.df ile ayni sutunlar)
+
+        Sadece paritenin listelendigi (gecerli) zamanlar ve ozellikleri
+        NaN olmayan satirlar donuyor.
+        """
+        s = self._symbol_index[symbol]
+        data = {field: self.values[:, s, k] for k, field in enumerate(RAW_COLUMNS)}
+        for k, name in enumerate(self.feature_names):
+            data[name] = self.features[:, s, k]
+
+        df = pd.DataFrame(data)
+        df.insert(0, 'timestamp_ms', self.timestamps)
+        df['timestamp'] = pd.to_datetime(self.timestamps, unit='ms')
+        return df.dropna().reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    # Test
+    from async_fetcher import fetch_many_ohlcv
+
+    frames = fetch_many_ohlcv(["BTC/USDT", "ETH/USDT", "SOL/USDT"], "binance", "15m", days_back=7)
+
+    panel = PanelProcessor.from_frames(frames)
+    panel.clean_data()
+    panel.add_features()
+
+    for symbol in panel.symbols:
+        X, zamanlar = panel.symbol_matrix(symbol)
+        print(f"{symbol}: {X.shape}")
+
+    X, _, _ = panel.stacked_matrix()
+    print(f"Tum pariteler: {X.shape}")
@@ -0,0 +1,338 @@
+"""
+Paralel Anomali Tespiti (Yontem x Parite)
+
+detect_all_methods Isolation Forest, z-score, IQR ve hareketli
+ortalamayi arka arkaya calistiriyor; anomali_tespiti.py de her
+calistirmada tek bir pariteye bakiyor. Yontemler ve pariteler
+birbirinden bagimsiz, sirayla beklemelerine gerek yok.
+
+Bu modulde her (parite, yontem) ciftini ayri bir gorev olarak bir
+isci havuzunda calistiriyorum:
+- backend="thread": ayni process, matrisler dogrudan paylasiliyor
+  (NumPy ve sklearn agir islerde GIL'i birakiyor)
+- backend="process": ayri process'ler; ozellik matrisleri
+  multiprocessing.shared_memory'ye bir kez kopyalaniyor, iscilere
+  sadece adi/boyutu/tipi gidiyor (matris pickle edilmiyor)
+- Asiri abonelik (oversubscription) olmasin diye Isolation Forest'in
+  n_jobs'u ve BLAS/OpenMP thread sayisi isci basina cekirdek / isci
+  sayisiyla sinirlaniyor
+- Her parite icin tek bir istatistik baglami (FeatureStats: ortalama,
+  std, ceyrekler, standartlastirilmis matris) kuruluyor ve o paritenin
+  butun yontemleri paylasiyor (detect_all_methods'daki gibi). Thread'lerde
+  ana process kuruyor; process'lerde her isci paylasilan matris basina
+  bir kez kuruyor
+- Sonuclar gorev bitis sirasina gore degil (parite, yontem) anahtarina
+  gore toplaniyor; Isolation Forest random_state'i sabit oldugu icin
+  sonuc isci sayisindan ve siralamadan bagimsiz
+"""
+
+import contextlib
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from anomaly_detector import AnomalyDetector
+from config import AnomalyConfig
+from feature_stats import FeatureStats
+
+
+# Agirdan hafife: havuzda uzun gorevler once baslasin (sonuca etkisi yok)
+METHOD_ORDER = ["isolation_forest", "iqr", "z_score", "moving_average"]
+
+# Isci process'te bu process'in actigi paylasilan bellekler (ad -> (shm, array))
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+# Isci process'te paylasilan matrislerin istatistik baglamlari (ad -> FeatureStats)
+_ATTACHED_STATS: Dict[str, FeatureStats] = {}
+
+
+class SharedMatrix:
+    """
+    Paylasilan bellekteki (multiprocessing.shared_memory) bir matris
+
+    Ana process matrisi bir kez kopyalar; iscilere sadece descriptor
+    (ad, boyut, tip) gider, isci ayni bellegi kopyasiz view olarak acar.
+
+    Nasil kullanilir:
+        shared = SharedMatrix.from_array(X)
+        try:
+            ...                               # iscilere shared.descriptor gider
+        finally:
+            shared.unlink()
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = dtype
+
+    @classmethod
+    def from_array(cls, X: np.ndarray) -> "SharedMatrix":
+        X = np.asarray(X)
+        shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+        view = np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)
+        view[...] = X
+        return cls(shm, X.shape, X.dtype.str)
+
+    @property
+    def descriptor(self) -> Tuple[str, Tuple[int, ...], str]:
+        return self.shm.name, self.shape, self.dtype
+
+    def unlink(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach(descriptor: Tuple[str, Tuple[int, ...], str]) -> np.ndarray:
+    """
+    Descriptor'daki paylasilan matrisi salt okunur view olarak acar
+
+    Isci ayni matrisi birden cok gorevde kullaniyor; her process'te
+    bir kez aciliyor. Havuzun iscileri ana process'in resource
+    tracker'ini kullandigi icin bellegi sadece ana process siliyor.
+    """
+    name, shape, dtype = descriptor
+    if name not in _ATTACHED:
+        shm = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        view.flags.writeable = False
+        _ATTACHED[name] = (shm, view)
+    return _ATTACHED[name][1]
+
+
+def attached_stats(descriptor: Tuple[str, Tuple[int, ...], str]) -> FeatureStats:
+    """
+    Paylasilan matrisin istatistik baglami (isci basina bir kez)
+
+    Ayni paritenin yontemleri ayni isciye duserse ortalama/std,
+    ceyrekler ve standartlastirilmis matris tekrar hesaplanmiyor.
+    """
+    name = descriptor[0]
+    if name not in _ATTACHED_STATS:
+        _ATTACHED_STATS[name] = FeatureStats(attach(descriptor))
+    return _ATTACHED_STATS[name]
+
+
+def resolve_workers(n_workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Isci sayisi ve isci basina ic thread sayisi
+
+    Args:
+        n_workers: Isci sayisi (None: AnomalyConfig.N_WORKERS, 0: cekirdek sayisi)
+
+    Returns:
+        tuple: (isci sayisi, isci basina thread); Isolation Forest n_jobs
+        ve BLAS/OpenMP bu kadar thread'le sinirlaniyor
+    """
+    cpus = os.cpu_count() or 1
+    workers = AnomalyConfig.N_WORKERS if n_workers is None else n_workers
+    workers = workers if workers and workers > 0 else cpus
+    return workers, max(1, cpus // workers)
+
+
+def _init_process_worker(inner_threads: int, quiet: bool = True):
+    """Process iscisi: ilerleme mesajlari susturulur, ic thread sayisi sinirlanir"""
+    import sys
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+    threadpool_limits(limits=inner_threads)
+
+
+@contextlib.contextmanager
+def worker_pool(backend: str, n_workers: int, inner_threads: int, quiet: bool = True) -> Iterator[Executor]:
+    """
+    Thread veya process havuzu (BLAS/OpenMP thread siniriyla)
+
+    Process iscilerinde stdout susturulabiliyor (quiet); thread'ler ana
+    process'le ayni stdout'u paylastigi icin susturmak cagirana kaliyor
+    (ornegin AnomalyDetector(verbose=False)).
+
+    Args:
+        backend: "thread" veya "process"
+        n_workers: Isci sayisi
+        inner_threads: Isci basina thread (resolve_workers)
+        quiet: Process iscilerinin ciktisi atilsin mi
+    """
+    if backend == "process":
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_process_worker,
+            initargs=(inner_threads, quiet)
+        ) as pool:
+            yield pool
+    elif backend == "thread":
+        with threadpool_limits(limits=inner_threads):
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                yield pool
+    else:
+        raise ValueError(f"Bilinmeyen backend: {backend} (thread veya process)")
+
+
+def _run_task(task: Dict) -> Tuple[str, str, np.ndarray, np.ndarray, float]:
+    """
+    Tek bir (parite, yontem) gorevi
+
+    Args:
+        task: symbol, method, matrix (array veya shared descriptor),
+              stats (thread'lerde paritenin FeatureStats'i; process'lerde
+              yok, isci kendisi kuruyor), detector (AnomalyDetector
+              parametreleri), z_score_threshold, iqr_multiplier
+
+    Returns:
+        tuple: (parite, yontem, etiketler, skorlar, sure)
+    """
+    start = time.perf_counter()
+    matrix = task['matrix']
+    if isinstance(matrix, tuple):
+        X, stats = attach(matrix), attached_stats(matrix)
+    else:
+        X, stats = matrix, task['stats']
+
+    detector = AnomalyDetector(**task['detector'])
+    method = task['method']
+    if method == "isolation_forest":
+        labels, scores = detector.detect_isolation_forest(X, stats=stats)
+    elif method == "z_score":
+        labels, scores = detector.detect_z_score(X, threshold=task['z_score_threshold'], stats=stats)
+    elif method == "iqr":
+        labels, scores = detector.detect_iqr(X, multiplier=task['iqr_multiplier'], stats=stats)
+    elif method == "moving_average":
+        labels, scores = detector.detect_moving_average(X)
+    else:
+        raise ValueError(f"Bilinmeyen yontem: {method}")
+
+    return task['symbol'], method, labels, scores, time.perf_counter() - start
+
+
+class ParallelDetector:
+    """
+    (parite x yontem) gorevlerini isci havuzunda calistirir
+
+    Nasil kullanilir:
+        engine = ParallelDetector(AnomalyDetector(contamination=0.05), backend="process", n_workers=4)
+        sonuclar = engine.run({"BTC/USDT": X_btc, "ETH/USDT": X_eth})
+        etiketler, oylar = engine.detector.ensemble_voting(sonuclar["BTC/USDT"])
+
+    Args:
+        detector: Parametreleri (contamination, n_estimators, random_state)
+            kullanilacak dedektor; gorevlerde ayni ayarlarla yenisi kuruluyor
+        backend: "thread" veya "process" (varsayilan AnomalyConfig.PARALLEL_BACKEND)
+        n_workers: Isci sayisi (varsayilan AnomalyConfig.N_WORKERS, 0: cekirdek sayisi)
+        verbose: Yontemlerin kendi ilerleme mesajlari da yazilsin mi
+    """
+
+    def __init__(
+        self,
+        detector: Optional[AnomalyDetector] = None,
+        backend: Optional[str] = None,
+        n_workers: Optional[int] = None,
+        verbose: bool = False
+    ):
+        self.detector = detector or AnomalyDetector(
+            contamination=AnomalyConfig.CONTAMINATION,
+            n_estimators=AnomalyConfig.N_ESTIMATORS,
+            random_state=AnomalyConfig.RANDOM_STATE
+        )
+        self.backend = backend or AnomalyConfig.PARALLEL_BACKEND
+        if self.backend not in ("thread", "process"):
+            raise ValueError(f"Bilinmeyen backend: {self.backend} (thread veya process)")
+
+        # Isci basina dusen cekirdek: Isolation Forest ve BLAS bunu asmasin
+        self.n_workers, self.inner_threads = resolve_workers(n_workers)
+        self.verbose = verbose
+
+        # Son run() cagrisinin gorev sureleri ((parite, yontem) -> sn)
+        self.timings: Dict[Tuple[str, str], float] = {}
+
+    def _detector_params(self) -> Dict:
+        return {
+            'contamination': self.detector.contamination,
+            'n_estimators': self.detector.n_estimators,
+            'random_state': self.detector.random_state,
+            'n_jobs': self.inner_threads,
+            'verbose': self.verbose,
+        }
+
+    def run(
+        self,
+        matrices: Dict[str, np.ndarray],
+        methods: Optional[List[str]] = None,
+        z_score_threshold: float = 3.0,
+        iqr_multiplier: float = 1.5
+    ) -> Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Butun parite x yontem gorevlerini calistirir
+
+        Args:
+            matrices: Parite -> ozellik matrisi (n_samples, n_features)
+            methods: Kullanilacak yontemler
+            z_score_threshold: Z-score esigi
+            iqr_multiplier: IQR carpani
+
+        Returns:
+            dict: Parite -> {yontem: (etiketler, skorlar)}; her paritenin
+            sozlugu detect_all_methods ciktisi gibi, ensemble_voting'e verilebilir
+        """
+        if methods is None:
+            methods = ["isolation_forest", "z_score", "iqr"]
+        unknown = [m for m in methods if m not in METHOD_ORDER]
+        if unknown:
+            raise ValueError(f"Bilinmeyen yontemler: {unknown}")
+
+        symbols = list(matrices)
+        ordered = sorted(methods, key=METHOD_ORDER.index)
+        print(f"Paralel tespit: {len(symbols)} parite x {len(methods)} yontem, "
+              f"{self.n_workers} isci ({self.backend}), isci basina {self.inner_threads} thread")
+
+        shared: Dict[str, SharedMatrix] = {}
+        try:
+            if self.backend == "process":
+                for symbol in symbols:
+                    shared[symbol] = SharedMatrix.from_array(matrices[symbol])
+                sources = {symbol: shared[symbol].descriptor for symbol in symbols}
+                stats = {symbol: None for symbol in symbols}
+            else:
+                sources = {symbol: np.asarray(matrices[symbol]) for symbol in symbols}
+                # Thread'ler ayni process'te: parite basina tek baglam
+                stats = {symbol: FeatureStats(sources[symbol]) for symbol in symbols}
+
+            tasks = [
+                {
+                    'symbol': symbol,
+                    'method': method,
+                    'matrix': sources[symbol],
+                    'stats': stats[symbol],
+                    'detector': self._detector_params(),
+                    'z_score_threshold': z_score_threshold,
+                    'iqr_multiplier': iqr_multiplier,
+                }
+                for method in ordered
+                for symbol in symbols
+            ]
+
+            start = time.perf_counter()
+            outputs = self._execute(tasks)
+            elapsed = time.perf_counter() - start
+        finally:
+            for matrix in shared.values():
+                matrix.unlink()
+
+        # Bitis sirasindan bagimsiz: parite ve yontem sirasi girdiyle ayni
+        by_key = {(symbol, method): (labels, scores) for symbol, method, labels, scores, _ in outputs}
+        self.timings = {(symbol, method): seconds for symbol, method, _, _, seconds in outputs}
+        results = {symbol: {method: by_key[(symbol, method)] for method in methods} for symbol in symbols}
+
+        busy = sum(self.timings.values())
+        print(f"   {len(tasks)} gorev {elapsed:.2f} sn'de bitti (gorev toplami {busy:.2f} sn)")
+        return results
+
+    def _execute(self, tasks: List[Dict]) -> List[Tuple]:
+        # Yontem mesajlari dedektorun verbose ayariyla susuyor; process-genelinde
+        # sys.stdout'a dokunmuyorum (baska thread'lerin ciktisi kaybolmasin)
+        with worker_pool(self.backend, self.n_workers, self.inner_threads, quiet=not self.verbose) as pool:
+            return list(pool.map(_run_task, tasks))
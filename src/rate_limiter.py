@@ -0,0 +1,306 @@
+"""
+Rate Limit Modulu
+
+Ayni borsaya giden butun istekler tek bir istek butcesini paylassin diye
+bu modulu yazdim. Her borsa icin bir token bucket (jeton kovasi) tutuyorum:
+her istek agirligi kadar jeton harciyor, kova saniyede sabit hizla doluyor.
+
+Ayni borsaya baglanan butun fetcher'lar (sync/async) ayni kovayi kullaniyor.
+
+Eskiden her sayfadan sonra sabit exchange.rateLimit kadar uyuyorduk ve
+tek bir ag hatasi butun cekimi cope atiyordu. Simdi:
+- Kova borsanin gercek limitlerini (agirlik bazli) biliyor
+- 429 / Retry-After gelince yavasliyor, basarili isteklerle tekrar hizlaniyor
+- RetryPolicy sadece hata veren istegi tekrar deniyor
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import ccxt
+
+
+# Bilinen borsalarin limitleri
+# capacity: kovadaki maksimum jeton, refill_rate: saniyede eklenen jeton
+# weights: ccxt metodu -> borsanin o endpoint icin saydigi agirlik
+EXCHANGE_LIMITS = {
+    # Binance: dakikada 6000 agirlik (REQUEST_WEIGHT), klines = 2, exchangeInfo = 20
+    'binance': {
+        'capacity': 1200,
+        'refill_rate': 100.0,
+        'weights': {'fetch_ohlcv': 2, 'fetch_trades': 25, 'load_markets': 20},
+    },
+    # Bybit: IP basina 5 saniyede 600 istek
+    'bybit': {
+        'capacity': 120,
+        'refill_rate': 120.0,
+        'weights': {'fetch_ohlcv': 1, 'fetch_trades': 1, 'load_markets': 1},
+    },
+    # OKX: market/candles icin 2 saniyede 40 istek
+    'okx': {
+        'capacity': 40,
+        'refill_rate': 20.0,
+        'weights': {'fetch_ohlcv': 1, 'fetch_trades': 1, 'load_markets': 1},
+    },
+    # Kraken: public endpoint'ler saniyede ~1 istek
+    'kraken': {
+        'capacity': 3,
+        'refill_rate': 1.0,
+        'weights': {'fetch_ohlcv': 1, 'fetch_trades': 1, 'load_markets': 1},
+    },
+}
+
+
+class TokenBucket:
+    """
+    Agirlikli ve uyarlanabilir token bucket
+
+    Jetonlar yetmediginde istek siraya giriyor: jetonlar eksiye dusuyor ve
+    bekleme suresi borc kapanana kadar geciyor. Boylece bekleyenler geldikleri
+    sirayla (FIFO) hizmet aliyor.
+
+    Borsa 429 / Retry-After dondugunde penalize() ile kovayi durduruyorum ve
+    dolum hizini yariya indiriyorum. Basarili her istekte reward() hizi yavasca
+    asil degerine geri getiriyor (AIMD).
+
+    Baska bir limiter yazmak istersen ayni dort metodu saglaman yeterli:
+    acquire(), acquire_async(), penalize(), reward()
+
+    Args:
+        capacity: Kovadaki maksimum jeton (ani istek patlamasi limiti)
+        refill_rate: Saniyede eklenen jeton sayisi
+        weights: ccxt metodu -> agirlik (verilmeyen metodlar 1 sayilir)
+    """
+
+    def __init__(self, capacity: float, refill_rate: float, weights: Optional[Dict[str, float]] = None):
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError("capacity ve refill_rate pozitif olmali")
+
+        self.capacity = float(capacity)
+        self.base_refill_rate = float(refill_rate)
+        self.refill_rate = float(refill_rate)
+        self.weights = dict(weights or {})
+        self.tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def weight_of(self, method: str) -> float:
+        """Bir ccxt metodunun agirligini doner"""
+        return float(self.weights.get(method, 1.0))
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self._last_refill = now
+
+    def reserve(self, weight: float = 1.0) -> float:
+        """
+        Jetonlari ayirir ve ne kadar beklenmesi gerektigini doner
+
+        Returns:
+            float: Istek gonderilmeden once beklenecek sure (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= weight
+
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.refill_rate
+            # Borsa bizi bir sure durdurduysa o sureyi de bekliyorum
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, weight: float = 1.0):
+        """Jeton alana kadar bekler (sync)"""
+        wait = self.reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, weight: float = 1.0):
+        """Jeton alana kadar (event loop'u bloklamadan) bekler"""
+        wait = self.reserve(weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        Borsa rate limit hatasi dondugunde cagrilir
+
+        Args:
+            retry_after: Borsanin Retry-After ile istedigi bekleme (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.refill_rate = max(self.base_refill_rate * 0.1, self.refill_rate * 0.5)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def reward(self):
+        """Basarili istekten sonra dolum hizini yavasca geri artirir"""
+        if self.refill_rate >= self.base_refill_rate:
+            return
+        with self._lock:
+            self.refill_rate = min(
+                self.base_refill_rate,
+                self.refill_rate + self.base_refill_rate * 0.05
+            )
+
+
+# Borsa id -> paylasilan kova
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(
+    exchange_id: str,
+    rate_limit_ms: float,
+    burst: Optional[float] = None
+) -> TokenBucket:
+    """
+    Bir borsa icin paylasilan rate limiter'i doner (yoksa olusturur)
+
+    Borsa EXCHANGE_LIMITS tablosundaysa gercek limitleri kullaniyorum,
+    degilse ccxt'nin rateLimit degerinden (istekler arasi ms) hesapliyorum.
+
+    Args:
+        exchange_id: Borsa adi (binance, bybit...)
+        rate_limit_ms: ccxt'nin exchange.rateLimit degeri (istekler arasi ms)
+        burst: Ayni anda harcanabilecek maksimum jeton
+
+    Returns:
+        TokenBucket: Bu borsaya giden butun isteklerin paylastigi kova
+    """
+    key = exchange_id.lower()
+    with _BUCKETS_LOCK:
+        if key not in _BUCKETS:
+            limits = EXCHANGE_LIMITS.get(key)
+            if limits is not None:
+                capacity = burst if burst is not None else limits['capacity']
+                _BUCKETS[key] = TokenBucket(capacity, limits['refill_rate'], limits['weights'])
+            else:
+                refill_rate = 1000.0 / max(rate_limit_ms, 1.0)
+                capacity = burst if burst is not None else max(1.0, refill_rate)
+                _BUCKETS[key] = TokenBucket(capacity, refill_rate)
+        return _BUCKETS[key]
+
+
+def parse_retry_after(exchange) -> Optional[float]:
+    """
+    Son yanittaki Retry-After basligini saniyeye cevirir
+
+    Baslik saniye ("30") veya HTTP tarihi olabiliyor. Yoksa None doner.
+    """
+    headers = getattr(exchange, 'last_response_headers', None) or {}
+    value = None
+    for key, header_value in headers.items():
+        if str(key).lower() == 'retry-after':
+            value = header_value
+            break
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Gecici hatalarda sadece basarisiz istegi tekrar deneyen katman
+
+    Sadece ccxt.NetworkError (timeout, baglanti hatasi, 429, bakim) tekrar
+    deneniyor. ccxt.ExchangeError (yanlis sembol vs.) hemen yukari firlatiliyor.
+    Bekleme suresi her denemede ikiye katlaniyor (exponential backoff + jitter).
+
+    Args:
+        max_retries: Maksimum tekrar sayisi
+        base_delay: Ilk bekleme (saniye)
+        max_delay: En uzun bekleme (saniye)
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay *= 0.5 + random.random() / 2
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _on_error(self, error: Exception, exchange, limiter: TokenBucket, attempt: int) -> float:
+        """Hatayi degerlendirir, tekrar denenecekse beklenecek sureyi doner"""
+        if not isinstance(error, ccxt.NetworkError) or attempt >= self.max_retries:
+            raise error
+
+        retry_after = None
+        if isinstance(error, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+            # Borsa bizi yavaslatiyor (429 / 418)
+            retry_after = parse_retry_after(exchange)
+            limiter.penalize(retry_after)
+
+        delay = self._delay(attempt, retry_after)
+        print(f"   Gecici hata ({type(error).__name__}), {delay:.1f} sn sonra tekrar "
+              f"deneniyor ({attempt + 1}/{self.max_retries})")
+        return delay
+
+    def call(self, exchange, limiter: TokenBucket, method: str, *args, **kwargs) -> Any:
+        """
+        exchange.<method>(*args, **kwargs) cagrisini limiter ve retry ile yapar
+
+        Ornek:
+            ohlcv = policy.call(exchange, limiter, 'fetch_ohlcv', 'BTC/USDT', '15m', since, 1000)
+        """
+        func: Callable = getattr(exchange, method)
+        weight = limiter.weight_of(method)
+
+        attempt = 0
+        while True:
+            limiter.acquire(weight)
+            try:
+                result = func(*args, **kwargs)
+                limiter.reward()
+                return result
+            except Exception as e:
+                time.sleep(self._on_error(e, exchange, limiter, attempt))
+                attempt += 1
+
+    async def call_async(self, exchange, limiter: TokenBucket, method: str, *args,
+                         semaphore: Optional[asyncio.Semaphore] = None, **kwargs) -> Any:
+        """
+        call() metodunun ccxt.async_support icin karsiligi
+
+        semaphore verilirse sadece istek suresince tutuluyor: once jeton
+        bekleniyor, sonra semaphore'a giriliyor. Boylece sadece rate limit
+        yuzunden bekleyen gorevler istek slotlarini doldurmuyor.
+        """
+        func: Callable = getattr(exchange, method)
+        weight = limiter.weight_of(method)
+
+        attempt = 0
+        while True:
+            try:
+                await limiter.acquire_async(weight)
+                if semaphore is not None:
+                    async with semaphore:
+                        result = await func(*args, **kwargs)
+                else:
+                    result = await func(*args, **kwargs)
+                limiter.reward()
+                return result
+            except Exception as e:
+                await asyncio.sleep(self._on_error(e, exchange, limiter, attempt))
+                attempt += 1
@@ -0,0 +1,385 @@
+"""
+Replay (Tekrar Oynatma) Borsasi
+
+DataFetcher'i canli borsaya baglanmadan calistirabilmek ve cekim hizini
+olcebilmek icin bu modulu yazdim. ccxt Exchange arayuzunun DataFetcher'in
+kullandigi kismini taklit ediyor:
+load_markets, set_markets, symbols, markets, fetch_ohlcv (since/limit),
+fetch_trades (since/limit), rateLimit, has, timeframes, parse_timeframe
+
+Mumlar ya kaydedilmis veriden (CandleStore / ham_veri CSV) ya da sentetik
+olarak uretiliyor. Gecikme ve rate limit hatalari (429) ayarlanabiliyor.
+
+Nasil kullanilir:
+    exchange = ReplayExchange(symbols=["BTC/USDT"], latency=0.05)
+    fetcher = DataFetcher(exchange=exchange)
+    df = fetcher.fetch_ohlcv("BTC/USDT", "15m", days_back=7)
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from candle_store import CandleStore, OHLCV_COLUMNS, COLUMN_DTYPES
+
+
+def generate_candles(
+    start: int,
+    end: int,
+    timeframe_ms: int,
+    start_price: float = 100.0,
+    volatility: float = 0.002,
+    seed: int = 42
+) -> Dict[str, np.ndarray]:
+    """
+    [start, end) araligi icin sentetik OHLCV mumlari uretir
+
+    Kapanis fiyatlari geometrik rastgele yuruyus. Ayni seed ile her seferinde
+    ayni mumlar uretiliyor.
+
+    Returns:
+        dict: Sutun adi -> numpy array
+    """
+    first = start - (start % timeframe_ms)
+    timestamps = np.arange(first, end, timeframe_ms, dtype=np.int64)
+    n = len(timestamps)
+    rng = np.random.default_rng(seed)
+
+    log_returns = rng.normal(0.0, volatility, n)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.empty(n)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+
+    wick = np.abs(rng.normal(0.0, volatility / 2, (2, n)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.lognormal(mean=3.0, sigma=1.0, size=n)
+
+    return {
+        'timestamp_ms': timestamps,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+    }
+
+
+def generate_trades(
+    start: int,
+    end: int,
+    trades_per_minute: float = 60.0,
+    start_price: float = 100.0,
+    volatility: float = 0.0003,
+    seed: int = 42
+) -> Dict[str, np.ndarray]:
+    """
+    [start, end) araligi icin sentetik islemler (trades) uretir
+
+    Returns:
+        dict: timestamp_ms, price, amount -> numpy array (zaman sirali)
+    """
+    rng = np.random.default_rng(seed)
+    n = max(int((end - start) / 60_000 * trades_per_minute), 1)
+
+    timestamps = np.sort(rng.integers(start, end, n, dtype=np.int64))
+    price = start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, n)))
+    amount = rng.lognormal(mean=-1.0, sigma=1.0, size=n)
+
+    return {'timestamp_ms': timestamps, 'price': price, 'amount': amount}
+
+
+class ReplayExchange:
+    """
+    Yerel veriden cevap veren sahte ccxt borsasi (sync)
+
+    Args:
+        symbols: Sentetik veri uretilecek pariteler
+        candles: Kayitli veri: {(parite, timeframe): sutunlar}
+        latency: Her istekte beklenecek sure (saniye)
+        rate_limit_error_rate: Isteklerin ne kadari 429 ile reddedilsin (0-1)
+        retry_after: 429 yanitindaki Retry-After degeri (saniye)
+        rate_limit_ms: ccxt'deki rateLimit (istekler arasi ms)
+        page_limit: Bir istekte donebilecek maksimum mum
+        history_days: Sentetik verinin kac gun geriye gidecegi
+        trade_history_hours: Sentetik islemlerin kac saat geriye gidecegi
+        trades_per_minute: Dakikada ortalama islem sayisi
+        seed: Rastgelelik kontrolu
+    """
+
+    id = 'replay'
+    name = 'Replay'
+
+    timeframes = {
+        '1m': '1m', '3m': '3m', '5m': '5m', '15m': '15m', '30m': '30m',
+        '1h': '1h', '2h': '2h', '4h': '4h', '6h': '6h', '12h': '12h',
+        '1d': '1d',
+    }
+
+    parse_timeframe = staticmethod(ccxt.Exchange.parse_timeframe)
+
+    def __init__(
+        self,
+        symbols: Optional[List[str]] = None,
+        candles: Optional[Dict[Tuple[str, str], Dict[str, np.ndarray]]] = None,
+        latency: float = 0.0,
+        rate_limit_error_rate: float = 0.0,
+        retry_after: float = 0.0,
+        rate_limit_ms: float = 50,
+        page_limit: int = 1000,
+        history_days: int = 400,
+        trade_history_hours: float = 24,
+        trades_per_minute: float = 60.0,
+        seed: int = 42
+    ):
+        self.latency = latency
+        self.rate_limit_error_rate = rate_limit_error_rate
+        self.retry_after = retry_after
+        self.rateLimit = rate_limit_ms
+        self.page_limit = page_limit
+        self.history_days = history_days
+        self.trade_history_hours = trade_history_hours
+        self.trades_per_minute = trades_per_minute
+        self.seed = seed
+
+        self.has = {'fetchOHLCV': True, 'fetchTrades': True}
+        self.markets = None
+        self.currencies = {}
+        self.last_response_headers = {}
+
+        self._candles: Dict[Tuple[str, str], Dict[str, np.ndarray]] = dict(candles or {})
+        self._trades: Dict[str, Dict[str, np.ndarray]] = {}
+        self._symbols = sorted(set(symbols or []) | {symbol for symbol, _ in self._candles})
+        self._rng = random.Random(seed)
+
+        # Benchmark icin istek sayaclari
+        self.request_count = 0
+        self.rate_limited_count = 0
+
+    # -- ccxt arayuzu ----------------------------------------------------
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.markets.keys()) if self.markets else []
+
+    def _build_markets(self) -> dict:
+        markets = {}
+        for symbol in self._symbols:
+            base, _, quote = symbol.partition('/')
+            markets[symbol] = {
+                'id': symbol.replace('/', ''),
+                'symbol': symbol,
+                'base': base,
+                'quote': quote,
+                'active': True,
+                'spot': True,
+            }
+        return markets
+
+    def load_markets(self, reload: bool = False, params: Optional[dict] = None) -> dict:
+        if self.markets is None or reload:
+            self._simulate_request()
+            self.markets = self._build_markets()
+        return self.markets
+
+    def set_markets(self, markets: dict, currencies: Optional[dict] = None) -> dict:
+        self.markets = markets
+        self.currencies = currencies or {}
+        return self.markets
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = '1m',
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None
+    ) -> list:
+        self._simulate_request()
+        return self._ohlcv_page(symbol, timeframe, since, limit)
+
+    def fetch_trades(
+        self,
+        symbol: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None
+    ) -> list:
+        self._simulate_request()
+        return self._trades_page(symbol, since, limit)
+
+    def close(self):
+        pass
+
+    # -- ic islemler -------------------------------------------------------
+
+    def _check_rate_limit(self):
+        self.request_count += 1
+        if self.rate_limit_error_rate and self._rng.random() < self.rate_limit_error_rate:
+            self.rate_limited_count += 1
+            self.last_response_headers = {'Retry-After': str(self.retry_after)}
+            raise ccxt.RateLimitExceeded(f"{self.id} 429 Too Many Requests (simulasyon)")
+        self.last_response_headers = {}
+
+    def _simulate_request(self):
+        if self.latency:
+            time.sleep(self.latency)
+        self._check_rate_limit()
+
+    def _series(self, symbol: str, timeframe: str) -> Dict[str, np.ndarray]:
+        """Parite/timeframe icin mumlari doner (sentetikse ilk istekte uretir)"""
+        key = (symbol, timeframe)
+        if key not in self._candles:
+            if symbol not in self._symbols:
+                raise ccxt.BadSymbol(f"{self.id} {symbol} bulunamadi")
+            timeframe_ms = self.parse_timeframe(timeframe) * 1000
+            now = int(time.time() * 1000)
+            start = now - self.history_days * 86_400_000
+            seed = self.seed + sum(ord(ch) for ch in symbol)
+            self._candles[key] = generate_candles(start, now + 1, timeframe_ms, seed=seed)
+        return self._candles[key]
+
+    def _trade_series(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Parite icin sentetik islemleri doner (ilk istekte uretir)"""
+        if symbol not in self._trades:
+            if symbol not in self._symbols:
+                raise ccxt.BadSymbol(f"{self.id} {symbol} bulunamadi")
+            now = int(time.time() * 1000)
+            start = now - int(self.trade_history_hours * 3_600_000)
+            seed = self.seed + sum(ord(ch) for ch in symbol)
+            self._trades[symbol] = generate_trades(start, now, self.trades_per_minute, seed=seed)
+        return self._trades[symbol]
+
+    def _trades_page(self, symbol: str, since: Optional[int], limit: Optional[int]) -> list:
+        series = self._trade_series(symbol)
+        timestamps = series['timestamp_ms']
+        page_size = min(limit or self.page_limit, self.page_limit)
+
+        visible_end = int(np.searchsorted(timestamps, int(time.time() * 1000), side='right'))
+        if since is None:
+            start = max(0, visible_end - page_size)
+        else:
+            start = int(np.searchsorted(timestamps, since, side='left'))
+        end = min(start + page_size, visible_end)
+
+        # ccxt'nin dondurdugu islem formati
+        return [
+            {
+                'id': str(i),
+                'symbol': symbol,
+                'timestamp': int(timestamps[i]),
+                'price': float(series['price'][i]),
+                'amount': float(series['amount'][i]),
+                'cost': float(series['price'][i] * series['amount'][i]),
+                'side': None,
+            }
+            for i in range(start, end)
+        ]
+
+    def _ohlcv_page(self, symbol: str, timeframe: str, since: Optional[int], limit: Optional[int]) -> list:
+        series = self._series(symbol, timeframe)
+        timestamps = series['timestamp_ms']
+        page_size = min(limit or self.page_limit, self.page_limit)
+
+        # Canli borsa gibi henuz acilmamis mumlari gostermiyorum
+        visible_end = int(np.searchsorted(timestamps, int(time.time() * 1000), side='right'))
+        if since is None:
+            start = max(0, visible_end - page_size)
+        else:
+            start = int(np.searchsorted(timestamps, since, side='left'))
+        end = min(start + page_size, visible_end)
+        if start >= end:
+            return []
+
+        page = np.column_stack([series[col][start:end] for col in OHLCV_COLUMNS])
+        rows = page.tolist()
+        for row in rows:
+            row[0] = int(row[0])
+        return rows
+
+    # -- kayitli veriden olusturma ---------------------------------------
+
+    @classmethod
+    def from_store(
+        cls,
+        store: CandleStore,
+        exchange: str,
+        series: List[Tuple[str, str]],
+        **kwargs
+    ) -> "ReplayExchange":
+        """
+        CandleStore'daki kayitli mumlari tekrar oynatan borsa olusturur
+
+        Args:
+            store: Yerel mum deposu
+            exchange: Depodaki borsa adi (binance...)
+            series: [(parite, timeframe), ...]
+        """
+        candles = {}
+        for symbol, timeframe in series:
+            columns = store.load(exchange, symbol, timeframe)
+            if len(columns['timestamp_ms']) == 0:
+                raise ValueError(f"Depoda veri yok: {exchange} {symbol} {timeframe}")
+            candles[(symbol, timeframe)] = {col: np.asarray(arr) for col, arr in columns.items()}
+        return cls(candles=candles, **kwargs)
+
+    @classmethod
+    def from_csv(cls, filepath: str, symbol: str, timeframe: str, **kwargs) -> "ReplayExchange":
+        """data/ham_veri_*.csv dosyasini tekrar oynatan borsa olusturur"""
+        df = pd.read_csv(filepath)
+        candles = {
+            (symbol, timeframe): {
+                col: df[col].to_numpy(dtype=COLUMN_DTYPES[col]) for col in OHLCV_COLUMNS
+            }
+        }
+        return cls(candles=candles, **kwargs)
+
+
+class AsyncReplayExchange(ReplayExchange):
+    """
+    ReplayExchange'in ccxt.async_support karsiligi
+
+    Gecikme asyncio.sleep ile bekleniyor, boylece es zamanli istekler
+    gercek borsadaki gibi ust uste biniyor.
+    """
+
+    async def _simulate_request_async(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._check_rate_limit()
+
+    async def load_markets(self, reload: bool = False, params: Optional[dict] = None) -> dict:
+        if self.markets is None or reload:
+            await self._simulate_request_async()
+            self.markets = self._build_markets()
+        return self.markets
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = '1m',
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None
+    ) -> list:
+        await self._simulate_request_async()
+        return self._ohlcv_page(symbol, timeframe, since, limit)
+
+    async def fetch_trades(
+        self,
+        symbol: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None
+    ) -> list:
+        await self._simulate_request_async()
+        return self._trades_page(symbol, since, limit)
+
+    async def close(self):
+        pass
@@ -0,0 +1,336 @@
+"""
+Coklu Timeframe Turetme (Resampling) Modulu
+
+Ayni pariteyi 5m, 15m, 1h ve 4h'de analiz ederken her TIMEFRAME icin
+fetch_ohlcv bastan butun veriyi indiriyordu. Oysa 15m mum, 15 tane 1m
+mumdan hesaplanabiliyor.
+
+Bu modulde en ince timeframe'i (1m) bir kez cekip kalin timeframe'leri
+yerelde turetiyorum:
+- open: ilk, high: max, low: min, close: son, volume: toplam
+- Bucket sinirlari borsayla ayni (UTC'ye hizali, hafta pazartesi,
+  ay takvim ayi)
+- Yeni 1m mumlar geldikce turetilmis mumlar artimli guncelleniyor
+
+Boylece N timeframe icin N yerine 1 ag cekimi yapiliyor.
+"""
+
+import time
+from typing import Dict, List, Optional, Union
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from bar_builder import aggregate_bars
+from candle_buffer import OHLCVBuffer, VALUE_COLUMNS
+from candle_store import OHLCV_COLUMNS
+
+
+WEEK_MS = 7 * 86_400_000
+# 1970-01-01 persembe; borsalarin haftasi pazartesi 00:00 UTC'de basliyor
+WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """'15m' gibi bir timeframe'i ms'ye cevirir (1M icin ortalama ay)"""
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def bucket_start(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+    """
+    Her zaman damgasinin dustugu mumun acilis zamanini verir (borsa hizali)
+
+    Args:
+        timestamps: int64 ms zaman damgalari
+        timeframe: Hedef timeframe (5m, 1h, 4h, 1d, 1w, 1M...)
+
+    Returns:
+        np.ndarray: int64 bucket baslangiclari
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+
+    if timeframe.endswith('M'):
+        # Takvim ayi (1M, 3M...)
+        months = timestamps.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+        step = int(timeframe[:-1] or 1)
+        months = months - months % step
+        return months.astype('datetime64[M]').astype('datetime64[ms]').astype(np.int64)
+
+    if timeframe.endswith('w'):
+        width = WEEK_MS * int(timeframe[:-1] or 1)
+        return (timestamps - WEEK_OFFSET_MS) // width * width + WEEK_OFFSET_MS
+
+    width = timeframe_to_ms(timeframe)
+    return timestamps - timestamps % width
+
+
+def bucket_end(starts: np.ndarray, timeframe: str) -> np.ndarray:
+    """Bucket baslangiclarindan bir sonraki bucket'in baslangicini verir"""
+    starts = np.asarray(starts, dtype=np.int64)
+
+    if timeframe.endswith('M'):
+        step = int(timeframe[:-1] or 1)
+        months = starts.astype('datetime64[ms]').astype('datetime64[M]') + step
+        return months.astype('datetime64[ms]').astype(np.int64)
+
+    if timeframe.endswith('w'):
+        return starts + WEEK_MS * int(timeframe[:-1] or 1)
+
+    return starts + timeframe_to_ms(timeframe)
+
+
+def asof_positions(
+    timestamps: np.ndarray,
+    bar_starts: np.ndarray,
+    timeframe: str,
+    base_timeframe: Optional[str] = None
+) -> np.ndarray:
+    """
+    Her satir icin o ana kadar kapanmis son kalin mumun indeksi (as-of)
+
+    Satirin zamani olarak mumun kapanisini aliyorum (base_timeframe
+    verilirse): 15m'lik 10:45 mumu 11:00'de kapaniyor ve 10:00-11:00 1h
+    mumu da o anda kapanmis oluyor. Henuz kapanmamis kalin mum hicbir
+    satira gorunmuyor, yani gelecek veri sizmiyor.
+
+    Args:
+        timestamps: (N,) artan int64 ms, satirlarin (ince mumlarin) acilis zamanlari
+        bar_starts: (H,) artan int64 ms, kalin mumlarin acilis zamanlari
+        timeframe: Kalin timeframe (1h, 4h...)
+        base_timeframe: Satirlarin timeframe'i (None ise satir zamani acilis)
+
+    Returns:
+        np.ndarray: (N,) int64 indeksler, henuz kapanmis mum yoksa -1
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    ends = bucket_end(bar_starts, timeframe)
+    known_at = bucket_end(timestamps, base_timeframe) if base_timeframe else timestamps
+    return np.searchsorted(ends, known_at, side='right') - 1
+
+
+def resample_columns(
+    columns: Dict[str, np.ndarray],
+    timeframe: str,
+    drop_partial_head: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    Zaman sirali mumlari daha kalin bir timeframe'e toplar
+
+    Args:
+        columns: OHLCV sutunlari (ince timeframe)
+        timeframe: Hedef timeframe
+        drop_partial_head: Veri bir mumun ortasindan basliyorsa o ilk eksik
+                           mumu at (open'i yanlis olurdu)
+
+    Returns:
+        dict: Hedef timeframe'de OHLCV sutunlari
+    """
+    timestamps = np.asarray(columns['timestamp_ms'], dtype=np.int64)
+    starts = bucket_start(timestamps, timeframe)
+
+    bars = aggregate_bars(
+        starts, timestamps,
+        columns['open'], columns['high'], columns['low'], columns['close'], columns['volume']
+    )
+    bars['timestamp_ms'] = bars['bar_id']
+
+    if drop_partial_head and len(timestamps) and timestamps[0] != starts[0]:
+        bars = {col: arr[1:] for col, arr in bars.items()}
+
+    return {col: bars[col] for col in OHLCV_COLUMNS}
+
+
+class MultiTimeframeResampler:
+    """
+    Tek bir ince timeframe'den bircok kalin timeframe'i artimli turetir
+
+    Her hedef timeframe icin kapanmis mumlari bir OHLCVBuffer'da,
+    henuz kapanmamis (acik) mumun ince mumlarini ayrica tutuyorum. Yeni ince
+    mumlar gelince sadece acik mum + yeni mumlar yeniden toplaniyor.
+
+    Nasil kullanilir:
+        resampler = MultiTimeframeResampler("1m", ["5m", "15m", "1h", "4h"])
+        resampler.update(fetcher.fetch_ohlcv("BTC/USDT", "1m", days_back=30))
+        df_15m = resampler.frame("15m")
+        ...
+        resampler.update(yeni_1m_mumlar)   # Sadece yeni kisim isleniyor
+
+    Args:
+        base_timeframe: Cekilen en ince timeframe
+        timeframes: Turetilecek timeframe'ler
+        dtype: Fiyat/hacim sutunlarinin tipi
+    """
+
+    def __init__(self, base_timeframe: str = "1m", timeframes: Optional[List[str]] = None, dtype=np.float64):
+        self.base_timeframe = base_timeframe
+        self.base_ms = timeframe_to_ms(base_timeframe)
+        self.timeframes = list(timeframes or ["5m", "15m", "1h", "4h"])
+        self.dtype = np.dtype(dtype)
+
+        for timeframe in self.timeframes:
+            self._check_timeframe(timeframe)
+
+        self.last_base_ts: Optional[int] = None
+        self._closed: Dict[str, OHLCVBuffer] = {tf: OHLCVBuffer(dtype=self.dtype) for tf in self.timeframes}
+        self._pending: Dict[str, Dict[str, np.ndarray]] = {tf: self._empty() for tf in self.timeframes}
+        self._started = {tf: False for tf in self.timeframes}
+
+    def _check_timeframe(self, timeframe: str):
+        if timeframe.endswith('M') or timeframe.endswith('w'):
+            if 86_400_000 % self.base_ms != 0:
+                raise ValueError(f"{timeframe} icin temel timeframe gunu tam bolmeli")
+            return
+        target_ms = timeframe_to_ms(timeframe)
+        if target_ms < self.base_ms or target_ms % self.base_ms != 0:
+            raise ValueError(
+                f"{timeframe}, {self.base_timeframe} mumlarindan turetilemez "
+                f"(temel timeframe'in tam kati olmali)"
+            )
+
+    @staticmethod
+    def _empty() -> Dict[str, np.ndarray]:
+        columns = {col: np.empty(0, dtype=np.float64) for col in VALUE_COLUMNS}
+        columns['timestamp_ms'] = np.empty(0, dtype=np.int64)
+        return columns
+
+    @staticmethod
+    def _to_columns(data: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        if isinstance(data, pd.DataFrame):
+            if 'timestamp_ms' in data.columns:
+                timestamps = data['timestamp_ms'].to_numpy(dtype=np.int64)
+            else:
+                timestamps = data['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+            columns = {col: data[col].to_numpy(dtype=np.float64) for col in VALUE_COLUMNS}
+            columns['timestamp_ms'] = timestamps
+            return columns
+        return {col: np.asarray(data[col]) for col in OHLCV_COLUMNS}
+
+    def update(self, base: Union[pd.DataFrame, Dict[str, np.ndarray]], now: Optional[int] = None):
+        """
+        Yeni ince mumlari ekler ve turetilmis mumlari gunceller
+
+        Son ince mumla ayni zamanli mum gelirse (canli mum guncellemesi)
+        eskisinin yerine geciyor. Daha eski mumlar yok sayiliyor.
+
+        Args:
+            base: Zaman sirali ince mumlar (DataFrame veya sutunlar)
+            now: Simdiki zaman (ms), son ince mumun kapanip kapanmadigini anlamak icin
+        """
+        columns = self._to_columns(base)
+        timestamps = columns['timestamp_ms']
+
+        if self.last_base_ts is not None:
+            keep = timestamps >= self.last_base_ts
+            columns = {col: arr[keep] for col, arr in columns.items()}
+            timestamps = columns['timestamp_ms']
+        if len(timestamps) == 0:
+            return
+
+        self.last_base_ts = int(timestamps[-1])
+        if now is None:
+            now = int(time.time() * 1000)
+
+        # Son ince mum kapandiysa onun bucket'i da kapanmis olabilir
+        closed_until = self.last_base_ts
+        if self.last_base_ts + self.base_ms <= now:
+            closed_until = self.last_base_ts + self.base_ms
+
+        first_new = timestamps[0]
+        for timeframe in self.timeframes:
+            pending = self._pending[timeframe]
+            old = pending['timestamp_ms'] < first_new
+            merged = {
+                col: np.concatenate([pending[col][old], columns[col]]) for col in OHLCV_COLUMNS
+            }
+            self._absorb(timeframe, merged, closed_until)
+
+    def _absorb(self, timeframe: str, merged: Dict[str, np.ndarray], closed_until: int):
+        """Acik mum + yeni ince mumlari toplar, kapananlari tampona yazar"""
+        starts = bucket_start(merged['timestamp_ms'], timeframe)
+
+        if not self._started[timeframe]:
+            # Ilk mum eksik basliyorsa atiyorum (resample_columns ile ayni)
+            if merged['timestamp_ms'][0] != starts[0]:
+                keep = starts != starts[0]
+                merged = {col: arr[keep] for col, arr in merged.items()}
+                starts = starts[keep]
+            if len(starts) == 0:
+                self._pending[timeframe] = self._empty()
+                return
+            self._started[timeframe] = True
+
+        closed_buffer = self._closed[timeframe]
+        if len(closed_buffer):
+            # Kapanmis bir mumun ince mumu tekrar gelirse yok sayiyorum
+            late = starts <= closed_buffer.columns()['timestamp_ms'][-1]
+            if late.any():
+                merged = {col: arr[~late] for col, arr in merged.items()}
+                starts = starts[~late]
+
+        ends = bucket_end(starts, timeframe)
+        is_closed = ends <= closed_until
+
+        closed_rows = {col: arr[is_closed] for col, arr in merged.items()}
+        if len(closed_rows['timestamp_ms']):
+            self._closed[timeframe].append_columns(
+                resample_columns(closed_rows, timeframe, drop_partial_head=False)
+            )
+
+        self._pending[timeframe] = {col: arr[~is_closed] for col, arr in merged.items()}
+
+    def columns(self, timeframe: str, include_open: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Turetilmis mumlari sutunlar halinde doner
+
+        Args:
+            timeframe: Istenen timeframe
+            include_open: Henuz kapanmamis son mumu da ekle
+        """
+        closed = self._closed[timeframe].columns()
+        pending = self._pending[timeframe]
+        if not include_open or len(pending['timestamp_ms']) == 0:
+            return {col: arr.copy() for col, arr in closed.items()}
+
+        open_bar = resample_columns(pending, timeframe, drop_partial_head=False)
+        return {col: np.concatenate([closed[col], open_bar[col]]) for col in OHLCV_COLUMNS}
+
+    def frame(self, timeframe: str, include_open: bool = True) -> pd.DataFrame:
+        """Turetilmis mumlari fetch_ohlcv formatinda DataFrame olarak doner"""
+        columns = self.columns(timeframe, include_open=include_open)
+        return OHLCVBuffer.from_columns(columns, dtype=self.dtype).to_dataframe()
+
+    def frames(self, include_open: bool = True) -> Dict[str, pd.DataFrame]:
+        """Butun turetilmis timeframe'ler"""
+        return {tf: self.frame(tf, include_open=include_open) for tf in self.timeframes}
+
+
+def fetch_multi_timeframe(
+    fetcher,
+    symbol: str,
+    timeframes: List[str],
+    days_back: int = 60,
+    base_timeframe: str = "1m"
+) -> Dict[str, pd.DataFrame]:
+    """
+    Temel timeframe'i bir kez cekip butun timeframe'leri yerelde turetir
+
+    Nasil kullanilir:
+        frames = fetch_multi_timeframe(DataFetcher("binance"), "BTC/USDT",
+                                       ["5m", "15m", "1h", "4h"], days_back=30)
+        df_1h = frames["1h"]
+
+    Returns:
+        dict: timeframe -> DataFrame (temel timeframe de dahil)
+    """
+    base_df = fetcher.fetch_ohlcv(symbol, base_timeframe, days_back=days_back)
+    targets = [tf for tf in timeframes if tf != base_timeframe]
+
+    resampler = MultiTimeframeResampler(base_timeframe, targets, dtype=fetcher.price_dtype)
+    resampler.update(base_df)
+
+    frames = {base_timeframe: base_df}
+    for timeframe in targets:
+        frames[timeframe] = resampler.frame(timeframe)
+        print(f"   {timeframe}: {len(frames[timeframe])} mum turetildi ({base_timeframe} verisinden)")
+    return frames
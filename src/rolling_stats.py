@@ -0,0 +1,229 @@
+"""
+Saglam (Robust) Kayan Istatistikler
+
+Elimizdeki tek kayan istatistik rolling().std() idi (add_features ve
+detect_moving_average). Standart sapma tam da aradigimiz aykiri
+degerlere duyarli: tek bir sicrama pencere boyunca esigi sisiriyor.
+
+Bu modulde kayan medyan, MAD ve kantil hesapliyorum:
+- Medyan ve kantiller pandas'in sirali skiplist cekirdegiyle (C'de,
+  adim basina O(log w))
+- MAD icin pencereyi sirali tutan bir yapi (SortedWindow): her adimda
+  bir ekleme, bir silme (ikili arama), MAD de ikili aramayla O(log w)
+- Mum mum hesap icin kayan Welford (RollingWelford): std adim basina
+  O(1) (feature_registry.py'deki artimli volatilite)
+
+Pencereyi her adimda bastan siralamak (O(w log w)) gerekmiyor, boylece
+1m veride yuzlerce mumluk pencereler ucuz.
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _sorted_median(values: List[float]) -> float:
+    """Sirali listenin medyani"""
+    m = len(values)
+    h = m >> 1
+    return values[h] if m & 1 else (values[h - 1] + values[h]) * 0.5
+
+
+def _sorted_mad(values: List[float], median: float) -> float:
+    """
+    Sirali listenin medyan mutlak sapmasi (O(log w))
+
+    Medyana en yakin K eleman sirali listede bitisik bir aralik olusturuyor.
+    Bu araligin baslangicini ikili aramayla bulup MAD'i araligin uclarindan
+    okuyorum. Cift sayida elemanda iki ortadaki sapmanin ortalamasi.
+    """
+    m = len(values)
+    h = m >> 1
+    k = h + 1 if m & 1 else h
+
+    lo, hi = 0, m - k
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if median - values[mid] > values[mid + k] - median:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    left = median - values[lo]
+    right = values[lo + k - 1] - median
+    mad = left if left > right else right
+
+    if not m & 1:
+        # Bir sonraki en kucuk sapma araligin hemen disinda
+        next_left = median - values[lo - 1] if lo > 0 else math.inf
+        next_right = values[lo + k] - median if lo + k < m else math.inf
+        mad = (mad + (next_left if next_left < next_right else next_right)) * 0.5
+    return mad
+
+
+class SortedWindow:
+    """
+    Kayan pencereyi sirali tutan yapi (medyan, kantil, MAD)
+
+    pandas rolling(window, min_periods=1) ile ayni: pencere dolana kadar
+    eldeki degerler kullaniliyor, NaN'lar sayilmiyor.
+
+    Nasil kullanilir:
+        window = SortedWindow(500)
+        for fiyat in fiyatlar:
+            window.push(fiyat)
+            print(window.median(), window.mad())
+
+    Args:
+        window: Pencere boyu
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._order = deque()
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def push(self, x: float):
+        if len(self._order) == self.window:
+            old = self._order.popleft()
+            if old == old:
+                del self._sorted[bisect_left(self._sorted, old)]
+        self._order.append(x)
+        if x == x:
+            insort(self._sorted, x)
+
+    def median(self) -> float:
+        return _sorted_median(self._sorted) if self._sorted else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Lineer interpolasyonlu kantil (pandas/NumPy varsayilani)"""
+        if not self._sorted:
+            return math.nan
+        position = q * (len(self._sorted) - 1)
+        below = int(position)
+        above = min(below + 1, len(self._sorted) - 1)
+        fraction = position - below
+        return self._sorted[below] + (self._sorted[above] - self._sorted[below]) * fraction
+
+    def mad(self) -> float:
+        if not self._sorted:
+            return math.nan
+        return _sorted_mad(self._sorted, _sorted_median(self._sorted))
+
+
+def rolling_median(x: np.ndarray, window: int) -> np.ndarray:
+    """rolling(window, min_periods=1).median() (pandas skiplist, O(log w))"""
+    if x.ndim == 1:
+        return pd.Series(x, copy=False).rolling(window=window, min_periods=1).median().to_numpy()
+    return pd.DataFrame(x, copy=False).rolling(window=window, min_periods=1).median().to_numpy()
+
+
+def rolling_quantile(x: np.ndarray, window: int, q: float) -> np.ndarray:
+    """rolling(window, min_periods=1).quantile(q) (pandas skiplist, O(log w))"""
+    if x.ndim == 1:
+        return pd.Series(x, copy=False).rolling(window=window, min_periods=1).quantile(q).to_numpy()
+    return pd.DataFrame(x, copy=False).rolling(window=window, min_periods=1).quantile(q).to_numpy()
+
+
+def rolling_mad(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Kayan medyan mutlak sapma: median(|x - median(pencere)|), olceklenmemis
+
+    Sonuc her pencere icin tam MAD ile ayni. SortedWindow'un dongusunu
+    burada acik yaziyorum (metot cagrisi maliyeti olmasin diye).
+
+    Args:
+        x: (T,) veya (T, parite)
+        window: Pencere boyu
+    """
+    if x.ndim == 2:
+        return np.column_stack([rolling_mad(x[:, j], window) for j in range(x.shape[1])])
+
+    values = x.tolist()
+    out = np.empty(len(values), dtype=np.float64)
+    ordered: List[float] = []
+
+    for t, value in enumerate(values):
+        if value == value:
+            insort(ordered, value)
+        if t >= window:
+            old = values[t - window]
+            if old == old:
+                del ordered[bisect_left(ordered, old)]
+
+        if ordered:
+            out[t] = _sorted_mad(ordered, _sorted_median(ordered))
+        else:
+            out[t] = math.nan
+    return out
+
+
+def robust_zscore(x: np.ndarray, median: np.ndarray, mad: np.ndarray) -> np.ndarray:
+    """(x - medyan) / (1.4826 * MAD); normal dagilimda z-score ile ayni olcek"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (x - median) / (1.4826 * mad)
+
+
+class RollingWelford:
+    """
+    Kayan pencere icin ortalama ve varyans (Welford, ekle/cikar O(1))
+
+    pandas rolling(window, min_periods=1).std() ile ayni: pencere dolana
+    kadar eldeki degerler kullaniliyor.
+
+    Args:
+        window: Pencere boyu
+        resync_every: Kac guncellemede bir pencereden tam hesap yapilsin
+    """
+
+    def __init__(self, window: int, resync_every: Optional[int] = None):
+        self.window = window
+        self.resync_every = resync_every or window
+        self._values = deque()
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since_resync = 0
+
+    def push(self, x: float):
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(x)
+        self._add(x)
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_every:
+            self._resync()
+
+    def _add(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float):
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.n -= 1
+        delta = x - self.mean
+        self.mean -= delta / self.n
+        self.m2 -= delta * (x - self.mean)
+
+    def _resync(self):
+        values = np.fromiter(self._values, dtype=np.float64, count=len(self._values))
+        self.mean = float(values.mean())
+        self.m2 = float(((values - self.mean) ** 2).sum())
+        self._since_resync = 0
+
+    def std(self, ddof: int = 1) -> float:
+        if self.n - ddof <= 0:
+            return np.nan
+        return float(np.sqrt(max(self.m2, 0.0) / (self.n - ddof)))
@@ -0,0 +1,358 @@
+"""
+Canli Izleme (Streaming) Modulu
+
+Program eskiden sadece toplu calisiyordu: 60 gunu cek, hepsini isle,
+hepsini puanla, cik. Alarm icin bir mum kapandiktan saniyeler icinde
+karar vermemiz gerekiyor. Bu modulde:
+
+- Kapanan her mumu bellekteki bir halka tampona (ring buffer) ekliyorum
+- Sadece yeni mumun ozelliklerini hesapliyorum (IncrementalFeatureEngine)
+- Sadece yeni noktayi AnomalyDetector ile puanliyorum
+
+Mum kaynagi websocket tarzinda bir async iterator. Gercek borsa icin
+ExchangeCandleStream (ccxt.pro watch_ohlcv), test ve demo icin
+SimulatedCandleStream kullaniliyor.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from anomaly_detector import AnomalyDetector
+from candle_store import OHLCV_COLUMNS
+from data_processor import DataProcessor, DEFAULT_FEATURES
+from data_quality import candle_columns, drop_unclosed
+from feature_engine import IncrementalFeatureEngine
+from model_store import IsolationForestModel
+from replay_exchange import generate_candles
+
+
+class RingBuffer:
+    """
+    Sabit kapasiteli halka tampon (satirlar halinde)
+
+    Ekleme O(1). Kapasite dolunca en eski satirin uzerine yaziliyor.
+
+    Args:
+        capacity: Maksimum satir sayisi
+        width: Satir genisligi (sutun sayisi)
+    """
+
+    def __init__(self, capacity: int, width: int, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._data = np.full((self.capacity, width), np.nan, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, row):
+        self._data[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self) -> np.ndarray:
+        if self._size == 0:
+            raise IndexError("Tampon bos")
+        return self._data[self._next - 1]
+
+    def tail(self, n: int) -> np.ndarray:
+        """Son n satiri eskiden yeniye sirali doner"""
+        n = min(n, self._size)
+        idx = (self._next - n + np.arange(n)) % self.capacity
+        return self._data[idx]
+
+    def to_array(self) -> np.ndarray:
+        """Butun satirlari eskiden yeniye sirali doner (kopya)"""
+        return self.tail(self._size)
+
+
+class SimulatedCandleStream:
+    """
+    Yerel mum simulatoru (websocket kaynagi yerine)
+
+    Sentetik mumlari sirayla yayinliyor. Istenirse rastgele fiyat
+    sicramalari (anomali) ekliyor.
+
+    Args:
+        timeframe_ms: Mum araligi (ms)
+        start: Ilk mumun zamani (ms)
+        count: Kac mum yayinlanacak
+        interval: Iki mum arasinda beklenecek gercek sure (saniye)
+        spike_probability: Bir mumun sicrama olma olasiligi
+        spike_size: Sicrama buyuklugu (0.05 = %5)
+    """
+
+    def __init__(
+        self,
+        timeframe_ms: int,
+        start: int,
+        count: int = 1000,
+        interval: float = 0.0,
+        start_price: float = 100.0,
+        spike_probability: float = 0.0,
+        spike_size: float = 0.05,
+        seed: int = 7
+    ):
+        self.interval = interval
+        self._candles = generate_candles(
+            start, start + count * timeframe_ms, timeframe_ms,
+            start_price=start_price, seed=seed
+        )
+
+        if spike_probability:
+            rng = np.random.default_rng(seed)
+            spikes = rng.random(count) < spike_probability
+            direction = np.where(rng.random(count) < 0.5, -1.0, 1.0)
+            factor = 1 + direction * spike_size
+            self._candles['close'] = np.where(spikes, self._candles['close'] * factor, self._candles['close'])
+            self._candles['high'] = np.maximum(self._candles['high'], self._candles['close'])
+            self._candles['low'] = np.minimum(self._candles['low'], self._candles['close'])
+            self.spike_timestamps = set(self._candles['timestamp_ms'][spikes].tolist())
+        else:
+            self.spike_timestamps = set()
+
+    async def __aiter__(self) -> AsyncIterator[list]:
+        rows = np.column_stack([self._candles[col] for col in OHLCV_COLUMNS])
+        for row in rows:
+            if self.interval:
+                await asyncio.sleep(self.interval)
+            candle = row.tolist()
+            candle[0] = int(candle[0])
+            yield candle
+
+
+class ExchangeCandleStream:
+    """
+    Borsadan websocket ile kapanan mumlari yayinlar (ccxt.pro watch_ohlcv)
+
+    watch_ohlcv son mumlari doner. Yeni bir mum acildiginda bir onceki
+    kapanmis demektir, o zaman onu yayinliyorum.
+    """
+
+    def __init__(self, exchange_name: str, symbol: str, timeframe: str = "1m"):
+        import ccxt.pro as ccxt_pro
+
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.exchange = getattr(ccxt_pro, exchange_name.lower())({'enableRateLimit': True})
+
+    async def __aiter__(self) -> AsyncIterator[list]:
+        pending = None
+        try:
+            while True:
+                candles = await self.exchange.watch_ohlcv(self.symbol, self.timeframe)
+                for candle in candles:
+                    if pending is not None and candle[0] > pending[0]:
+                        # Yeni mum acildi, bekleyen mum kapandi
+                        yield pending
+                    if pending is None or candle[0] >= pending[0]:
+                        pending = candle
+        finally:
+            await self.exchange.close()
+
+
+class StreamingPipeline:
+    """
+    Kapanan her mum icin artimli ozellik + tek nokta puanlama
+
+    Nasil kullanilir:
+        pipeline = StreamingPipeline(AnomalyDetector(), columns=["close", "price_pct_change"])
+        pipeline.warm_up(gecmis_df, "1m")    # Referansi kapanmis gecmis mumlarla kur
+        sonuc = pipeline.process_candle([ts, o, h, l, c, v])
+        # veya: await pipeline.run(SimulatedCandleStream(...))
+
+    Args:
+        detector: Kullanilacak AnomalyDetector
+        features: Hesaplanacak ozellikler (DataProcessor isimleri)
+        columns: Detektore verilecek sutunlar (ham sutunlar veya ozellikler)
+        capacity: Bellekte tutulacak mum sayisi
+        refit_every: Kac mumda bir referans yeniden kurulsun (0: hic)
+        methods: Kullanilacak yontemler
+        min_votes: Anomali sayilmasi icin gereken oy
+        on_anomaly: Anomali bulununca cagrilacak fonksiyon (sonuc dict'i alir)
+        if_model: Kayitli Isolation Forest modeli (ModelStore.load); verilirse
+            referans yenilenirken yeniden egitilmiyor, sadece z-score/IQR yenileniyor
+    """
+
+    def __init__(
+        self,
+        detector: Optional[AnomalyDetector] = None,
+        features: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        capacity: int = 5000,
+        refit_every: int = 0,
+        methods: Optional[List[str]] = None,
+        z_score_threshold: float = 3.0,
+        iqr_multiplier: float = 1.5,
+        min_votes: int = 2,
+        on_anomaly: Optional[Callable[[Dict], None]] = None,
+        if_model: Optional[IsolationForestModel] = None
+    ):
+        self.detector = detector or AnomalyDetector()
+        self.features = list(features) if features is not None else list(DEFAULT_FEATURES)
+        self.columns = list(columns) if columns is not None else ["close"]
+        self.methods = methods or ["isolation_forest", "z_score", "iqr"]
+        self.refit_every = refit_every
+        self.z_score_threshold = z_score_threshold
+        self.iqr_multiplier = iqr_multiplier
+        self.min_votes = min_votes
+        self.on_anomaly = on_anomaly
+        self.if_model = if_model
+
+        unknown = [c for c in self.columns if c not in OHLCV_COLUMNS and c not in self.features]
+        if unknown:
+            raise ValueError(f"Bilinmeyen sutunlar: {unknown} (features listesine ekle)")
+
+        self.engine = IncrementalFeatureEngine(self.features)
+        if self.engine.needs_reference:
+            raise ValueError(f"Canli izlemede referans pariteye gore ozellikler desteklenmiyor: {self.features}")
+        self.candles = RingBuffer(capacity, len(OHLCV_COLUMNS))
+        self.history = RingBuffer(capacity, len(self.columns))
+        self._since_refit = 0
+
+    def warm_up(self, df: pd.DataFrame, timeframe: Optional[str] = None, now_ms: Optional[int] = None):
+        """
+        Gecmis veriyle tamponlari doldurur ve referansi kurar
+
+        fetch_ohlcv'nin son mumu genelde henuz kapanmamis oluyor. Onu
+        almiyorum: yarim mumun kapanisi/hacmi sonraki mumun ozelliklerine
+        girerdi ve mum kapaninca ayni zamanla geldiginde tekrar sayilip
+        atilirdi (ilk gercek mum hic puanlanmazdi).
+
+        Args:
+            df: Ham OHLCV DataFrame'i (DataFetcher.fetch_ohlcv ciktisi)
+            timeframe: Mum araligi (None ise ardisik mumlarin araligindan)
+            now_ms: Simdiki zaman (ms, varsayilan time.time())
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        if timeframe is not None:
+            df = drop_unclosed(df, timeframe, now_ms)
+        elif len(df) > 1:
+            timestamps = candle_columns(df)['timestamp_ms']
+            step = int(np.median(np.diff(timestamps)))
+            df = df.iloc[:int(np.searchsorted(timestamps + step, now_ms, side='right'))]
+
+        print(f"Canli izleme hazirlaniyor ({len(df)} gecmis mum)...")
+
+        processor = DataProcessor(df)
+        processor.clean_data()
+        processor.add_features(self.features)
+
+        raw = processor.df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        for row in raw[-self.candles.capacity:]:
+            self.candles.append(row)
+        self.engine.prime({col: raw[:, i] for i, col in enumerate(OHLCV_COLUMNS)})
+
+        X = processor.df[self.columns].to_numpy(dtype=np.float64)
+        for row in X[-self.history.capacity:]:
+            self.history.append(row)
+
+        self._refit()
+
+    def _refit(self):
+        X = self.history.to_array()
+        self.detector.fit_reference(
+            X, methods=self.methods, iqr_multiplier=self.iqr_multiplier,
+            if_model=self.if_model, columns=self.columns
+        )
+        self._since_refit = 0
+
+    def process_candle(self, candle: list) -> Optional[Dict]:
+        """
+        Kapanan tek bir mumu isler ve puanlar
+
+        Args:
+            candle: [timestamp_ms, open, high, low, close, volume]
+
+        Returns:
+            dict: Zaman, yontem kararlari, oy sayisi, anomali mi, gecikme (ms).
+                  Tekrar gelen / eski mum veya eksik gecmis icin None.
+        """
+        start = time.perf_counter()
+
+        if len(self.candles) and candle[0] <= self.candles.last()[0]:
+            return None
+        self.candles.append(candle)
+
+        feature_values = self.engine.update(*candle[1:6])
+
+        values = dict(zip(OHLCV_COLUMNS, candle))
+        values.update(zip(self.features, feature_values))
+        x = np.array([values[c] for c in self.columns], dtype=np.float64)
+        if np.isnan(x).any():
+            return None
+
+        verdicts = self.detector.score_latest(x, z_score_threshold=self.z_score_threshold)
+        votes = sum(1 for label, _ in verdicts.values() if label == -1)
+
+        self.history.append(x)
+        self._since_refit += 1
+        if self.refit_every and self._since_refit >= self.refit_every:
+            self._refit()
+
+        result = {
+            'timestamp_ms': int(candle[0]),
+            'timestamp': pd.to_datetime(int(candle[0]), unit='ms'),
+            'close': float(candle[4]),
+            'verdicts': verdicts,
+            'votes': votes,
+            'is_anomaly': votes >= self.min_votes,
+            'latency_ms': (time.perf_counter() - start) * 1000,
+        }
+
+        if result['is_anomaly'] and self.on_anomaly is not None:
+            self.on_anomaly(result)
+
+        return result
+
+    async def run(self, source, max_candles: Optional[int] = None, keep_last: int = 10000) -> Dict:
+        """
+        Mum kaynagini dinler ve her kapanan mumu isler
+
+        Canli modda (max_candles=None) surec gunlerce calisabiliyor. Bellek
+        buyumesin diye sayac ve ortalama kayan toplamla tutuluyor, p99 ve
+        son anomaliler sadece son `keep_last` kayittan hesaplaniyor. Butun
+        anomaliler zaten on_anomaly'ye gidiyor.
+
+        Args:
+            source: Kapanan mumlari yayinlayan async iterator
+            max_candles: Bu kadar mumdan sonra dur (None: sonsuza kadar)
+            keep_last: p99 ve son anomaliler icin tutulacak kayit sayisi
+
+        Returns:
+            dict: Islenen mum, anomali sayisi, son anomaliler ve gecikme
+                  istatistikleri (p99 son `keep_last` mum icin)
+        """
+        processed = 0
+        anomaly_count = 0
+        latency_sum = 0.0
+        latencies = deque(maxlen=keep_last)
+        anomalies = deque(maxlen=keep_last)
+
+        async for candle in source:
+            result = self.process_candle(candle)
+            if result is not None:
+                processed += 1
+                latency_sum += result['latency_ms']
+                latencies.append(result['latency_ms'])
+                if result['is_anomaly']:
+                    anomaly_count += 1
+                    anomalies.append(result)
+            if max_candles is not None and processed >= max_candles:
+                break
+
+        summary = {
+            'processed': processed,
+            'anomaly_count': anomaly_count,
+            'anomalies': list(anomalies),
+            'latency_ms_mean': latency_sum / processed if processed else None,
+            'latency_ms_p99': float(np.percentile(latencies, 99)) if latencies else None,
+        }
+        return summary
@@ -0,0 +1,308 @@
+"""
+Walk-Forward (Kayan Pencere) Anomali Tespiti
+
+detect_all_methods modelleri butun veriyle egitip ayni veriyi
+etiketliyor: 60 gunluk verinin ilk gunundeki bir mum, sonraki 59 gunun
+dagilimina gore degerlendiriliyor (ileriye bakma). Backtest o anda
+verilemeyecek bir karari tekrar oynatamaz.
+
+Bu modulde her blogu sadece gecmisine gore puanliyorum:
+- Son `window` satirla referans kuruluyor, sonraki `step` satir
+  puanlaniyor, pencere `step` kaydirilip tekrarlaniyor
+- z-score / IQR: SlidingFeatureStats ile momentler ve sirali sutunlar
+  pencere kaydikca guncelleniyor, her adimda bastan hesap yok
+- Isolation Forest: orman slotlara bolunmus (WarmForest); her adimda
+  sadece en eski slotun agaclari guncel pencereyle yeniden egitiliyor.
+  Varsayilan slot boyu ormani pencereyle ayni hizda yeniliyor.
+- Slot egitimleri sadece kendi penceresine bagli; isci havuzunda
+  (parallel.py) ileriki adimlar icin onceden, ayni anda egitiliyor ve
+  adim sirasiyla tuketiliyor (seed'ler adim/slot'tan, sonuc
+  siralamadan bagimsiz)
+- Etiket esigi sklearn'deki gibi pencere skorlarinin contamination
+  yuzdeligi. Satirlarin slot bazinda yol uzunluklari saklaniyor;
+  yenilenen slot icin sadece o slotun sutunu yeniden hesaplaniyor.
+
+Ilk `window` satirin gecmisi yok: etiket 1, skor NaN (online
+dedektorlerdeki isinma gibi).
+"""
+
+import contextlib
+import math
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config import AnomalyConfig
+from feature_stats import SlidingFeatureStats
+from model_store import IsolationForestModel
+from parallel import SharedMatrix, attach, resolve_workers, worker_pool
+
+
+def _slot_seed(random_state: Optional[int], step: int, slot: int) -> int:
+    """(adim, slot) icin sabit seed; egitim sirasi sonucu degistirmiyor"""
+    base = 0 if random_state is None else random_state
+    return int(np.random.SeedSequence([base, step, slot]).generate_state(1)[0])
+
+
+def _fit_slot(task: Dict) -> IsolationForestModel:
+    """Tek bir slotu kendi penceresinde egitir (isci gorevi)"""
+    matrix = task['matrix']
+    X = attach(matrix) if isinstance(matrix, tuple) else matrix
+    return IsolationForestModel.train(
+        X[task['start']:task['end']], task['columns'],
+        contamination=task['contamination'],
+        n_estimators=task['n_estimators'],
+        random_state=task['seed'],
+        n_jobs=task['n_jobs']
+    )
+
+
+class WarmForest:
+    """
+    Slotlara bolunmus Isolation Forest
+
+    Her slot kendi penceresinde egitilmis bir IsolationForestModel
+    (kendi scaler'iyla). Skor butun slotlarin agaclari tek orman gibi:
+    yol uzunluklari toplami / (toplam agac * c(ornek)). Slotlar ayni
+    pencere boyunda egitildigi icin c(ornek) hepsinde ayni.
+
+    Nasil kullanilir:
+        forest = WarmForest(slot_modelleri)
+        forest.replace(0, yeni_model)          # en eski slot yenilendi
+        labels, scores = forest.predict(X_yeni)
+
+    Args:
+        slots: Slot modelleri
+        offset: Etiket esigi (skor - offset < 0 ise anomali)
+    """
+
+    def __init__(self, slots: List[IsolationForestModel], offset: float = 0.0):
+        self.slots = list(slots)
+        self.offset = offset
+
+    @property
+    def n_trees(self) -> int:
+        return sum(len(slot.roots) for slot in self.slots)
+
+    @property
+    def denominator(self) -> float:
+        return sum(slot.denominator for slot in self.slots)
+
+    def replace(self, index: int, model: IsolationForestModel):
+        self.slots[index] = model
+
+    def slot_path_sums(self, X: np.ndarray) -> np.ndarray:
+        """(n_samples, n_slots): her slotun agaclarindaki yol uzunluklari toplami"""
+        return np.stack([slot.path_length_sums(X) for slot in self.slots], axis=1)
+
+    def scores_from_sums(self, sums: np.ndarray) -> np.ndarray:
+        """slot_path_sums ciktisindan score_samples skoru"""
+        return -np.exp2(-sums.sum(axis=1) / self.denominator)
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        return self.scores_from_sums(self.slot_path_sums(X))
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tek geciste etiket ve skor (IsolationForestModel.predict ile ayni bicim)
+
+        Returns:
+            tuple: (etiketler, skorlar). Etiket 1: normal, -1: anomali
+        """
+        scores = self.score_samples(X)
+        return np.where(scores - self.offset < 0, -1, 1), scores
+
+
+def _stats_reference(stats: SlidingFeatureStats, methods: List[str], iqr_multiplier: float) -> Dict:
+    """Pencere istatistiklerinden fit_reference ile ayni bicimde referans"""
+    reference = {'methods': list(methods), 'n_samples': stats.n_samples}
+    if "z_score" in methods:
+        reference['mean'] = stats.mean
+        reference['std'] = stats.std
+    if "iqr" in methods:
+        q1, q3 = stats.quantile(0.25), stats.quantile(0.75)
+        iqr = q3 - q1
+        reference['iqr'] = iqr
+        reference['lower_bound'] = q1 - iqr_multiplier * iqr
+        reference['upper_bound'] = q3 + iqr_multiplier * iqr
+    return reference
+
+
+def walk_forward_detect(
+    detector,
+    X: np.ndarray,
+    window: int,
+    step: int,
+    methods: Optional[List[str]] = None,
+    z_score_threshold: float = 3.0,
+    iqr_multiplier: float = 1.5,
+    refresh_trees: Optional[int] = None,
+    backend: Optional[str] = None,
+    n_workers: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Dict]:
+    """
+    Walk-forward tespit (AnomalyDetector.detect_walk_forward bunu cagiriyor)
+
+    Args:
+        detector: Parametreleri (contamination, n_estimators, random_state)
+            kullanilacak AnomalyDetector; z-score / IQR puanlamasi onun
+            score_block'uyla yapiliyor
+        X: Veri matrisi (n_samples, n_features), zaman sirasinda
+        window: Referans penceresi (satir)
+        step: Her adimda puanlanan / kaydirilan satir
+        methods: Kullanilacak yontemler
+        z_score_threshold: Z-score esigi
+        iqr_multiplier: IQR carpani
+        refresh_trees: Adim basina yeniden egitilen agac (None: agac
+            sayisi * step / window, orman pencereyle ayni hizda yenilenir;
+            n_estimators: her adimda tam egitim)
+        backend: Slot egitimleri icin "thread" veya "process"
+        n_workers: Isci sayisi
+        columns: X'in sutun isimleri
+
+    Returns:
+        tuple: (sonuclar, son referans). Sonuclar detect_all_methods gibi
+        yontem -> (etiketler, skorlar); son referans bir sonraki mumu
+        score_latest ile puanlamak icin
+    """
+    if methods is None:
+        methods = ["isolation_forest", "z_score", "iqr"]
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    n = len(X)
+    if window < 2 or step < 1:
+        raise ValueError(f"window en az 2, step en az 1 olmali (window={window}, step={step})")
+    if n <= window:
+        raise ValueError(f"Walk-forward icin en az {window + 1} satir gerekiyor, {n} satir var")
+    if np.isnan(X).any():
+        raise ValueError("X NaN iceriyor; walk-forward once temizlenmis veri bekliyor")
+
+    columns = columns or [f"x{i}" for i in range(X.shape[1])]
+    ends = list(range(window, n, step))
+    stat_methods = [m for m in ("z_score", "iqr") if m in methods]
+    use_forest = "isolation_forest" in methods
+
+    n_trees = detector.n_estimators
+    if refresh_trees is None:
+        refresh_trees = math.ceil(n_trees * step / window)
+    refresh_trees = min(max(1, refresh_trees), n_trees)
+    slot_sizes = [len(s) for s in np.array_split(np.arange(n_trees), math.ceil(n_trees / refresh_trees))]
+    n_slots = len(slot_sizes)
+
+    backend = backend or AnomalyConfig.PARALLEL_BACKEND
+    workers, inner_threads = resolve_workers(n_workers)
+
+    print(f"Walk-forward: {len(ends)} adim (pencere {window}, adim {step} satir)")
+    if use_forest:
+        print(f"   Isolation Forest: adim basina {slot_sizes[0]}/{n_trees} agac yenileniyor "
+              f"({workers} isci, {backend})")
+
+    results = {}
+    for method in methods:
+        if method in ("isolation_forest", "z_score", "iqr"):
+            results[method] = (np.ones(n, dtype=int), np.full(n, np.nan))
+    start_time = time.perf_counter()
+
+    shared = None
+    source = X
+    if use_forest and backend == "process":
+        shared = SharedMatrix.from_array(X)
+        source = shared.descriptor
+
+    def slot_tasks() -> Iterator[Tuple[int, int, Dict]]:
+        for k, end in enumerate(ends):
+            for slot in (range(n_slots) if k == 0 else [(k - 1) % n_slots]):
+                yield k, slot, {
+                    'matrix': source,
+                    'start': end - window,
+                    'end': end,
+                    'columns': columns,
+                    'contamination': detector.contamination,
+                    'n_estimators': slot_sizes[slot],
+                    'seed': _slot_seed(detector.random_state, k, slot),
+                    'n_jobs': inner_threads,
+                }
+
+    stats = SlidingFeatureStats(X[:window]) if stat_methods else None
+    forest = None
+    reference = {}
+    try:
+        with worker_pool(backend, workers, inner_threads) if use_forest else contextlib.nullcontext() as pool:
+            pending = deque()
+            tasks = slot_tasks()
+            lookahead = max(n_slots, 4 * workers)
+
+            def fill():
+                for k, slot, task in tasks:
+                    pending.append((k, slot, pool.submit(_fit_slot, task)))
+                    if len(pending) >= lookahead:
+                        break
+
+            # Satirlarin slot bazinda yol uzunluklari (halka: pencere + blok)
+            ring = window + step
+            sums = np.zeros((ring, n_slots)) if use_forest else None
+            if use_forest:
+                fill()
+
+            for k, end in enumerate(ends):
+                start = end - window
+                block = X[end:end + step]
+                block_end = end + len(block)
+
+                if stats is not None:
+                    if k:
+                        stats.slide(X[start - step:start], X[end - step:end])
+                    reference = _stats_reference(stats, stat_methods, iqr_multiplier)
+                    detector.reference = reference
+                    for method, (labels, scores) in detector.score_block(block, z_score_threshold).items():
+                        results[method][0][end:block_end] = labels
+                        results[method][1][end:block_end] = scores
+
+                if use_forest:
+                    window_rows = np.arange(start, end) % ring
+                    fitted = []
+                    while pending and pending[0][0] == k:
+                        _, slot, future = pending.popleft()
+                        fitted.append((slot, future.result()))
+                        fill()
+
+                    if forest is None:
+                        forest = WarmForest([model for _, model in fitted])
+                        sums[window_rows] = forest.slot_path_sums(X[start:end])
+                    else:
+                        for slot, model in fitted:
+                            forest.replace(slot, model)
+                            sums[window_rows, slot] = model.path_length_sums(X[start:end])
+
+                    # Esik: guncel ormanla pencere skorlarinin contamination yuzdeligi
+                    window_scores = forest.scores_from_sums(sums[window_rows])
+                    forest.offset = float(np.percentile(window_scores, 100.0 * detector.contamination))
+
+                    block_sums = forest.slot_path_sums(block)
+                    sums[np.arange(end, block_end) % ring] = block_sums
+                    scores = forest.scores_from_sums(block_sums)
+                    results["isolation_forest"][0][end:block_end] = np.where(scores - forest.offset < 0, -1, 1)
+                    results["isolation_forest"][1][end:block_end] = scores
+    finally:
+        if shared is not None:
+            shared.unlink()
+
+    # Son pencerenin referansi: bir sonraki mum score_latest ile puanlanabilir
+    reference = dict(reference, methods=[m for m in methods if m in ("isolation_forest", "z_score", "iqr")],
+                     n_samples=window)
+    if forest is not None:
+        reference['model'] = forest
+
+    elapsed = time.perf_counter() - start_time
+    for method, (labels, _) in results.items():
+        anomaly_count = int(np.sum(labels == -1))
+        print(f"   {method}: {anomaly_count} anomali (%{(anomaly_count / (n - window) * 100):.2f}, "
+              f"puanlanan {n - window} satir)")
+    print(f"   {len(ends)} adim {elapsed:.2f} sn'de bitti")
+
+    return results, reference
+
@@ -0,0 +1,72 @@
+"""
+Referansla puanlama (score_block / score_latest) toplu yontemlerle ayni
+sonucu vermeli; sabit bir sutun z-score ve IQR oylarini bozmamali.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from anomaly_detector import AnomalyDetector
+
+
+def _constant_column_matrix() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    X = np.column_stack([rng.standard_normal(500), np.full(500, 3.0)])
+    X[::97, 0] *= 6
+    return X
+
+
+def test_score_block_matches_detect_all_methods_with_constant_column():
+    X = _constant_column_matrix()
+    detector = AnomalyDetector()
+    batch = detector.detect_all_methods(X, methods=["z_score", "iqr"])
+
+    detector.fit_reference(X, methods=["z_score", "iqr"])
+    block = detector.score_block(X)
+
+    for method in ("z_score", "iqr"):
+        labels, scores = block[method]
+        assert not np.isnan(scores).any()
+        assert np.array_equal(labels, batch[method][0])
+        assert np.allclose(scores, batch[method][1])
+    assert (block["z_score"][0] == -1).sum() > 0
+
+
+def test_score_latest_matches_score_block():
+    X = _constant_column_matrix()
+    detector = AnomalyDetector()
+    detector.fit_reference(X[:400], methods=["z_score", "iqr"])
+    block = detector.score_block(X[400:])
+
+    for i, x in enumerate(X[400:]):
+        latest = detector.score_latest(x)
+        for method in ("z_score", "iqr"):
+            assert latest[method][0] == block[method][0][i]
+            assert latest[method][1] == block[method][1][i]
+
+
+def test_zero_iqr_outside_bounds_is_infinite():
+    X = np.column_stack([np.arange(100.0), np.full(100, 1.0)])
+    detector = AnomalyDetector()
+    detector.fit_reference(X, methods=["iqr"])
+
+    labels, scores = detector.score_block(np.array([[50.0, 1.0], [50.0, 2.0]]))["iqr"]
+    assert labels.tolist() == [1, -1]
+    assert scores[0] == 0.0 and np.isinf(scores[1])
+
+
+def test_scaler_is_kept_after_isolation_forest():
+    X = _constant_column_matrix()
+    detector = AnomalyDetector(n_estimators=20, verbose=False)
+    detector.detect_isolation_forest(X)
+
+    np.testing.assert_allclose(detector.scaler.mean_, X.mean(axis=0))
+    np.testing.assert_allclose(detector.scaler.transform(X), StandardScaler().fit_transform(X))
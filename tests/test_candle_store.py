@@ -0,0 +1,51 @@
+"""
+Mum deposu (CandleStore): eksik araliklar, birlestirme ve okuma.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from candle_store import CandleStore, OHLCV_COLUMNS
+
+MINUTE = 60000
+
+
+def _candles(start: int, count: int, price: float = 100.0):
+    timestamps = start + np.arange(count, dtype=np.int64) * MINUTE
+    columns = {col: np.full(count, price) for col in OHLCV_COLUMNS[1:]}
+    columns['timestamp_ms'] = timestamps
+    return columns
+
+
+def test_missing_ranges_head_and_tail(tmp_path):
+    store = CandleStore(tmp_path)
+    assert store.missing_ranges("binance", "BTC/USDT", "1m", 0, 100 * MINUTE) == [(0, 100 * MINUTE)]
+
+    store.merge("binance", "BTC/USDT", "1m", _candles(20 * MINUTE, 30), 20 * MINUTE, 50 * MINUTE)
+    assert store.coverage("binance", "BTC/USDT", "1m") == (20 * MINUTE, 50 * MINUTE)
+    assert store.missing_ranges("binance", "BTC/USDT", "1m", 0, 100 * MINUTE) == [
+        (0, 20 * MINUTE), (50 * MINUTE, 100 * MINUTE)
+    ]
+    assert store.missing_ranges("binance", "BTC/USDT", "1m", 30 * MINUTE, 40 * MINUTE) == []
+
+
+def test_merge_keeps_stored_candles_and_extends_coverage(tmp_path):
+    store = CandleStore(tmp_path)
+    store.merge("binance", "BTC/USDT", "1m", _candles(0, 10, price=1.0), 0, 10 * MINUTE)
+    # Ortusen 5 mum farkli fiyatla tekrar geliyor: depodaki kalmali
+    store.merge("binance", "BTC/USDT", "1m", _candles(5 * MINUTE, 10, price=2.0), 5 * MINUTE, 15 * MINUTE)
+
+    stored = store.load("binance", "BTC/USDT", "1m")
+    np.testing.assert_array_equal(stored['timestamp_ms'], np.arange(15) * MINUTE)
+    np.testing.assert_array_equal(stored['close'], [1.0] * 10 + [2.0] * 5)
+    assert store.coverage("binance", "BTC/USDT", "1m") == (0, 15 * MINUTE)
+
+    window = store.load("binance", "BTC/USDT", "1m", since=3 * MINUTE, until=6 * MINUTE)
+    np.testing.assert_array_equal(window['timestamp_ms'], [3 * MINUTE, 4 * MINUTE, 5 * MINUTE])
@@ -0,0 +1,27 @@
+"""
+Disaridan verilen borsa (ReplayExchange) sentetik mumlarini gercek
+mum deposuna yazmamali.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from candle_store import CandleStore
+from data_fetcher import DataFetcher
+from replay_exchange import ReplayExchange
+
+
+def test_injected_exchange_does_not_use_the_default_store():
+    fetcher = DataFetcher(exchange=ReplayExchange(symbols=["BTC/USDT"]))
+    assert fetcher.candle_store is None
+
+
+def test_injected_exchange_uses_an_explicit_store(tmp_path):
+    store = CandleStore(tmp_path)
+    fetcher = DataFetcher(exchange=ReplayExchange(symbols=["BTC/USDT"]), candle_store=store)
+    assert fetcher.candle_store is store
@@ -0,0 +1,93 @@
+"""
+Mum dogrulama (validate_candles) ve izgaraya oturtma (reindex_to_grid):
+bosluklar, satir bayraklari ve eksik mum doldurma politikalari.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data_quality import (
+    FLAG_DUPLICATE, FLAG_MISALIGNED, FLAG_MISSING_VALUE, FLAG_NON_POSITIVE, FLAG_OHLC,
+    FLAG_OUT_OF_ORDER, FLAG_ZERO_VOLUME, reindex_to_grid, validate_candles,
+)
+
+MINUTE = 60000
+
+
+def _candles(timestamps, close=None, volume=None):
+    n = len(timestamps)
+    close = np.arange(n, dtype=np.float64) + 100 if close is None else np.asarray(close, dtype=np.float64)
+    return {
+        'timestamp_ms': np.asarray(timestamps, dtype=np.int64),
+        'open': close.copy(),
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': np.ones(n) if volume is None else np.asarray(volume, dtype=np.float64),
+    }
+
+
+@pytest.mark.parametrize("chunk_rows", [3, 1 << 20])
+def test_gaps_are_found_across_chunks(chunk_rows):
+    data = _candles(np.array([0, 1, 2, 5, 6, 7, 10]) * MINUTE)
+    report = validate_candles(data, "1m", chunk_rows=chunk_rows)
+
+    np.testing.assert_array_equal(report.gaps, [[3 * MINUTE, 4 * MINUTE, 2], [8 * MINUTE, 9 * MINUTE, 2]])
+    assert report.missing_candles == 4
+    assert not report.flags.any()
+    assert not report.is_clean
+
+
+def test_monthly_gap_counts_calendar_months():
+    months = pd.to_datetime(["2024-01-01", "2024-02-01", "2024-05-01"]).to_numpy(dtype='datetime64[ms]')
+    report = validate_candles(_candles(months.astype(np.int64)), "1M")
+
+    start, end = pd.to_datetime(report.gaps[0, :2], unit='ms')
+    assert (start, end, report.gaps[0, 2]) == (pd.Timestamp("2024-03-01"), pd.Timestamp("2024-04-01"), 2)
+
+
+def test_row_flags():
+    data = _candles(np.array([0, 1, 2, 3, 3, 2, 4.5, 5, 6]) * MINUTE,
+                    volume=[1, 1, 0, 0, 1, 1, 1, 1, 1])
+    data['high'][1] = data['close'][1] - 0.5
+    data['close'][7] = np.nan
+    for col in ('open', 'high', 'low', 'close'):
+        data[col][8] = 0.0
+
+    report = validate_candles(data, "1m")
+    assert report.flags.tolist() == [
+        0, FLAG_OHLC, FLAG_ZERO_VOLUME, FLAG_ZERO_VOLUME, FLAG_DUPLICATE, FLAG_OUT_OF_ORDER,
+        FLAG_MISALIGNED, FLAG_MISSING_VALUE, FLAG_NON_POSITIVE,
+    ]
+    np.testing.assert_array_equal(report.zero_volume_runs, [[2, 3, 2]])
+    np.testing.assert_array_equal(report.inconsistent_bars, [1])
+
+
+def test_reindex_fills_missing_candles():
+    # 3. dakika iki kez var: ilki kalmali; 2. ve 4. dakika eksik
+    data = _candles(np.array([0, 1, 3, 3, 5]) * MINUTE, close=[10, 11, 13, 99, 15])
+
+    grid = reindex_to_grid(data, "1m")
+    np.testing.assert_array_equal(grid['timestamp_ms'], np.arange(6) * MINUTE)
+    np.testing.assert_array_equal(grid['close'], [10, 11, 11, 13, 13, 15])
+    np.testing.assert_array_equal(grid['high'], [11, 12, 11, 14, 13, 16])
+    np.testing.assert_array_equal(grid['volume'], [1, 1, 0, 1, 0, 1])
+    assert 'is_filled' not in grid
+
+    marked = reindex_to_grid(data, "1m", policy='mark')
+    np.testing.assert_array_equal(marked['is_filled'], [False, False, True, False, True, False])
+
+    empty = reindex_to_grid(data, "1m", policy='nan')
+    assert np.isnan(empty['close'][[2, 4]]).all() and np.isnan(empty['volume'][[2, 4]]).all()
+
+    with pytest.raises(ValueError):
+        reindex_to_grid(data, "1M")
@@ -0,0 +1,95 @@
+"""
+Mum mum ozellik hesabi (IncrementalFeatureEngine, DataProcessor.append)
+add_features ile ayni degerleri vermeli; kayitli olmayan isimler
+reddedilmeli.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from cross_asset import REFERENCE_COLUMN
+from data_processor import DataProcessor, RAW_COLUMNS
+from feature_engine import IncrementalFeatureEngine
+from feature_registry import FEATURE_REGISTRY
+from replay_exchange import generate_candles
+
+FEATURES = [
+    "price_change", "price_pct_change", "volume_change", "volatility", "price_momentum",
+    "high_low_pct", "upper_shadow", "lower_shadow",
+    "volatility_50", "price_momentum_7", "rolling_median_30", "rolling_q95_30", "robust_zscore_30",
+]
+CROSS_FEATURES = ["rolling_corr_100", "rolling_beta_100", "residual_return_100"]
+
+
+def _candles(n: int = 600) -> pd.DataFrame:
+    candles = generate_candles(0, n * 60000, 60000, seed=3)
+    df = pd.DataFrame({col: candles[col] for col in RAW_COLUMNS})
+    df['timestamp'] = pd.to_datetime(candles['timestamp_ms'], unit='ms')
+    df[REFERENCE_COLUMN] = generate_candles(0, n * 60000, 60000, seed=5)['close']
+    return df
+
+
+def test_engine_matches_add_features():
+    df = _candles()
+    features = FEATURES + CROSS_FEATURES
+    processor = DataProcessor(df)
+    processor.add_features(features)
+
+    engine = IncrementalFeatureEngine(features)
+    assert engine.needs_reference
+    rows = engine.transform({col: df[col].to_numpy() for col in RAW_COLUMNS + [REFERENCE_COLUMN]})
+
+    # add_features bastaki NaN satirlari atiyor
+    expected = processor.df[features].to_numpy()
+    np.testing.assert_allclose(rows[-len(expected):], expected, rtol=1e-9, atol=1e-9)
+
+
+def test_append_matches_add_features():
+    df = _candles().drop(columns=[REFERENCE_COLUMN])
+    full = DataProcessor(df)
+    full.add_features(FEATURES)
+
+    processor = DataProcessor(df.iloc[:450])
+    processor.add_features(FEATURES)
+    for i in range(450, len(df)):
+        row = df.iloc[i]
+        processor.append([int(row['timestamp'].value // 10**6), *(row[col] for col in RAW_COLUMNS)])
+
+    np.testing.assert_allclose(processor.df[FEATURES].to_numpy(), full.df[FEATURES].to_numpy(),
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_unknown_feature_is_rejected():
+    with pytest.raises(ValueError, match="bilinmeyen_ozellik"):
+        IncrementalFeatureEngine(["price_change", "bilinmeyen_ozellik"])
+
+
+def test_sorted_window_features_stream_like_batch():
+    df = _candles(1200)
+    features = ["rolling_median_500", "rolling_mad_500", "rolling_q95_500", "rolling_q5_500", "robust_zscore_500"]
+    for name in features[:4]:
+        assert FEATURE_REGISTRY.get(name).incremental is not None
+
+    processor = DataProcessor(df.drop(columns=[REFERENCE_COLUMN]))
+    processor.add_features(features)
+    rows = IncrementalFeatureEngine(features).transform({col: df[col].to_numpy() for col in RAW_COLUMNS})
+
+    expected = processor.df[features].to_numpy()
+    np.testing.assert_allclose(rows[-len(expected):], expected, rtol=1e-9, atol=1e-9)
+
+
+def test_windowed_fallback_is_reported(capsys):
+    assert IncrementalFeatureEngine(FEATURES).windowed == []
+
+    engine = IncrementalFeatureEngine(["rolling_corr_100"])
+    assert engine.windowed == ["pair_moments_100"]
+    assert "pair_moments_100" in capsys.readouterr().out
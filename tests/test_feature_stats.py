@@ -0,0 +1,46 @@
+"""
+Kayan pencere istatistikleri (SlidingFeatureStats) her kaymadan sonra
+pencereden bastan hesaplanan degerlerle ayni olmali; sirali sutunlar
+ayni tamponda yerinde guncellenmeli.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from feature_stats import SlidingFeatureStats
+
+
+def test_slide_matches_recomputed_window():
+    rng = np.random.default_rng(3)
+    # Tekrarli degerler de olsun (ayni degerden birden cok silinmesi)
+    X = np.round(rng.standard_normal((3000, 3)), 1)
+    window, step = 500, 37
+
+    stats = SlidingFeatureStats(X[:window])
+    buffer = stats._buffer
+    for start in range(step, len(X) - window, step):
+        stats.slide(X[start - step:start], X[start + window - step:start + window])
+        current = X[start:start + window]
+
+        np.testing.assert_array_equal(stats._sorted, np.sort(current, axis=0))
+        np.testing.assert_allclose(stats.mean, current.mean(axis=0))
+        np.testing.assert_allclose(stats.std, current.std(axis=0))
+        np.testing.assert_allclose(stats.quantile(0.25), np.percentile(current, 25, axis=0))
+    assert stats._buffer is buffer
+
+
+def test_slide_with_growing_window():
+    rng = np.random.default_rng(4)
+    X = rng.standard_normal((300, 2))
+    stats = SlidingFeatureStats(X[:100])
+    stats.slide(X[:10], X[100:150])
+
+    np.testing.assert_array_equal(stats._sorted, np.sort(X[10:150], axis=0))
+    assert stats.n_samples == 140
@@ -0,0 +1,66 @@
+"""
+Market onbellegi ornege ait olmali: farkli klasorler ve farkli
+ReplayExchange'ler birbirinin market kaydini gormemeli. Indirme rate
+limiter ve RetryPolicy'den gecmeli.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import ccxt
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data_fetcher import DataFetcher
+from market_cache import MarketCache
+from rate_limiter import RetryPolicy, TokenBucket
+from replay_exchange import ReplayExchange
+
+
+def test_caches_with_different_dirs_do_not_share_entries(tmp_path):
+    first = MarketCache(tmp_path / "a")
+    second = MarketCache(tmp_path / "b")
+    first.put("binance", {"BTC/USDT": {}})
+
+    assert first.has_symbol("binance", "BTC/USDT")
+    assert second.get("binance") is None
+
+
+def test_replays_with_different_symbols_keep_their_own_markets():
+    btc = DataFetcher(exchange=ReplayExchange(symbols=["BTC/USDT"]), use_store=False)
+    eth = DataFetcher(exchange=ReplayExchange(symbols=["ETH/USDT"]), use_store=False)
+
+    assert btc.market_cache.load(btc.exchange) == {"BTC/USDT"}
+    assert eth.market_cache.load(eth.exchange) == {"ETH/USDT"}
+
+
+class _FlakyExchange:
+    """Ilk load_markets cagrisinda ag hatasi veren sahte borsa"""
+
+    id = 'flaky'
+    rateLimit = 50
+
+    def __init__(self):
+        self.markets = None
+        self.calls = 0
+
+    def load_markets(self, reload=False):
+        self.calls += 1
+        if self.calls == 1:
+            raise ccxt.NetworkError("baglanti koptu")
+        self.markets = {"BTC/USDT": {}}
+        return self.markets
+
+
+def test_load_goes_through_limiter_and_retry(tmp_path):
+    exchange = _FlakyExchange()
+    limiter = TokenBucket(capacity=100, refill_rate=0.001, weights={'load_markets': 20})
+
+    symbols = MarketCache(tmp_path).load(exchange, limiter=limiter, retry_policy=RetryPolicy(base_delay=0.0))
+
+    assert symbols == {"BTC/USDT"}
+    assert exchange.calls == 2
+    assert limiter.tokens <= 100 - 2 * 20 + 1
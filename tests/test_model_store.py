@@ -0,0 +1,72 @@
+"""
+Model deposu: kaydedilip geri yuklenen model ayni skorlari vermeli,
+skorlar sklearn IsolationForest ile ayni olmali, farkli sutunlarla
+egitilmis model kullanilmamali.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from model_store import IsolationForestModel, ModelStore
+
+COLUMNS = ["price_pct_change", "volatility"]
+
+
+def _data(n: int = 2000) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(n, len(COLUMNS))) * [0.01, 2.0]
+    X[::97] *= 8
+    return X
+
+
+def test_scores_match_sklearn():
+    X = _data()
+    model = IsolationForestModel.train(X, COLUMNS, n_estimators=50, n_jobs=1)
+
+    scaler = StandardScaler().fit(X)
+    forest = IsolationForest(contamination=0.05, n_estimators=50, random_state=42, n_jobs=1)
+    forest.fit(scaler.transform(X))
+
+    np.testing.assert_allclose(model.score_samples(X), forest.score_samples(scaler.transform(X)),
+                               rtol=1e-12, atol=1e-12)
+    labels, _ = model.predict(X)
+    np.testing.assert_array_equal(labels, forest.predict(scaler.transform(X)))
+
+
+def test_round_trip_keeps_scores(tmp_path):
+    X = _data()
+    model = IsolationForestModel.train(X, COLUMNS, n_estimators=50, n_jobs=1)
+    store = ModelStore(tmp_path)
+    store.save("binance", "BTC/USDT", "15m", model)
+
+    loaded = store.load("binance", "BTC/USDT", "15m", columns=COLUMNS)
+    assert loaded is not None
+    assert loaded.columns == COLUMNS
+    assert loaded.info == model.info
+    np.testing.assert_array_equal(loaded.score_samples(X), model.score_samples(X))
+    for expected, actual in zip(model.predict(X), loaded.predict(X)):
+        np.testing.assert_array_equal(actual, expected)
+
+    store.clear("binance", "BTC/USDT", "15m")
+    assert store.load("binance", "BTC/USDT", "15m") is None
+
+
+def test_column_schema_is_enforced(tmp_path):
+    model = IsolationForestModel.train(_data(500), COLUMNS, n_estimators=10, n_jobs=1)
+    store = ModelStore(tmp_path)
+    store.save("binance", "ETH/USDT", "1h", model)
+
+    assert store.load("binance", "ETH/USDT", "1h", columns=list(reversed(COLUMNS))) is None
+    with pytest.raises(ValueError):
+        model.check_columns(list(reversed(COLUMNS)))
+    model.check_columns(COLUMNS)
@@ -0,0 +1,57 @@
+"""
+Paralel tespit (ParallelDetector) sirali detect_all_methods ile ayni
+sonucu vermeli, parite basina tek istatistik baglami kurmali ve
+sys.stdout'u degistirmemeli.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import parallel
+from anomaly_detector import AnomalyDetector
+from parallel import ParallelDetector
+
+
+def _matrices():
+    rng = np.random.default_rng(0)
+    matrices = {f"S{i}": rng.standard_normal((2000, 3)) for i in range(2)}
+    for X in matrices.values():
+        X[rng.random(len(X)) < 0.01] *= 8
+    return matrices
+
+
+def test_thread_backend_matches_detect_all_methods_with_one_stats_per_symbol(monkeypatch):
+    built = []
+    original = parallel.FeatureStats
+
+    def counting_stats(X, *args, **kwargs):
+        built.append(X)
+        return original(X, *args, **kwargs)
+
+    monkeypatch.setattr(parallel, "FeatureStats", counting_stats)
+    matrices = _matrices()
+    results = ParallelDetector(AnomalyDetector(n_estimators=30), backend="thread", n_workers=3).run(matrices)
+
+    assert len(built) == len(matrices)
+    for symbol, X in matrices.items():
+        expected = AnomalyDetector(n_estimators=30, verbose=False).detect_all_methods(X)
+        for method, (labels, scores) in expected.items():
+            np.testing.assert_array_equal(results[symbol][method][0], labels)
+            np.testing.assert_allclose(results[symbol][method][1], scores)
+
+
+def test_thread_backend_leaves_stdout_alone(capsys):
+    stdout = sys.stdout
+    ParallelDetector(AnomalyDetector(n_estimators=30), backend="thread", n_workers=2).run(_matrices())
+
+    assert sys.stdout is stdout
+    out = capsys.readouterr().out
+    assert "Paralel tespit" in out
+    assert "Isolation Forest ile tespit ediliyor" not in out
@@ -0,0 +1,45 @@
+"""
+Async cagrida (RetryPolicy.call_async) semaphore sadece istek suresince
+tutulmali; jeton bekleyen gorev slot isgal etmemeli.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rate_limiter import RetryPolicy, TokenBucket
+
+
+class _Exchange:
+    def __init__(self, semaphore: asyncio.Semaphore):
+        self.semaphore = semaphore
+        self.held_during_request = []
+
+    async def fetch_ohlcv(self):
+        self.held_during_request.append(self.semaphore.locked())
+        return []
+
+
+def test_semaphore_is_free_while_waiting_for_tokens():
+    async def scenario():
+        semaphore = asyncio.Semaphore(1)
+        exchange = _Exchange(semaphore)
+        limiter = TokenBucket(capacity=1, refill_rate=10)
+        limiter.reserve(1)  # kova bos: sonraki istek ~0.1 sn bekleyecek
+
+        task = asyncio.ensure_future(
+            RetryPolicy().call_async(exchange, limiter, 'fetch_ohlcv', semaphore=semaphore)
+        )
+        await asyncio.sleep(0.03)
+        waiting_free = not semaphore.locked()
+        await task
+        return waiting_free, exchange.held_during_request
+
+    waiting_free, held = asyncio.run(scenario())
+    assert waiting_free
+    assert held == [True]
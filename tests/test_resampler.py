@@ -0,0 +1,73 @@
+"""
+Timeframe turetme: bucket sinirlari borsayla ayni olmali (UTC, hafta
+pazartesi, ay takvim ayi) ve OHLCV toplami dogru olmali.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from resampler import bucket_end, bucket_start, resample_columns
+
+
+def _ms(text: str) -> int:
+    return int(pd.Timestamp(text, tz="UTC").value // 10**6)
+
+
+def test_fixed_width_buckets():
+    ts = np.array([_ms("2024-03-05 13:47"), _ms("2024-03-05 16:00")])
+    np.testing.assert_array_equal(bucket_start(ts, "1h"), [_ms("2024-03-05 13:00"), _ms("2024-03-05 16:00")])
+    np.testing.assert_array_equal(bucket_start(ts, "4h"), [_ms("2024-03-05 12:00"), _ms("2024-03-05 16:00")])
+    np.testing.assert_array_equal(bucket_end(bucket_start(ts, "4h"), "4h"),
+                                  [_ms("2024-03-05 16:00"), _ms("2024-03-05 20:00")])
+
+
+def test_week_starts_on_monday():
+    # 2024-03-04 pazartesi; pazar gecesi bir onceki haftaya ait
+    ts = np.array([_ms("2024-03-04 00:00"), _ms("2024-03-07 09:30"), _ms("2024-03-10 23:59")])
+    np.testing.assert_array_equal(bucket_start(ts, "1w"), [_ms("2024-03-04")] * 3)
+    assert bucket_start(np.array([_ms("2024-03-03 23:59")]), "1w")[0] == _ms("2024-02-26")
+    assert bucket_end(np.array([_ms("2024-03-04")]), "1w")[0] == _ms("2024-03-11")
+
+
+def test_month_follows_calendar():
+    ts = np.array([_ms("2024-02-29 23:59"), _ms("2024-03-01"), _ms("2024-12-31 12:00")])
+    np.testing.assert_array_equal(bucket_start(ts, "1M"),
+                                  [_ms("2024-02-01"), _ms("2024-03-01"), _ms("2024-12-01")])
+    np.testing.assert_array_equal(bucket_end(bucket_start(ts, "1M"), "1M"),
+                                  [_ms("2024-03-01"), _ms("2024-04-01"), _ms("2025-01-01")])
+    assert bucket_start(np.array([_ms("2024-05-20")]), "3M")[0] == _ms("2024-04-01")
+
+
+def test_resample_aggregates_ohlcv():
+    # 10:45'ten baslayan 1m mumlar: ilk 15m mum yarim, atilmali
+    n = 35
+    ts = _ms("2024-03-05 10:50") + np.arange(n, dtype=np.int64) * 60000
+    close = np.arange(n, dtype=np.float64) + 100
+    columns = {
+        'timestamp_ms': ts,
+        'open': close - 0.5,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': np.ones(n),
+    }
+
+    bars = resample_columns(columns, "15m")
+    np.testing.assert_array_equal(bars['timestamp_ms'], [_ms("2024-03-05 11:00"), _ms("2024-03-05 11:15")])
+    np.testing.assert_array_equal(bars['open'], [109.5, 124.5])
+    np.testing.assert_array_equal(bars['high'], [124 + 1, 134 + 1])
+    np.testing.assert_array_equal(bars['low'], [110 - 1, 125 - 1])
+    np.testing.assert_array_equal(bars['close'], [124, 134])
+    np.testing.assert_array_equal(bars['volume'], [15, 10])
+
+    kept = resample_columns(columns, "15m", drop_partial_head=False)
+    assert kept['timestamp_ms'][0] == _ms("2024-03-05 10:45")
+    assert kept['volume'][0] == 10
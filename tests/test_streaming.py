@@ -0,0 +1,51 @@
+"""
+Canli izleme ozeti (StreamingPipeline.run) uzun calismada buyumemeli:
+sayac ve ortalama butun mumlar icin, listeler sadece son kayitlar.
+Isinma (warm_up) kapanmamis son mumu almamali.
+
+Calistirmak icin:
+    py -m pytest tests
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data_fetcher import DataFetcher
+from replay_exchange import ReplayExchange, generate_candles
+from streaming import SimulatedCandleStream, StreamingPipeline
+
+
+def test_run_keeps_bounded_history():
+    candles = generate_candles(0, 1000 * 60000, 60000, seed=1)
+    df = pd.DataFrame(candles)
+    df['timestamp'] = pd.to_datetime(candles['timestamp_ms'], unit='ms')
+
+    pipeline = StreamingPipeline(columns=["price_pct_change", "volume_change"], min_votes=1)
+    pipeline.warm_up(df)
+    source = SimulatedCandleStream(60000, 1000 * 60000, count=300, spike_probability=0.1)
+    summary = asyncio.run(pipeline.run(source, keep_last=5))
+
+    assert summary['processed'] == 300
+    assert summary['anomaly_count'] > 5
+    assert len(summary['anomalies']) == 5
+    assert summary['latency_ms_mean'] > 0
+
+
+def test_warm_up_skips_unclosed_candle_and_scores_it_once_closed():
+    fetcher = DataFetcher(exchange=ReplayExchange(symbols=["BTC/USDT"], history_days=2))
+    df = fetcher.fetch_ohlcv("BTC/USDT", "1m", days_back=1)
+    last = df.iloc[-1]
+    now_ms = int(last['timestamp_ms']) + 30000
+
+    pipeline = StreamingPipeline(columns=["price_pct_change", "volume_change"])
+    pipeline.warm_up(df, "1m", now_ms=now_ms)
+    assert pipeline.candles.last()[0] < last['timestamp_ms']
+
+    # Mum kapaninca ayni zamanla tekrar geliyor ve puanlanmali
+    closed = [int(last['timestamp_ms'])] + [float(last[col]) for col in ("open", "high", "low", "close", "volume")]
+    assert pipeline.process_candle(closed) is not None